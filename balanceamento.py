@@ -0,0 +1,144 @@
+from __future__ import annotations
+import argparse
+import csv
+import json
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from statistics import NormalDist
+from typing import Any, Dict, Iterator, List, Tuple
+
+from dado import GeradorDados
+from models.inimigo import BOSS_HP_BY_DIFFICULTY, SCENARIO_PLAN
+from models.missao import MissaoHordas
+from models.personagem import ARQUETIPOS, criar_personagem
+
+"""
+Matriz de balanceamento (Monte Carlo)
+- Roda N missões headless para cada classe x cenário x dificuldade x nível
+- Espalha os lotes por todos os núcleos (ProcessPoolExecutor)
+- Cada lote tem sua semente, derivada da semente-mãe em ordem fixa: o resultado
+  não depende de quantos processos rodaram
+- Saída: taxa de vitória (IC de Wilson) e turnos até vencer (média ± IC)
+
+Uso:
+    python balanceamento.py -n 500 --niveis 1 5 10 --semente 42 --csv matriz.csv
+"""
+
+Celula = Tuple[str, str, str, int]     # (classe, cenário, dificuldade, nível)
+
+
+def _rodar_lote(celula: Celula, semente: int, n: int) -> Tuple[Celula, Dict[str, float]]:
+    """Worker: n missões de uma célula, cada uma com um fluxo filho da semente do lote."""
+    classe, cenario, dificuldade, nivel = celula
+    mae = GeradorDados(semente)
+    vitorias = turnos = turnos_quad = 0
+    for _ in range(n):
+        heroi = criar_personagem(classe, "Simulação")
+        heroi.avancar_para_nivel(nivel)
+        rel = MissaoHordas(heroi, cenario, dificuldade, rng=mae.filho()).executar_headless()
+        if rel.venceu:
+            t = sum(rel.turnos_por_encontro)
+            vitorias += 1
+            turnos += t
+            turnos_quad += t * t
+    return celula, {"n": n, "vitorias": vitorias, "turnos": turnos, "turnos_quad": turnos_quad}
+
+
+def wilson(sucessos: int, n: int, z: float) -> Tuple[float, float]:
+    """Intervalo de Wilson para uma proporção."""
+    if n == 0:
+        return 0.0, 1.0
+    p = sucessos / n
+    den = 1 + z * z / n
+    centro = (p + z * z / (2 * n)) / den
+    margem = z * math.sqrt(p * (1 - p) / n + z * z / (4 * n * n)) / den
+    return max(0.0, centro - margem), min(1.0, centro + margem)
+
+
+def _lotes(celulas: List[Celula], n: int, tamanho_lote: int, semente: int) -> Iterator[Tuple[Celula, int, int]]:
+    sementes = GeradorDados(semente)
+    for celula in celulas:
+        for inicio in range(0, n, tamanho_lote):
+            yield celula, sementes.filho().semente, min(tamanho_lote, n - inicio)
+
+
+def rodar_matriz(n: int = 200, niveis: List[int] | None = None, semente: int = 0,
+                 processos: int | None = None, tamanho_lote: int = 25,
+                 confianca: float = 0.95) -> List[Dict[str, Any]]:
+    """Roda a grade inteira e devolve uma linha por célula com taxa, turnos e ICs."""
+    niveis = niveis or [1]
+    celulas = [(c, s, d, nv) for c in ARQUETIPOS for s in SCENARIO_PLAN
+               for d in BOSS_HP_BY_DIFFICULTY for nv in niveis]
+    acumulado = {c: {"n": 0, "vitorias": 0, "turnos": 0, "turnos_quad": 0} for c in celulas}
+
+    lotes = list(_lotes(celulas, n, max(1, tamanho_lote), semente))
+    with ProcessPoolExecutor(max_workers=processos) as executor:
+        futuros = [executor.submit(_rodar_lote, *lote) for lote in lotes]
+        for futuro in futuros:
+            celula, parcial = futuro.result()
+            for k, v in parcial.items():
+                acumulado[celula][k] += v
+
+    z = NormalDist().inv_cdf(0.5 + confianca / 2)
+    linhas = []
+    for (classe, cenario, dificuldade, nivel), a in acumulado.items():
+        baixo, alto = wilson(a["vitorias"], a["n"], z)
+        v = a["vitorias"]
+        media = a["turnos"] / v if v else float("nan")
+        if v > 1:
+            var = (a["turnos_quad"] - v * media * media) / (v - 1)
+            margem = z * math.sqrt(max(0.0, var) / v)
+        else:
+            margem = float("nan")
+        linhas.append({
+            "classe": classe, "cenario": cenario, "dificuldade": dificuldade, "nivel": nivel,
+            "missoes": a["n"], "vitorias": v,
+            "taxa_vitoria": v / a["n"] if a["n"] else 0.0, "ic_baixo": baixo, "ic_alto": alto,
+            "turnos_media": media, "turnos_ic": margem,
+        })
+    return linhas
+
+
+def imprimir_matriz(linhas: List[Dict[str, Any]], confianca: float) -> None:
+    print(f"{'Classe':<11} {'Cenário':<9} {'Dific.':<8} {'Nv':>2}  {'Vitória':>7}  "
+          f"{f'IC {confianca:.0%}':<16}  {'Turnos p/ vencer':>16}")
+    for l in linhas:
+        ic = f"[{l['ic_baixo']:.1%}, {l['ic_alto']:.1%}]"
+        turnos = "—" if math.isnan(l["turnos_media"]) else f"{l['turnos_media']:.1f} ± {l['turnos_ic']:.1f}"
+        print(f"{l['classe']:<11} {l['cenario']:<9} {l['dificuldade']:<8} {l['nivel']:>2}  "
+              f"{l['taxa_vitoria']:>7.1%}  {ic:<16}  {turnos:>16}")
+
+
+def main(argv: List[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Matriz de balanceamento por simulação (Monte Carlo).")
+    parser.add_argument("-n", "--missoes", type=int, default=200, help="missões por célula (padrão: 200)")
+    parser.add_argument("--niveis", type=int, nargs="+", default=[1], help="níveis do herói (padrão: 1)")
+    parser.add_argument("--semente", type=int, default=0, help="semente-mãe (padrão: 0)")
+    parser.add_argument("--processos", type=int, default=None, help="processos (padrão: todos os núcleos)")
+    parser.add_argument("--lote", type=int, default=25, help="missões por tarefa enviada a um processo")
+    parser.add_argument("--confianca", type=float, default=0.95, help="nível de confiança dos ICs")
+    parser.add_argument("--csv", help="grava a matriz em CSV")
+    parser.add_argument("--json", help="grava a matriz em JSON")
+    args = parser.parse_args(argv)
+
+    inicio = time.perf_counter()
+    linhas = rodar_matriz(args.missoes, args.niveis, args.semente, args.processos, args.lote, args.confianca)
+    imprimir_matriz(linhas, args.confianca)
+    total = sum(l["missoes"] for l in linhas)
+    print(f"\n{total} missões em {time.perf_counter() - inicio:.1f}s "
+          f"({args.processos or os.cpu_count()} processos, semente {args.semente})")
+
+    if args.csv:
+        with open(args.csv, "w", newline="", encoding="utf-8") as f:
+            escritor = csv.DictWriter(f, fieldnames=list(linhas[0]))
+            escritor.writeheader()
+            escritor.writerows(linhas)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(linhas, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+from __future__ import annotations
+import argparse
+import json
+import socket
+from typing import Any, Dict, List, Optional
+
+from servidor import PORTA_PADRAO
+
+"""
+Cliente de terminal do servidor.py (para testar em localhost)
+- Atalhos: criar <nome> <arquétipo> | config <cenário> <dificuldade> | iniciar |
+  1..8 / 0 (ação no combate) | status | inv | ajuda | sair
+- Linhas que começam com '{' vão como JSON cru
+
+Uso:
+    python cliente.py --porta 8765
+"""
+
+
+def traduzir(linha: str) -> Optional[Dict[str, Any]]:
+    """Atalho digitado -> pedido JSON (None = linha vazia)."""
+    linha = linha.strip()
+    if not linha:
+        return None
+    if linha.startswith("{"):
+        return json.loads(linha)
+    partes = linha.split()
+    cmd, args = partes[0].lower(), partes[1:]
+    if cmd.isdigit():
+        return {"cmd": "acao", "acao": cmd}
+    if cmd == "criar":
+        # o nome pode ter espaços: o último termo é o arquétipo
+        return {"cmd": "criar", "nome": " ".join(args[:-1]), "arquetipo": args[-1] if args else ""}
+    if cmd == "config":
+        pedido: Dict[str, Any] = {"cmd": "configurar"}
+        if args:
+            pedido["cenario"] = args[0]
+        if len(args) > 1:
+            pedido["dificuldade"] = args[1]
+        return pedido
+    if cmd == "inv":
+        return {"cmd": "inventario"}
+    return {"cmd": cmd}
+
+
+def _linha_evento(ev: Dict[str, Any]) -> Optional[str]:
+    tipo = ev["tipo"]
+    if tipo == "INICIO_ENCONTRO":
+        return f"\n=== Encontro {ev['encontro']} — {ev['detalhe']} ({ev['valor']} HP) ==="
+    if tipo == "INICIO_TURNO":
+        return f"--- Turno {ev['turno']} ---"
+    if tipo == "DANO":
+        extra = f" ({ev['detalhe']})" if ev["detalhe"] else ""
+        return f"⚔️ {ev['ator']} causa {ev['valor']} em {ev['alvo']}{extra}"
+    if tipo == "TICK_EFEITO":
+        return f"💥 Efeitos em {ev['alvo']}: {ev['valor']} de dano"
+    if tipo == "FIM_ENCONTRO":
+        return f"💀 {ev['alvo']} foi derrotado!"
+    if tipo == "XP":
+        return f"📈 +{ev['valor']} XP"
+    if tipo == "DROP":
+        return f"🎁 {ev['ator']} dropou: {ev['detalhe']}"
+    if tipo == "FIM_MISSAO":
+        return f"🏁 Fim da missão: {ev['detalhe']}"
+    return None
+
+
+def mostrar(resposta: Dict[str, Any]) -> None:
+    if not resposta.get("ok"):
+        print(f"❌ {resposta.get('erro')}")
+        return
+    for ev in resposta.get("eventos", []):
+        texto = _linha_evento(ev)
+        if texto:
+            print(texto)
+    estado = resposta.get("estado")
+    if estado:
+        h, i = estado["heroi"], estado["inimigo"]
+        print(f"HP herói: {h['vida']}/{h['vida_max']}   |   Mana: {h['mana']}")
+        print(f"HP {i['nome']}: {i['vida']}/{i['vida_max']}")
+        for a in estado["acoes"]:
+            falta = "" if a["disponivel"] else " (insuficiente)"
+            print(f"[{a['acao']}] {a['nome']} — custo {a['custo']}{falta}")
+    if "resultado" in resposta:
+        r = resposta["resultado"]
+        print(f"\n{'🏆' if r['venceu'] else '💀'} {r['detalhes']} Encontros vencidos: {r['encontros_vencidos']}")
+        if resposta.get("heroi_morreu"):
+            print("✝️ SEU HERÓI MORREU! Um novo herói deverá ser criado.")
+    outros = {k: v for k, v in resposta.items() if k not in ("ok", "eventos", "estado", "resultado", "heroi_morreu")}
+    if outros:
+        print(json.dumps(outros, ensure_ascii=False, indent=2))
+
+
+def main(argv: List[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Cliente de terminal do servidor de jogo.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--porta", type=int, default=PORTA_PADRAO)
+    args = parser.parse_args(argv)
+
+    with socket.create_connection((args.host, args.porta)) as conexao:
+        arquivo = conexao.makefile("rwb")
+        print(f"Conectado a {args.host}:{args.porta}. Digite 'ajuda' para ver os comandos.")
+        while True:
+            try:
+                pedido = traduzir(input("> "))
+            except EOFError:
+                pedido = {"cmd": "sair"}
+            except json.JSONDecodeError:
+                print("❌ JSON inválido.")
+                continue
+            if pedido is None:
+                continue
+            arquivo.write(json.dumps(pedido, ensure_ascii=False).encode("utf-8") + b"\n")
+            arquivo.flush()
+            linha = arquivo.readline()
+            if not linha:
+                print("Conexão encerrada pelo servidor.")
+                break
+            resposta = json.loads(linha)
+            mostrar(resposta)
+            if resposta.get("fim"):
+                break
+
+
+if __name__ == "__main__":
+    main()
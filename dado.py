@@ -1,36 +1,285 @@
 from __future__ import annotations
+import hashlib
 import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+from itertools import repeat
+from typing import NamedTuple, Any, Callable, Iterator, Sequence
 from utils.logger import logger
 
+try:  # NumPy é opcional: acelera lotes grandes, mas o jogo roda sem ele
+    import numpy as np
+except ImportError:  # pragma: no cover - depende do ambiente
+    np = None
+
 """
 Sistema de Rolar Dados com import random
 Rolar D6 = Dados de 1 a 6
 Rolar D20 = Dados de 1 a 20
+Rolar em lote = M rolagens de NdF de uma vez (rolar_lote)
+
+Toda rolagem sai do GeradorDados "atual" (ver usar_gerador), então cada
+sessão/worker pode ter seu próprio fluxo com semente reproduzível.
 """
 
+# A partir de quantos dados por chamada vale a pena usar o NumPy
+LIMIAR_NUMPY = 256
+
+# Tamanho sugerido do buffer de rolagens para uso em serviço (~32 KiB por fluxo;
+# blocos maiores quase não ganham velocidade e pesam com muitas sessões)
+TAMANHO_BUFFER_PADRAO = 1024
+
+# Faces pré-montadas por tipo de dado (evita recriar range a cada rolagem)
+_FACES: dict[int, range] = {}
+
+
+class LoteDados(NamedTuple):
+    """Resultado de rolar_lote: somas (M) e faces individuais (M x N)."""
+    somas: Any
+    faces: Any
+
+
+def _faces_do_dado(faces: int) -> range:
+    r = _FACES.get(faces)
+    if r is None:
+        if faces < 1:
+            raise ValueError(f"Dado inválido: d{faces}")
+        r = _FACES[faces] = range(1, faces + 1)
+    return r
+
+
+def _derivar_semente(semente: int, indice: int) -> int:
+    """Semente de 64 bits do filho 'indice' (hash estável, independe do NumPy)."""
+    h = hashlib.blake2b(f"{semente}:{indice}".encode(), digest_size=8)
+    return int.from_bytes(h.digest(), "little")
+
+
+class GeradorDados:
+    """
+    Fluxo de aleatoriedade isolado.
+    - semente explícita => execução reproduzível (None sorteia uma e guarda em .semente)
+    - filho()/filhos(n) => fluxos independentes e determinísticos a partir da semente
+    - buffer > 0 => sorteios pré-gerados em blocos e convertidos em dados com custo
+      mínimo; a sequência é idêntica à do modo sem buffer (mesma semente, com ou
+      sem NumPy): cada dado consome um random() do mesmo random.Random, como
+      random.choices, e as outras primitivas ressincronizam o estado antes de sortear
+    """
+
+    def __init__(self, semente: int | None = None, buffer: int = 0):
+        if semente is None:
+            semente = random.SystemRandom().getrandbits(64)
+        self.semente: int = int(semente)
+        self.buffer: int = max(0, int(buffer))
+        self._random = random.Random(self.semente)
+        self._np = None            # numpy.Generator criado sob demanda (só matriz_numpy)
+        self._proximo_filho = 0
+        self._bloco: list[float] = []   # random() pré-sorteados
+        self._pos = 0                   # próximo índice a consumir em _bloco
+        self._estado = None             # estado do random.Random antes do bloco
+
+    def __repr__(self) -> str:
+        return f"<GeradorDados semente={self.semente} buffer={self.buffer}>"
+
+    # -------- fan-out --------
+    def filho(self) -> GeradorDados:
+        """Cria o próximo fluxo filho (mesma semente-mãe => mesma sequência de filhos)."""
+        indice = self._proximo_filho
+        self._proximo_filho += 1
+        return GeradorDados(_derivar_semente(self.semente, indice), buffer=self.buffer)
+
+    def filhos(self, n: int) -> list[GeradorDados]:
+        return [self.filho() for _ in range(max(0, int(n)))]
+
+    # -------- primitivas (mesma interface do módulo random) --------
+    def random(self) -> float:
+        self._sincronizar()
+        return self._random.random()
+
+    def randint(self, a: int, b: int) -> int:
+        self._sincronizar()
+        return self._random.randint(a, b)
+
+    def choice(self, seq: Sequence[Any]) -> Any:
+        self._sincronizar()
+        return self._random.choice(seq)
+
+    def choices(self, populacao: Sequence[Any], weights: Sequence[float] | None = None, k: int = 1) -> list[Any]:
+        self._sincronizar()
+        return self._random.choices(populacao, weights=weights, k=k)
+
+    # -------- dados --------
+    def rolar(self, total: int, faces: int) -> list[int]:
+        """'total' dados de 'faces' lados numa única chamada (usa o buffer se ativo)."""
+        if not self.buffer:
+            return self._random.choices(_faces_do_dado(faces), k=total)
+        _faces_do_dado(faces)
+        return [int(u * faces) + 1 for u in self._sorteios(total)]
+
+    def proximo(self, faces: int) -> int:
+        """Um único dado — caminho rápido do d6/d20."""
+        if not self.buffer:
+            return self._random.choices(_faces_do_dado(faces))[0]
+        if faces < 1:
+            raise ValueError(f"Dado inválido: d{faces}")
+        pos = self._pos
+        if pos == len(self._bloco):
+            self._encher()
+            pos = 0
+        self._pos = pos + 1
+        # mesma conta de random.choices: population[floor(random() * n)]
+        return int(self._bloco[pos] * faces) + 1
+
+    def _sorteios(self, n: int) -> list[float]:
+        """Os próximos n random() do fluxo, tirados do bloco (enche quantos blocos precisar)."""
+        saida = self._bloco[self._pos:self._pos + n]
+        self._pos += len(saida)
+        while len(saida) < n:
+            self._encher()
+            parte = self._bloco[:n - len(saida)]
+            self._pos = len(parte)
+            saida += parte
+        return saida
+
+    def _encher(self) -> None:
+        """Sorteia o próximo bloco (o anterior já foi todo consumido)."""
+        self._estado = self._random.getstate()
+        aleatorio = self._random.random
+        self._bloco = [aleatorio() for _ in repeat(None, self.buffer)]
+        self._pos = 0
+
+    def _sincronizar(self) -> None:
+        """
+        Deixa o random.Random como se só os sorteios já entregues tivessem saído
+        (volta ao início do bloco e repete os consumidos) e descarta o resto.
+        """
+        if self._pos < len(self._bloco):
+            self._random.setstate(self._estado)
+            aleatorio = self._random.random
+            for _ in repeat(None, self._pos):
+                aleatorio()
+        self._bloco = []
+        self._pos = 0
+
+    def matriz_numpy(self, repeticoes: int, quantidade: int, faces: int):
+        if self._np is None:
+            self._np = np.random.default_rng(self.semente)
+        return self._np.integers(1, faces + 1, size=(repeticoes, quantidade))
+
+
+# Gerador padrão do processo + gerador "atual" por contexto (thread/tarefa asyncio)
+_gerador_padrao = GeradorDados()
+_gerador_atual: ContextVar[GeradorDados | None] = ContextVar("gerador_dados", default=None)
+
+# Observador opcional das rolagens com contexto: callback(faces, quantidade, resultado, contexto)
+ObservadorRolagem = Callable[[int, int, int, str], None]
+_observador: ContextVar[ObservadorRolagem | None] = ContextVar("observador_rolagens", default=None)
+
+
+def gerador_atual() -> GeradorDados:
+    """Gerador em uso no contexto atual (cai no padrão do processo)."""
+    return _gerador_atual.get() or _gerador_padrao
+
+
+def definir_semente(semente: int | None) -> GeradorDados:
+    """Reinicia o gerador padrão do processo com a semente informada."""
+    global _gerador_padrao
+    _gerador_padrao = GeradorDados(semente)
+    return _gerador_padrao
+
+
+@contextmanager
+def usar_gerador(gerador: GeradorDados | None) -> Iterator[GeradorDados]:
+    """Faz todas as rolagens dentro do bloco saírem de 'gerador'."""
+    gerador = gerador or gerador_atual()
+    token = _gerador_atual.set(gerador)
+    try:
+        yield gerador
+    finally:
+        _gerador_atual.reset(token)
+
+
+@contextmanager
+def observar_rolagens(callback: ObservadorRolagem | None) -> Iterator[None]:
+    """Repassa a 'callback' toda rolagem com contexto feita dentro do bloco (ex.: log de eventos)."""
+    token = _observador.set(callback)
+    try:
+        yield
+    finally:
+        _observador.reset(token)
+
+
+def rolar_lote(quantidade: int, faces: int, repeticoes: int = 1, contexto: str = "") -> LoteDados:
+    """
+    Rola 'repeticoes' vezes 'quantidade'd'faces' numa única chamada.
+    Com NumPy (e lotes grandes) retorna arrays; sem NumPy, listas.
+    """
+    quantidade = max(0, int(quantidade))
+    repeticoes = max(0, int(repeticoes))
+    total = quantidade * repeticoes
+    gerador = gerador_atual()
+
+    if np is not None and total >= LIMIAR_NUMPY:
+        _faces_do_dado(faces)
+        matriz = gerador.matriz_numpy(repeticoes, quantidade, faces)
+        lote = LoteDados(matriz.sum(axis=1), matriz)
+    else:
+        planos = gerador.rolar(total, faces)
+        linhas = [planos[i:i + quantidade] for i in range(0, total, quantidade)] if quantidade else [[] for _ in range(repeticoes)]
+        lote = LoteDados([sum(l) for l in linhas], linhas)
+
+    if contexto and logger.ativo("DEBUG"):
+        logger.debug("[%sx%sd%s] %s: somas=%s", repeticoes, quantidade, faces, contexto, list(lote.somas[:10]))
+    return lote
+
 
 def d6(contexto: str = "") -> int:
     """Rola um dado de 6 faces e loga o resultado com contexto."""
-    resultado = random.randint(1, 6)
+    resultado = gerador_atual().proximo(6)
     if contexto:
-        logger.debug(f"[d6] {contexto}: {resultado}")
+        logger.debug("[d6] %s: %s", contexto, resultado)
+        obs = _observador.get()
+        if obs is not None:
+            obs(6, 1, resultado, contexto)
     return resultado
 
 def d20(contexto: str = "") -> int:
     """Rola um dado de 20 faces e loga o resultado com contexto."""
-    resultado = random.randint(1, 20)
+    resultado = gerador_atual().proximo(20)
     if contexto:
-        logger.debug(f"[d20] {contexto}: {resultado}")
+        logger.debug("[d20] %s: %s", contexto, resultado)
+        obs = _observador.get()
+        if obs is not None:
+            obs(20, 1, resultado, contexto)
     return resultado
 
+def dados_sorteados(valores: Sequence[int], faces: int = 6) -> Callable[[str], int]:
+    """
+    Entrega, um por chamada, dados já sorteados em lote (ex.: rolar_lote),
+    com o mesmo log/observador de d6()/d20(). Usado nos ticks em lote.
+    """
+    fila = iter(valores)
+
+    def rolar(contexto: str = "") -> int:
+        resultado = int(next(fila))
+        if contexto:
+            logger.debug("[d%s] %s: %s", faces, contexto, resultado)
+            obs = _observador.get()
+            if obs is not None:
+                obs(faces, 1, resultado, contexto)
+        return resultado
+    return rolar
+
 def rolar_multiplos_dados(quantidade: int, faces: int, contexto: str = "") -> list[int]:
     """Rola múltiplos dados e retorna os resultados individuais."""
-    resultados = [random.randint(1, faces) for _ in range(quantidade)]
+    resultados = gerador_atual().rolar(max(0, int(quantidade)), faces)
     if contexto:
-        logger.debug(f"[{quantidade}d{faces}] {contexto}: {resultados} = {sum(resultados)}")
+        logger.debug("[%sd%s] %s: %s = %s", quantidade, faces, contexto, resultados, sum(resultados))
+        obs = _observador.get()
+        if obs is not None:
+            obs(faces, quantidade, sum(resultados), contexto)
     return resultados
 
 def somar_dados(quantidade: int, faces: int, contexto: str = "") -> int:
     """Rola múltiplos dados e retorna a soma."""
     resultados = rolar_multiplos_dados(quantidade, faces, contexto)
-    return sum(resultados)
\ No newline at end of file
+    return sum(resultados)
@@ -0,0 +1,159 @@
+from __future__ import annotations
+from bisect import bisect_left, bisect_right
+from fractions import Fraction
+from functools import lru_cache
+from typing import Dict, Iterable, Tuple
+
+"""
+Distribuições EXATAS de rolagens (complemento analítico do dado.py)
+- NdF, com bônus fixo (+k) e crítico (dados x2), como nas habilidades
+- Convoluções em cache: cada NdF é calculado uma única vez por processo
+- Probabilidades em Fraction (exatas); use float(...) para exibir
+
+Exemplos:
+    distribuicao(3, 20)                      # Descarnar
+    distribuicao(5, 6, bonus=3, critico=True)  # Execução Pública
+    distribuicao(10, 6).contra_defesa(3).prob_ao_menos(100)
+"""
+
+
+def _convoluir(a: Tuple[int, ...], b: Tuple[int, ...]) -> Tuple[int, ...]:
+    """Convolução de duas listas de contagens (índice = deslocamento da soma mínima)."""
+    saida = [0] * (len(a) + len(b) - 1)
+    for i, x in enumerate(a):
+        if x:
+            for j, y in enumerate(b):
+                saida[i + j] += x * y
+    return tuple(saida)
+
+
+@lru_cache(maxsize=None)
+def _contagens(quantidade: int, faces: int) -> Tuple[int, ...]:
+    """
+    Número de combinações para cada soma de 'quantidade'd'faces'.
+    contagens[i] = formas de obter a soma (quantidade + i).
+    Divide ao meio para reaproveitar as metades já calculadas.
+    """
+    if quantidade <= 0:
+        return (1,)
+    if quantidade == 1:
+        return (1,) * faces
+    meio = quantidade // 2
+    return _convoluir(_contagens(meio, faces), _contagens(quantidade - meio, faces))
+
+
+class Distribuicao:
+    """
+    Distribuição discreta exata: pesos inteiros sobre um total comum.
+    Imutável; operações retornam novas distribuições.
+    """
+
+    __slots__ = ("valores", "pesos", "total", "_acumulado", "_media")
+
+    def __init__(self, pesos: Dict[int, int] | Iterable[Tuple[int, int]], total: int | None = None):
+        itens = sorted((int(v), int(p)) for v, p in dict(pesos).items() if p)
+        self.valores: Tuple[int, ...] = tuple(v for v, _ in itens)
+        self.pesos: Tuple[int, ...] = tuple(p for _, p in itens)
+        self.total: int = total if total is not None else sum(self.pesos)
+        self._acumulado: Tuple[int, ...] | None = None
+        self._media: Fraction | None = None
+
+    def __repr__(self) -> str:
+        return f"<Distribuicao {self.minimo}..{self.maximo} média={float(self.media):.3f}>"
+
+    # -------- consultas --------
+    @property
+    def minimo(self) -> int:
+        return self.valores[0]
+
+    @property
+    def maximo(self) -> int:
+        return self.valores[-1]
+
+    @property
+    def media(self) -> Fraction:
+        if self._media is None:
+            self._media = Fraction(sum(v * p for v, p in zip(self.valores, self.pesos)), self.total)
+        return self._media
+
+    def pmf(self) -> Dict[int, Fraction]:
+        """Probabilidade exata de cada valor."""
+        return {v: Fraction(p, self.total) for v, p in zip(self.valores, self.pesos)}
+
+    def prob(self, valor: int) -> Fraction:
+        i = bisect_left(self.valores, valor)
+        if i < len(self.valores) and self.valores[i] == valor:
+            return Fraction(self.pesos[i], self.total)
+        return Fraction(0)
+
+    def _acum(self) -> Tuple[int, ...]:
+        if self._acumulado is None:
+            acc, soma = [], 0
+            for p in self.pesos:
+                soma += p
+                acc.append(soma)
+            self._acumulado = tuple(acc)
+        return self._acumulado
+
+    def prob_no_maximo(self, limite: int) -> Fraction:
+        """P(X <= limite)."""
+        i = bisect_right(self.valores, limite)
+        return Fraction(self._acum()[i - 1], self.total) if i else Fraction(0)
+
+    def prob_ao_menos(self, limiar: int) -> Fraction:
+        """P(X >= limiar) — ex.: chance de derrubar um alvo com 'limiar' de vida."""
+        return 1 - self.prob_no_maximo(limiar - 1)
+
+    # -------- transformações --------
+    def mais(self, k: int) -> Distribuicao:
+        return Distribuicao({v + k: p for v, p in zip(self.valores, self.pesos)}, self.total)
+
+    def vezes(self, m: int) -> Distribuicao:
+        return Distribuicao({v * m: p for v, p in zip(self.valores, self.pesos)}, self.total)
+
+    def contra_defesa(self, defesa: int) -> Distribuicao:
+        """Dano efetivo como em Entidade.receber_dano: max(0, dano - defesa)."""
+        pesos: Dict[int, int] = {}
+        for v, p in zip(self.valores, self.pesos):
+            efetivo = max(0, max(0, v) - max(0, defesa))
+            pesos[efetivo] = pesos.get(efetivo, 0) + p
+        return Distribuicao(pesos, self.total)
+
+    def somar(self, outra: Distribuicao) -> Distribuicao:
+        """Soma de duas variáveis independentes (ex.: dano de dois turnos)."""
+        pesos: Dict[int, int] = {}
+        for v1, p1 in zip(self.valores, self.pesos):
+            for v2, p2 in zip(outra.valores, outra.pesos):
+                pesos[v1 + v2] = pesos.get(v1 + v2, 0) + p1 * p2
+        return Distribuicao(pesos, self.total * outra.total)
+
+
+@lru_cache(maxsize=None)
+def dados(quantidade: int, faces: int) -> Distribuicao:
+    """Distribuição exata da soma de 'quantidade'd'faces'."""
+    if faces < 1:
+        raise ValueError(f"Dado inválido: d{faces}")
+    contagens = _contagens(max(0, int(quantidade)), faces)
+    base = max(0, int(quantidade))
+    return Distribuicao({base + i: c for i, c in enumerate(contagens)}, faces ** base)
+
+
+@lru_cache(maxsize=None)
+def distribuicao(quantidade: int, faces: int, bonus: int = 0, critico: bool = False) -> Distribuicao:
+    """
+    NdF (x2 se crítico) + bonus — mesma ordem de Execução Pública (5d6 x2 +3).
+    Resultado em cache: repetir a consulta custa só a busca no dicionário.
+    """
+    d = dados(quantidade, faces)
+    if critico:
+        d = d.vezes(2)
+    if bonus:
+        d = d.mais(bonus)
+    return d
+
+
+@lru_cache(maxsize=4096)
+def chance_de_derrubar(vida: int, quantidade: int, faces: int, bonus: int = 0,
+                       critico: bool = False, defesa: int = 0) -> Fraction:
+    """Chance exata de um único golpe tirar 'vida' pontos após a defesa do alvo."""
+    return distribuicao(quantidade, faces, bonus, critico).contra_defesa(defesa).prob_ao_menos(vida)
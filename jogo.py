@@ -2,10 +2,17 @@ from __future__ import annotations
 import json
 import os
 import glob
+import time
 from utils.logger import Logger
+from utils.repositorio import Repositorio
+from utils import codec_save
+from utils.manifesto import Manifesto
+from utils.autosave import Autosave, aplicar_diario, codificar_save, ler_save, substituir_save
 from models.inventario import Drop_rate, Inventario, Item
 from models.base import Entidade
-from models.inimigo import Inimigo
+from models.inimigo import Inimigo, generate_horde
+from models.duelo_vetorizado import simular_duelos
+from models.markov import resolver_encontro
 from models.personagem import (
     Personagem,
     criar_personagem,              # fábrica central (models.personagem)
@@ -14,7 +21,15 @@ from models.personagem import (
     preview_personagem,            # helper para exibir stats
 )
 from models.missao import Missao, ResultadoMissao
-from dado import d6, d20   # nomes corretos
+from dado import d6, d20, GeradorDados   # nomes corretos
+
+# Saves: ".sav" = binário compacto (padrão) | ".json" = exportação legível
+EXTENSOES_SAVE = (".sav", ".json")
+
+# Preview da missão: cadeia exata só se for pequena (resposta na hora no menu);
+# acima disso vale uma estimativa rápida por simulação
+LIMITE_ESTADOS_PREVIEW = 1_000
+DUELOS_PREVIEW = 2_000
 
 
 class Jogo:
@@ -26,10 +41,15 @@ class Jogo:
     - Missões usam d20 para qualidade da ação e d6 para dano.
     """
 
-    def __init__(self) -> None:
+    def __init__(self, semente: int | None = None, buffer_dados: int = 0) -> None:
         self.logger = Logger()
         self.logger.info("Iniciando o jogo...")
 
+        # Fluxo de dados da sessão: cada missão recebe um filho independente,
+        # então a sessão inteira é reproduzível a partir de self.rng.semente.
+        # buffer_dados > 0 (ex.: dado.TAMANHO_BUFFER_PADRAO) pré-sorteia rolagens em bloco.
+        self.rng = GeradorDados(semente, buffer=buffer_dados)
+
         # Somente escolhas do jogador; nada de instanciar aqui.
         self.personagem = {
             "nome": None,         # str
@@ -48,10 +68,15 @@ class Jogo:
         self.drop_de_itens = None
         self._ultimo_save = None
         self._ultimo_load = None
+        self._repositorio: Repositorio | None = None   # banco SQLite, aberto no primeiro uso
 
         # Pasta de saves
         self.save_dir = os.path.join(os.getcwd(), "saves")
         os.makedirs(self.save_dir, exist_ok=True)
+        self.manifesto = Manifesto(self.save_dir)   # índice dos saves (último, listagem)
+        self._autosave: Autosave | None = None      # thread de autosave, criada no primeiro uso
+        self._heroi_autosave = None                 # herói do último autosave completo (base dos deltas)
+        self._stats_autosave: dict | None = None    # heroi_stats do último checkpoint gravado
 
     # ------------------------ util internos de UI -------------------------
 
@@ -196,7 +221,7 @@ class Jogo:
     # ======================================================================
     def _ataque_normal_com_d20(self, heroi: Personagem, inimigo: Entidade) -> int:
         r = d20("Ataque Normal - Qualidade")
-        self.logger.info(f"🎯 {heroi.nome} rola d20 para ataque normal: {r}")
+        self.logger.info("🎯 %s rola d20 para ataque normal: %s", heroi.nome, r)
 
         if 1 <= r <= 5:
             self.logger.warning("💥 Ação PÉSSIMA: você erra o golpe. Sem dano.")
@@ -208,19 +233,19 @@ class Jogo:
 
         if 6 <= r <= 10:
             dano = base
-            self.logger.info(f"🎯 Ação NORMAL: dano base = {base_roll} + {heroi._atrib.ataque} = {base}")
+            self.logger.info("🎯 Ação NORMAL: dano base = %s + %s = %s", base_roll, heroi._atrib.ataque, base)
         elif 11 <= r <= 15:
             dano = base + 1
-            self.logger.info(f"🎯 Ação BOA: {base} + 1 = {dano}")
+            self.logger.info("🎯 Ação BOA: %s + 1 = %s", base, dano)
         else:  # 16–20
             dano = base * 2
-            self.logger.info(f"🎯 Ação EXCELENTE (crítico): {base} x 2 = {dano}")
+            self.logger.info("🎯 Ação EXCELENTE (crítico): %s x 2 = %s", base, dano)
 
         efetivo = inimigo.receber_dano(dano)
         if efetivo != dano:
-            self.logger.info(f"🛡️ Defesa do {inimigo.nome} reduziu o dano de {dano} para {efetivo}")
+            self.logger.info("🛡️ Defesa do %s reduziu o dano de %s para %s", inimigo.nome, dano, efetivo)
         else:
-            self.logger.info(f"⚔️ Dano total: {efetivo}")
+            self.logger.info("⚔️ Dano total: %s", efetivo)
         
         return efetivo
 
@@ -261,7 +286,7 @@ class Jogo:
         nome = input("Digite o nome do personagem: ").strip()
         if nome:
             self.personagem["nome"] = nome
-            self.logger.info(f"✅ Nome definido: {nome}")
+            self.logger.info("✅ Nome definido: %s", nome)
             print(f"Nome definido: {nome}")
         else:
             print("Nome não alterado.")
@@ -280,7 +305,7 @@ class Jogo:
         arq = mapa.get(escolha)
         if arq:
             self.personagem["arquetipo"] = arq
-            self.logger.info(f"✅ Arquétipo definido: {arq}")
+            self.logger.info("✅ Arquétipo definido: %s", arq)
             print(f"Arquétipo definido: {arq}")
         else:
             print("Opção inválida. Arquétipo não alterado.")
@@ -302,7 +327,7 @@ class Jogo:
 
         print("\nPersonagem configurado!")
         print(f"Nome: {self.personagem['nome']} | Arquétipo: {self.personagem['arquetipo']}")
-        self.logger.info(f"🎉 Personagem criado: {self.personagem['nome']} ({self.personagem['arquetipo']})")
+        self.logger.info("🎉 Personagem criado: %s (%s)", self.personagem['nome'], self.personagem['arquetipo'])
 
         self.mostrar_personagem()
 
@@ -409,7 +434,7 @@ class Jogo:
         escolha = mapa.get(op)
         if escolha:
             self.missao_config["dificuldade"] = escolha
-            self.logger.info(f"✅ Dificuldade definida: {escolha}")
+            self.logger.info("✅ Dificuldade definida: %s", escolha)
             print(f"Dificuldade definida: {escolha}")
         else:
             print("Opção inválida.")
@@ -426,7 +451,7 @@ class Jogo:
         cen = mapa.get(op)
         if cen:
             self.missao_config["cenario"] = cen
-            self.logger.info(f"✅ Cenário definido: {cen}")
+            self.logger.info("✅ Cenário definido: %s", cen)
             print(f"Cenário definido: {cen}")
         else:
             print("Opção inválida.")
@@ -459,9 +484,46 @@ class Jogo:
        
         print("-" * 35)
         print("ℹ️ OBS: Hordas e chefe serão gerados conforme cenário e dificuldade.")
+        self._preview_chances()
         print(f"{borda}")
 
-        
+    def _preview_chances(self) -> None:
+        """Chance de vencer cada tipo de inimigo: exata (models.markov) se a cadeia for pequena, senão estimada (≈)."""
+        cenario = self.missao_config["cenario"]
+        dificuldade = self.missao_config["dificuldade"]
+        if self.heroi_ativo:
+            heroi = self.heroi_ativo
+        elif self.personagem.get("arquetipo"):
+            heroi = criar_personagem(self.personagem["arquetipo"], self.personagem.get("nome") or "Herói")
+        else:
+            heroi = None
+        if heroi is None or not cenario or not dificuldade:
+            print("ℹ️ Defina personagem, cenário e dificuldade para ver a chance de vitória.")
+            return
+
+        missao = self.missao_config["missao"]
+        vistos = set()
+        print(f"🎲 Chance de vencer cada encontro ({heroi.nome}, vida e mana atuais):")
+        for inimigo in generate_horde(cenario, dificuldade, missao if isinstance(missao, dict) else None):
+            a = inimigo._atrib
+            chave = (inimigo.nome, a.vida, a.ataque, a.defesa)
+            if chave in vistos:
+                continue
+            vistos.add(chave)
+            titulo = f"{inimigo.nome} (chefe)" if inimigo.efeitos.get("is_boss") else inimigo.nome
+            try:
+                sol = resolver_encontro(heroi, inimigo, limite_estados=LIMITE_ESTADOS_PREVIEW)
+                chance, turnos_vencer, prefixo = sol.vitoria, sol.turnos_ate_vencer, " "
+            except ValueError:
+                try:
+                    duelos = simular_duelos(heroi, inimigo, n=DUELOS_PREVIEW)
+                except ImportError:         # sem NumPy: nada rápido o bastante para o menu
+                    print(f"|   {titulo:<22} —")
+                    continue
+                chance, turnos_vencer, prefixo = duelos.taxa_vitoria, duelos.turnos_medios, "≈"
+            turnos = "" if chance <= 0 else f" (~{turnos_vencer:.1f} turnos)"
+            print(f"|   {titulo:<22} {prefixo}{chance:>6.1%}{turnos}")
+
 
     def _ajuda_missao(self) -> None:
         self.logger.info("Iniciando menu Ajuda de missões...")
@@ -478,6 +540,8 @@ class Jogo:
             print("\n=== Salvar ===")
             print("[1] Salvar rápido")
             print("[2] Salvar com nome")
+            print("[3] Salvar no banco (SQLite)")
+            print("[4] Exportar JSON legível")
             print("[9] Ajuda")
             print("[0] Voltar")
             op = input("> ").strip()
@@ -486,6 +550,10 @@ class Jogo:
                 self._salvar_rapido()
             elif op == "2":
                 self._salvar_nomeado()
+            elif op == "3":
+                self._salvar_banco()
+            elif op == "4":
+                self._exportar_json()
             elif op == "9":
                 self._ajuda_salvar()
             elif op == "0":
@@ -494,24 +562,91 @@ class Jogo:
                 print("Opção inválida.")
 
     def _salvar_rapido(self) -> None:
-        nome_arquivo = os.path.join(self.save_dir, "quick_save.json")
+        nome_arquivo = os.path.join(self.save_dir, "quick_save.sav")
         self.salvar_arquivo(nome_arquivo)
         self._ultimo_save = nome_arquivo
-        self.logger.info(f"💾 Salvamento rápido realizado: {self._ultimo_save}")
+        self.logger.info("💾 Salvamento rápido realizado: %s", self._ultimo_save)
         print(f"✔ Salvo em: {self._ultimo_save}")
 
     def _salvar_nomeado(self) -> None:
-        nome = input("Nome do arquivo de save (ex.: meu_jogo.json): ").strip() or "save.json"
-        if not nome.endswith(".json"):
-            nome += ".json"
+        nome = input("Nome do arquivo de save (ex.: meu_jogo.sav): ").strip() or "save.sav"
+        if not nome.endswith(EXTENSOES_SAVE):
+            nome += ".sav"
         os.makedirs(self.save_dir, exist_ok=True)
         caminho = os.path.join(self.save_dir, nome)
         self.salvar_arquivo(caminho)
         self._ultimo_save = caminho
-        self.logger.info(f"💾 Salvamento nomeado realizado: {self._ultimo_save}")
+        self.logger.info("💾 Salvamento nomeado realizado: %s", self._ultimo_save)
         print(f"✔ Progresso salvo como: {self._ultimo_save}")
 
+    @property
+    def repositorio(self) -> Repositorio:
+        if self._repositorio is None:
+            self._repositorio = Repositorio(os.path.join(self.save_dir, "rpg.db"))
+        return self._repositorio
+
+    def _salvar_banco(self) -> None:
+        try:
+            perfil = self.repositorio.salvar(self._montar_dados())
+        except Exception as error:
+            self.logger.error("❌ Erro ao salvar no banco: %s", error)
+            return print(f"Erro ao salvar no banco: {error}")
+        self.logger.info("💾 Salvo no banco: perfil %s", perfil)
+        print(f"✔ Salvo no banco (perfil: {perfil})")
+
+    def _exportar_json(self) -> None:
+        nome = input("Nome do arquivo JSON (ex.: meu_jogo.json): ").strip() or "save.json"
+        if not nome.endswith(".json"):
+            nome += ".json"
+        caminho = os.path.join(self.save_dir, nome)
+        self.salvar_arquivo(caminho)
+        print(f"✔ Exportado como: {caminho}")
+
     def salvar_arquivo(self, nome_arquivo: str) -> None:
+        """Grava o save; o formato sai da extensão (.json legível, senão binário .sav)."""
+        dados = self._montar_dados()
+        if self._autosave is not None:
+            self._autosave.esperar(timeout=10)     # nenhum delta pendente cai depois deste save
+        try:
+            conteudo = codificar_save(nome_arquivo, dados)
+            substituir_save(nome_arquivo, conteudo)
+            self.manifesto.registrar(nome_arquivo, dados, len(conteudo))
+            self.logger.info("💾 Jogo salvo em: %s", nome_arquivo)
+        except Exception as error:
+            self.logger.error("❌ Erro ao salvar arquivo: %s", error)
+            print(f"Erro ao salvar arquivo: {error}")
+
+    @property
+    def autosave(self) -> Autosave:
+        if self._autosave is None:
+            self._autosave = Autosave(ao_gravar=self.manifesto.registrar)
+        return self._autosave
+
+    def _autosalvar(self, *_: object) -> None:
+        """
+        Checkpoint: agenda o estado em saves/autosave.sav sem bloquear quem chamou.
+        O primeiro checkpoint de cada herói grava tudo; os seguintes, só o que mudou.
+        """
+        if self.heroi_ativo is None:
+            return
+        caminho = os.path.join(self.save_dir, "autosave.sav")
+        if self._heroi_autosave is not self.heroi_ativo:
+            self._heroi_autosave = self.heroi_ativo
+            self.inven.limpar_sujos()
+            dados = self._montar_dados()
+            self._stats_autosave = dados["heroi_stats"]
+            self.autosave.agendar(caminho, dados)
+        else:
+            self.autosave.agendar_delta(caminho, self._montar_delta())
+
+    def encerrar(self) -> None:
+        """Espera o autosave terminar (chamar antes de sair)."""
+        if self._autosave is not None:
+            self._autosave.esperar(timeout=10)
+            self._autosave.parar()
+
+    def _montar_dados(self) -> dict:
+        """Estado da sessão (personagem, missão, herói e inventário) como dict serializável."""
         dados = {
             "personagem": self.personagem,
             "missao_config": self.missao_config,
@@ -520,22 +655,37 @@ class Jogo:
 
         # --- NOVO: SALVAR STATUS DO HERÓI (XP, NÍVEL, ATRIBUTOS) ---
         if self.heroi_ativo:
-            # Serializa os dados vitais do herói
-            dados["heroi_stats"] = {
-                "nivel": self.heroi_ativo.nivel,
-                "xp": self.heroi_ativo.xp,
-                # Salvamos os atributos atuais para manter buffs ou evoluções
-                "atributos": {
-                    "vida": self.heroi_ativo._atrib.vida,
-                    "vida_max": self.heroi_ativo._atrib.vida_max,
-                    "mana": getattr(self.heroi_ativo._atrib, "mana", 0),
-                    "ataque": self.heroi_ativo._atrib.ataque,
-                    "defesa": self.heroi_ativo._atrib.defesa,
-                    "ataque_magico": getattr(self.heroi_ativo._atrib, "ataque_magico", 0),
-                }
-            }
+            dados["heroi_stats"] = self._stats_heroi()
         # -----------------------------------------------------------
 
+        itens = self._serializar_inventario()
+        if itens is not None:
+            dados["inventario"] = itens
+
+        return dados
+
+    def _stats_heroi(self) -> dict:
+        """Serializa os dados vitais do herói ativo (nível, XP, atributos e efeitos ativos)."""
+        heroi = self.heroi_ativo
+        stats = {
+            "nivel": heroi.nivel,
+            "xp": heroi.xp,
+            # Salvamos os atributos atuais para manter buffs ou evoluções
+            "atributos": {
+                "vida": heroi._atrib.vida,
+                "vida_max": heroi._atrib.vida_max,
+                "mana": getattr(heroi._atrib, "mana", 0),
+                "ataque": heroi._atrib.ataque,
+                "defesa": heroi._atrib.defesa,
+                "ataque_magico": getattr(heroi._atrib, "ataque_magico", 0),
+            }
+        }
+        efeitos = heroi.efeitos.ativos()
+        if efeitos:
+            stats["efeitos"] = efeitos
+        return stats
+
+    def _serializar_inventario(self) -> list | None:
         # serializar inventário (lista de dicts) - SEU CÓDIGO ORIGINAL MANTIDO AQUI
         try:
             itens_serializados = []
@@ -554,22 +704,42 @@ class Jogo:
                     itens_serializados.append(it)
                 else:
                     itens_serializados.append({"nome": str(it)})
-            dados["inventario"] = itens_serializados
+            return itens_serializados
         except Exception:
-            pass
+            return None
 
-        try:
-            with open(nome_arquivo, "w", encoding="utf-8") as f:
-                json.dump(dados, f, indent=4, ensure_ascii=False)
-                self.logger.info(f"💾 Jogo salvo em: {nome_arquivo}")
-        except Exception as error:
-            self.logger.error(f"❌ Erro ao salvar arquivo: {error}")
-            print(f"Erro ao salvar arquivo: {error}")
+    def _montar_delta(self) -> dict:
+        """
+        Só o que mudou no herói/inventário desde o último checkpoint, no mesmo
+        formato de _montar_dados. O herói é comparado com os heroi_stats do último
+        checkpoint (nada é rastreado no caminho quente do combate).
+        """
+        atual = self._stats_heroi()
+        anterior = self._stats_autosave or {}
+        delta: dict = {"personagem": dict(self.personagem), "missao_config": dict(self.missao_config)}
+        stats: dict = {c: atual[c] for c in ("nivel", "xp") if atual[c] != anterior.get(c)}
+        atrib_antes = anterior.get("atributos") or {}
+        atrib = {c: v for c, v in atual["atributos"].items() if v != atrib_antes.get(c)}
+        if atrib:
+            stats["atributos"] = atrib
+        efeitos = atual.get("efeitos", {})
+        if efeitos != anterior.get("efeitos", {}):
+            stats["efeitos"] = efeitos      # vão inteiros (ver mesclar_delta)
+        if stats:
+            delta["heroi_stats"] = stats
+        if self.inven.sujo:
+            itens = self._serializar_inventario()
+            if itens is not None:
+                delta["inventario"] = itens
+        self._stats_autosave = atual
+        self.inven.limpar_sujos()
+        return delta
 
     def _ajuda_salvar(self) -> None:
         print("\nAjuda — Salvar")
         print("- Salvar rápido usa um nome padrão.")
         print("- Salvar nomeado permite informar o nome do arquivo.")
+        print("- Saves .sav são binários e compactos; use 'Exportar JSON' para um arquivo legível.")
 
     def menu_carregar(self) -> None:
         self.logger.info("Iniciando menu Carregar progresso salvo...")
@@ -578,6 +748,8 @@ class Jogo:
             print("[1] Carregar último save")
             print("[2] Carregar por nome")
             print("[3] Mostrar saves disponíveis")
+            print("[4] Carregar do banco (SQLite)")
+            print("[5] Pré-visualizar save")
             print("[9] Ajuda")
             print("[0] Voltar")
             op = input("> ").strip()
@@ -588,6 +760,10 @@ class Jogo:
                 self._carregar_nomeado()
             elif op == "3":
                 self.listar_saves()
+            elif op == "4":
+                self._carregar_banco()
+            elif op == "5":
+                self._preview_save()
             elif op == "9":
                 self._ajuda_carregar()
             elif op == "0":
@@ -596,128 +772,176 @@ class Jogo:
                 print("Opção inválida.")
 
     def _carregar_ultimo(self) -> None:
-            # --- CORREÇÃO: Preencher a variável se ela estiver vazia ---
+        # Sem save nesta sessão: o manifesto sabe qual é o mais recente
         if not self._ultimo_save:
-            import glob
-            # Procura arquivos na pasta 'saves'. 
-            # IMPORTANTE: Se seus saves forem .txt ou .pkl, mude o ".json" abaixo.
-            lista_arquivos = glob.glob("saves/*.json") 
-            
-            if lista_arquivos:
-                # Define self._ultimo_save como o arquivo mais recente encontrado
-                self._ultimo_save = max(lista_arquivos, key=os.path.getmtime)
-
-
+            self._ultimo_save = self.manifesto.ultimo()
 
         if not self._ultimo_save:
             self.logger.warning("Nenhum save recente encontrado.")
             return print("Nenhum save recente encontrado.")
         if not os.path.exists(self._ultimo_save):
-            self.logger.error(f"Arquivo não encontrado: {self._ultimo_save}")
+            self.logger.error("Arquivo não encontrado: %s", self._ultimo_save)
             return print(f"Arquivo '{self._ultimo_save}' não foi encontrado.")
         self.carregar_arquivo(self._ultimo_save)
 
-        self.logger.info(f"📂 Progresso carregado: {self._ultimo_save}")
+        self.logger.info("📂 Progresso carregado: %s", self._ultimo_save)
         print(f"✔ Progresso carregado de: {self._ultimo_save}")
 
     def _carregar_nomeado(self) -> None:
-        nome = input("Nome do arquivo para carregar (ex.: meu_jogo.json): ").strip() or "save.json"
-        if not nome.endswith(".json"):
-            nome += ".json"
+        nome = input("Nome do arquivo para carregar (ex.: meu_jogo.sav): ").strip() or "save.sav"
+        if not nome.endswith(EXTENSOES_SAVE):
+            # sem extensão: prefere o binário e cai no JSON
+            nome = next((nome + ext for ext in EXTENSOES_SAVE
+                         if os.path.exists(os.path.join(self.save_dir, nome + ext))), nome + ".sav")
         caminho = os.path.join(self.save_dir, nome)
         if not os.path.exists(caminho):
-            self.logger.error(f"Arquivo não encontrado: {caminho}")
+            self.logger.error("Arquivo não encontrado: %s", caminho)
             return print(f"Arquivo '{caminho}' não foi encontrado.")
         self.carregar_arquivo(caminho)
-        self.logger.info(f"📂 Progresso carregado: {caminho}")
+        self.logger.info("📂 Progresso carregado: %s", caminho)
         print(f"✔ Progresso carregado de: {caminho}")
 
+    def _preview_save(self) -> None:
+        """Mostra herói/nível/XP lendo só o cabeçalho; o inventário só se pedido."""
+        saves = self.manifesto.listar()
+        if not saves:
+            return print("Nenhum save encontrado.")
+        for i, s in enumerate(saves, 1):
+            print(f"[{i}] {s['arquivo']}")
+        op = input("Número do save: ").strip()
+        if not (op.isdigit() and 1 <= int(op) <= len(saves)):
+            return print("Opção inválida.")
+        caminho = os.path.join(self.save_dir, saves[int(op) - 1]["arquivo"])
+        try:
+            if caminho.endswith(".sav"):
+                r = codec_save.ler_resumo(caminho)
+                quando = time.strftime("%d/%m/%Y %H:%M", time.localtime(r.timestamp)) if r.timestamp else "?"
+                print(f"\n{r.nome} — {r.classe} | Nível {r.nivel} | XP {r.xp} | salvo em {quando}")
+                if input("Ver inventário? (s/N) ").strip().lower() == "s":
+                    itens = codec_save.abrir(caminho)["inventario"]
+                    print(f"Inventário ({len(itens)}): " + (", ".join(it.get("nome", "?") for it in itens) or "vazio"))
+            else:
+                with open(caminho, "r", encoding="utf-8") as f:
+                    dados = json.load(f)
+                stats = dados.get("heroi_stats") or {}
+                pers = dados.get("personagem") or {}
+                print(f"\n{pers.get('nome')} — {pers.get('arquetipo')} | Nível {stats.get('nivel', 1)} | XP {stats.get('xp', 0)}")
+                print(f"Inventário: {len(dados.get('inventario') or [])} itens")
+        except (OSError, ValueError) as error:
+            self.logger.error("❌ Erro ao ler save: %s", error)
+            print(f"Erro ao ler save: {error}")
+
+    def _carregar_banco(self) -> None:
+        try:
+            perfis = self.repositorio.listar()
+        except Exception as error:
+            self.logger.error("❌ Erro ao abrir o banco: %s", error)
+            return print(f"Erro ao abrir o banco: {error}")
+        if not perfis:
+            return print("Nenhum perfil salvo no banco.")
+        print("\nPerfis no banco:")
+        for i, p in enumerate(perfis, 1):
+            print(f"[{i}] {p['perfil']} — {p['arquetipo']} nível {p['nivel'] or 1}")
+        op = input("Número do perfil (Enter = mais recente): ").strip()
+        escolhido = perfis[int(op) - 1]["perfil"] if op.isdigit() and 1 <= int(op) <= len(perfis) else perfis[0]["perfil"]
+        self._aplicar_dados(self.repositorio.carregar(escolhido))
+        self.logger.info("📂 Progresso carregado do banco: %s", escolhido)
+        print(f"✔ Progresso carregado do banco (perfil: {escolhido})")
+
     def listar_saves(self) -> None:
         self.logger.info("Listando arquivos de save disponíveis...")
         print("\nArquivos de Save Disponíveis:")
-        for arquivo in os.listdir(self.save_dir):
-            if arquivo.endswith(".json"):
-                print(f"- {arquivo}")
+        saves = self.manifesto.listar()
+        if not saves:
+            print("(nenhum)")
+        for s in saves:
+            quando = time.strftime("%d/%m/%Y %H:%M", time.localtime(s["timestamp"]))
+            print(f"- {s['arquivo']}: {s['heroi'] or '?'} ({s['classe'] or '?'}, nível {s['nivel']}) — {quando}, {s['tamanho']} bytes")
 
     def carregar_arquivo(self, nome_arquivo: str) -> None:
         try:
-            with open(nome_arquivo, "r", encoding="utf-8") as f:
-                dados = json.load(f)
+            dados = ler_save(nome_arquivo)       # .sav: seções decodificadas sob demanda
+            if os.path.exists(nome_arquivo + ".diario"):
+                dados = aplicar_diario(nome_arquivo, dados)
+            self._aplicar_dados(dados)
+        except Exception as error:
+            self.logger.error("❌ Erro ao carregar arquivo: %s", error)
+            print(f"Erro ao carregar arquivo: {error}")
+
+    def _aplicar_dados(self, dados: dict) -> None:
+        """Restaura a sessão a partir do dict gerado por _montar_dados."""
+        # 1. Carrega as configurações básicas (Nome/Arquétipo)
+        self.personagem = dados.get("personagem", self.personagem)
+        self.missao_config = dados.get("missao_config", self.missao_config)
+
+        # ------------------------------------------------------------------
+        # 2. PARTE NOVA: RECONSTRUIR O HERÓI ATIVO (Nível, XP, Vida)
+        # ------------------------------------------------------------------
+        stats_salvos = dados.get("heroi_stats")
+        
+        # Só tenta restaurar se tivermos nome, arquétipo e os dados salvos
+        if self.personagem.get("nome") and self.personagem.get("arquetipo") and stats_salvos:
             
-            # 1. Carrega as configurações básicas (Nome/Arquétipo)
-            self.personagem = dados.get("personagem", self.personagem)
-            self.missao_config = dados.get("missao_config", self.missao_config)
-
-            # ------------------------------------------------------------------
-            # 2. PARTE NOVA: RECONSTRUIR O HERÓI ATIVO (Nível, XP, Vida)
-            # ------------------------------------------------------------------
-            stats_salvos = dados.get("heroi_stats")
+            # A. Cria a instância base (Nível 1, XP 0)
+            self.heroi_ativo = criar_personagem(
+                self.personagem["arquetipo"], 
+                self.personagem["nome"]
+            )
             
-            # Só tenta restaurar se tivermos nome, arquétipo e os dados salvos
-            if self.personagem.get("nome") and self.personagem.get("arquetipo") and stats_salvos:
-                
-                # A. Cria a instância base (Nível 1, XP 0)
-                self.heroi_ativo = criar_personagem(
-                    self.personagem["arquetipo"], 
-                    self.personagem["nome"]
-                )
-                
-                # B. Sobrescreve com os dados do JSON
-                self.heroi_ativo.nivel = stats_salvos["nivel"]
-                self.heroi_ativo.xp = stats_salvos["xp"]
-                
-                # C. Restaura os atributos (para manter vida atual, etc)
-                atribs = stats_salvos.get("atributos", {})
-                self.heroi_ativo._atrib.vida = atribs.get("vida", 10)
-                self.heroi_ativo._atrib.vida_max = atribs.get("vida_max", 10)
-                self.heroi_ativo._atrib.ataque = atribs.get("ataque", 1)
-                self.heroi_ativo._atrib.defesa = atribs.get("defesa", 0)
-                
-                # (Opcional) Mana e Magia se a classe tiver
-                if hasattr(self.heroi_ativo._atrib, "mana"):
-                    self.heroi_ativo._atrib.mana = atribs.get("mana", 0)
-                if hasattr(self.heroi_ativo._atrib, "ataque_magico"):
-                    self.heroi_ativo._atrib.ataque_magico = atribs.get("ataque_magico", 0)
-
-                self.logger.info(f"🆙 Herói restaurado: Nível {self.heroi_ativo.nivel}, XP {self.heroi_ativo.xp}")
+            # B. Sobrescreve com os dados do JSON
+            self.heroi_ativo.nivel = stats_salvos["nivel"]
+            self.heroi_ativo.xp = stats_salvos["xp"]
             
-            else:
-                # Se não tem stats salvos, garante que não fica lixo na memória
-                self.heroi_ativo = None
-            # ------------------------------------------------------------------
+            # C. Restaura os atributos (para manter vida atual, etc)
+            atribs = stats_salvos.get("atributos", {})
+            self.heroi_ativo._atrib.vida = atribs.get("vida", 10)
+            self.heroi_ativo._atrib.vida_max = atribs.get("vida_max", 10)
+            self.heroi_ativo._atrib.ataque = atribs.get("ataque", 1)
+            self.heroi_ativo._atrib.defesa = atribs.get("defesa", 0)
+            
+            # (Opcional) Mana e Magia se a classe tiver
+            if hasattr(self.heroi_ativo._atrib, "mana"):
+                self.heroi_ativo._atrib.mana = atribs.get("mana", 0)
+            if hasattr(self.heroi_ativo._atrib, "ataque_magico"):
+                self.heroi_ativo._atrib.ataque_magico = atribs.get("ataque_magico", 0)
+            for efeito, valor in (stats_salvos.get("efeitos") or {}).items():
+                self.heroi_ativo.efeitos[efeito] = valor
+
+            self.logger.info("🆙 Herói restaurado: Nível %s, XP %s", self.heroi_ativo.nivel, self.heroi_ativo.xp)
+        
+        else:
+            # Se não tem stats salvos, garante que não fica lixo na memória
+            self.heroi_ativo = None
+        # ------------------------------------------------------------------
 
-            # 3. Carregar inventário (Seu código original)
-            itens = dados.get("inventario")
-            if itens is not None:
-                try:
-                    self.inven = Inventario()
-                    restored = []
-                    for it in itens:
-                        if isinstance(it, dict):
-                            try:
-                                restored.append(Item(**it))
-                            except:
-                                restored.append(it)
-                        else:
+        # 3. Carregar inventário (Seu código original)
+        itens = dados.get("inventario")
+        if itens is not None:
+            try:
+                self.inven = Inventario()
+                restored = []
+                for it in itens:
+                    if isinstance(it, dict):
+                        try:
+                            restored.append(Item(**it))
+                        except:
                             restored.append(it)
-                    self.inven.itens = restored
+                    else:
+                        restored.append(it)
+                self.inven.itens = restored
+                
+                # IMPORTANTE: Conecta o inventário carregado ao herói recriado
+                if self.heroi_ativo:
+                    self.heroi_ativo.inventario = self.inven
                     
-                    # IMPORTANTE: Conecta o inventário carregado ao herói recriado
-                    if self.heroi_ativo:
-                        self.heroi_ativo.inventario = self.inven
-                        
-                except Exception:
-                    self.logger.error("Erro ao restaurar inventário do save.")
-            
-            self.logger.info("✅ Dados do jogo carregados com sucesso")
-
-        except Exception as error:
-            self.logger.error(f"❌ Erro ao carregar arquivo: {error}")
-            print(f"Erro ao carregar arquivo: {error}")
+            except Exception:
+                self.logger.error("Erro ao restaurar inventário do save.")
+        
+        self.logger.info("✅ Dados do jogo carregados com sucesso")
 
     def _ajuda_carregar(self) -> None:
         print("\nAjuda — Carregar")
-        print("- O carregamento usa os arquivos .json da pasta 'saves'.")
+        print("- O carregamento usa os arquivos .sav e .json da pasta 'saves'.")
 
     # ========================= INICIAR MISSÃO ==============================
 
@@ -732,7 +956,7 @@ class Jogo:
         if self.heroi_ativo is None:
             # Cria a instância e SALVA em self.heroi_ativo
             self.heroi_ativo = criar_personagem(self.personagem["arquetipo"], self.personagem["nome"])
-            self.logger.info(f"🎮 Novo Herói instanciado: {self.heroi_ativo.nome}")
+            self.logger.info("🎮 Novo Herói instanciado: %s", self.heroi_ativo.nome)
             
             # Sincroniza inventário
             try:
@@ -740,7 +964,7 @@ class Jogo:
             except Exception:
                 pass
         else:
-            self.logger.info(f"🎮 Usando herói existente: {self.heroi_ativo.nome} (Nível {self.heroi_ativo.nivel})")
+            self.logger.info("🎮 Usando herói existente: %s (Nível %s)", self.heroi_ativo.nome, self.heroi_ativo.nivel)
 
         # Define quem vai para a missão (usa a variável da classe, não uma local)
         heroi_para_missao = self.heroi_ativo
@@ -758,10 +982,12 @@ class Jogo:
 
         try:
             # Passa o self.heroi_ativo para a engine
-            engine = Missao(inimigo=inimigo, heroi=heroi_para_missao, cenario=cenario, dificuldade=dificuldade, missao=self.missao_config.get("missao"))
+            engine = Missao(inimigo=inimigo, heroi=heroi_para_missao, cenario=cenario, dificuldade=dificuldade,
+                            missao=self.missao_config.get("missao"), rng=self.rng.filho(),
+                            ao_checkpoint=self._autosalvar)
             self.logger.info("🎯 Engine de missão criada com sucesso")
         except Exception as e:
-            self.logger.error(f"❌ Erro ao criar engine de Missão: {e}")
+            self.logger.error("❌ Erro ao criar engine de Missão: %s", e)
             print("Erro ao criar engine de Missão:", e)
             return
 
@@ -772,11 +998,19 @@ class Jogo:
             resultado = engine.executar()
 
         if isinstance(resultado, ResultadoMissao):
+            if self._repositorio is not None:   # histórico só para quem já usa o banco
+                try:
+                    self._repositorio.registrar_missao(
+                        self.personagem["nome"], cenario, dificuldade,
+                        resultado.venceu, resultado.encontros_vencidos, resultado.detalhes)
+                except Exception as error:
+                    self.logger.error("❌ Erro ao registrar missão no banco: %s", error)
             if resultado.venceu:
-                self.logger.info(f"🏆 Missão concluída com sucesso! XP Atual: {heroi_para_missao.xp}")
+                self.logger.info("🏆 Missão concluída com sucesso! XP Atual: %s", heroi_para_missao.xp)
                 print(f"Missão concluída! Encontros vencidos: {resultado.encontros_vencidos}")
+                self._autosalvar()
             else:
-                self.logger.warning(f"💀 Missão falhou.")
+                self.logger.warning("💀 Missão falhou.")
                 print(f"Missão falhou. Encontros vencidos: {resultado.encontros_vencidos}")
                 
                 # Se morreu, reseta o herói ativo para NULL, obrigando a criar um novo na próxima
@@ -868,8 +1102,8 @@ class Jogo:
         if item_encontrado:
             self.inven.remover_item(item_encontrado)
             print(f"Item '{nome_item}' Removido com Sucesso!")
-            self.logger.info(f"Item '{nome_item}' Removido do inventário")
+            self.logger.info("Item '%s' Removido do inventário", nome_item)
 
         else:
             print(f"Item '{nome_item}' não encontrado no inventário.")
-            self.logger.info(f"Tentativa de remover item inexistente: '{nome_item}' ")
+            self.logger.info("Tentativa de remover item inexistente: '%s' ", nome_item)
@@ -29,6 +29,7 @@ def menu() -> None:
         elif op == "6":
             jogo.menu_inventario()
         elif op == "0":
+            jogo.encerrar()
             print("Até logo!")
             break
         else:
@@ -1,15 +1,94 @@
 from __future__ import annotations
-from dataclasses import dataclass
 
-@dataclass
+from .efeitos import REGISTRO
+
+
 class Atributos:
-    vida: int
-    ataque: int
-    defesa: int
-    mana: int = 0
-    vida_max: int | None = None
+    """
+    Atributos de combate. Classe com __slots__ (sem __dict__ por instância):
+    menos memória por entidade e acesso mais rápido. Campos fora dos slots
+    (ex.: ataque_magico) não existem — getattr(atrib, "x", padrao) segue valendo.
+    """
+
+    __slots__ = ("vida", "ataque", "defesa", "mana", "vida_max")
+
+    def __init__(self, vida: int, ataque: int, defesa: int, mana: int = 0, vida_max: int | None = None):
+        self.vida = vida
+        self.ataque = ataque
+        self.defesa = defesa
+        self.mana = mana
+        self.vida_max = vida_max
+
+    def __repr__(self) -> str:
+        return (f"Atributos(vida={self.vida!r}, ataque={self.ataque!r}, defesa={self.defesa!r}, "
+                f"mana={self.mana!r}, vida_max={self.vida_max!r})")
+
+    def __eq__(self, outro: object) -> bool:
+        if outro.__class__ is not self.__class__:
+            return NotImplemented
+        return (self.vida, self.ataque, self.defesa, self.mana, self.vida_max) == \
+               (outro.vida, outro.ataque, outro.defesa, outro.mana, outro.vida_max)
+
+    __hash__ = None  # mutável, como o dataclass original
+
+
+class Efeitos(dict):
+    """
+    dict de efeitos esparso: só guarda os efeitos já aplicados; leia com .get(chave, padrão).
+    Mantém também o índice dos efeitos registrados ativos (ver models/efeitos.py).
+    """
+
+    __slots__ = ("_ativos",)
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self._ativos: dict = {}     # chave -> None, em ordem de ativação
+        for chave, valor in self.items():
+            self._indexar(chave, valor)
+
+    def _indexar(self, chave, valor) -> None:
+        if chave in REGISTRO:
+            if isinstance(valor, int) and valor > 0:
+                self._ativos.setdefault(chave)
+            else:
+                self._ativos.pop(chave, None)
+
+    def __setitem__(self, chave, valor) -> None:
+        super().__setitem__(chave, valor)
+        self._indexar(chave, valor)
+
+    def __delitem__(self, chave) -> None:
+        super().__delitem__(chave)
+        self._ativos.pop(chave, None)
+
+    def update(self, *args, **kwargs) -> None:
+        for chave, valor in dict(*args, **kwargs).items():
+            self[chave] = valor
+
+    def pop(self, *args):
+        self._ativos.pop(args[0], None)
+        return super().pop(*args)
+
+    def setdefault(self, chave, padrao=None):
+        if chave not in self:
+            self[chave] = padrao
+        return super().__getitem__(chave)
+
+    def clear(self) -> None:
+        super().clear()
+        self._ativos.clear()
+
+    def ativos(self) -> dict:
+        """Só as entradas com valor (zeradas/False ficam de fora)."""
+        return {k: v for k, v in self.items() if v}
+
+    def indice(self) -> list:
+        """Efeitos registrados com turnos restantes, sem varrer o dict."""
+        return list(self._ativos)
 
 class Entidade:
+    __slots__ = ("nome", "_atrib", "_attrib_fix")
+
     def __init__(self, nome: str, atrib: Atributos):
         self.nome = nome
         self._atrib = atrib
@@ -0,0 +1,323 @@
+from __future__ import annotations
+from typing import Dict, NamedTuple, Optional, Tuple
+
+from dado import GeradorDados, gerador_atual
+from .base import Entidade
+from .efeitos import MAXIMO, REGISTRO, SOMAR
+from .habilidades import Habilidade, visao_habilidades
+from .personagem import Personagem, custo_ataque_basico
+
+try:  # NumPy é obrigatório aqui (o motor de objetos continua sendo MissaoHordas)
+    import numpy as np
+except ImportError:  # pragma: no cover - depende do ambiente
+    np = None
+
+"""
+Duelos em lockstep (NumPy) — muitos duelos herói x inimigo independentes de uma vez
+- O estado de cada duelo é uma posição de arrays: vida, mana, contadores de efeito, flags
+- passo() avança TODOS os duelos ativos um turno, na ordem de MissaoHordas:
+  turnos += 1 -> efeitos do herói -> ação (decidir_acao_auto) -> efeitos do
+  inimigo -> ataque do inimigo (d6 + ataque)
+- Regras reproduzidas: receber_dano (dano - defesa, piso 0), ticks do registro de
+  efeitos (ordem, invulnerabilidade, acúmulo), custos de mana, bloqueio por mana,
+  crítico do Estilo do Caçador, atordoamento, invulnerável e reflexão
+- Só o encontro: XP, drops e subida de nível entre encontros ficam com MissaoHordas
+- Os dados saem de GeradorDados.matriz_numpy: estatisticamente iguais ao motor de
+  objetos, mas não o mesmo fluxo de rolagens
+
+Exemplo:
+    heroi = criar_personagem("Mago"); heroi.avancar_para_nivel(4)
+    chefe = generate_horde("Caverna", "Difícil", {"nome": "derrotar Troll"})[0]
+    res = DuelosVetorizados(heroi, chefe, 100_000, rng=GeradorDados(42)).simular()
+    print(res.taxa_vitoria, res.turnos_medios)
+"""
+
+
+class EspecialVetorizada(NamedTuple):
+    """O que um esp_* faz num duelo solo, em termos de colunas (sem log)."""
+    dados: Tuple[int, int] = (0, 0)                  # (quantidade, faces) do dano
+    soma_ataque: bool = False                        # + ataque do herói
+    multiplicador: int = 1
+    bonus: int = 0
+    no_alvo: Tuple[Tuple[str, int], ...] = ()        # efeitos aplicados no inimigo
+    em_si: Tuple[Tuple[str, int], ...] = ()          # efeitos aplicados no herói
+    cura: Tuple[int, int] = (0, 0)                   # (quantidade, faces)
+    mana: int = 0                                    # mana recuperada
+    apos_turnos: int = 0                             # antes disso falha sem gastar mana
+    uma_vez: bool = False                            # uma vez por duelo (Empurrão Sísmico)
+    sacrificio: bool = False                         # herói vai a 0 de vida
+    flecha_critica: bool = False                     # próximo básico do Arqueiro: d20 * 2
+
+
+_SANGRAR_2 = (("sangramento_turnos", 2),)
+
+# Por handler do registro de habilidades. Especiais só de buff (bonus_proximo,
+# critico_proximo: o ataque básico não os lê) ou só de aliado (sem aliados no
+# duelo solo) apenas gastam a mana — exatamente como no motor de objetos.
+ESPECIAIS: Dict[str, EspecialVetorizada] = {
+    # Guerreiro
+    "esp_execucao_publica": EspecialVetorizada((5, 6), multiplicador=2, bonus=3, apos_turnos=4),
+    "esp_perseveranca": EspecialVetorizada(em_si=(("invulneravel_turnos", 1),)),
+    "esp_golpe_trovejante": EspecialVetorizada((1, 20), soma_ataque=True),
+    "esp_lamina_infera": EspecialVetorizada((3, 6), no_alvo=_SANGRAR_2),
+    "esp_duro_na_queda": EspecialVetorizada(),
+    "esp_determinacao_mortal": EspecialVetorizada(cura=(1, 20)),
+    "esp_golpe_estilhacador": EspecialVetorizada(),
+    # Mago
+    "esp_colapso_minguante": EspecialVetorizada((6, 6)),
+    "esp_descarnar": EspecialVetorizada((3, 20), no_alvo=_SANGRAR_2),
+    "esp_distorcao_no_tempo": EspecialVetorizada(mana=50),
+    "esp_empurrao_sismico": EspecialVetorizada((3, 6), no_alvo=(("nao_pode_atacar", 1),), uma_vez=True),
+    "esp_paradoxo": EspecialVetorizada((5, 6)),
+    "esp_eletrocussao": EspecialVetorizada((3, 6), no_alvo=(("eletro_turnos", 2),)),
+    "esp_explosao_florescente": EspecialVetorizada((10, 6), em_si=(("nao_pode_atacar", 1),)),
+    # Arqueiro
+    "esp_curingas": EspecialVetorizada((5, 6)),
+    "esp_cortes_certeiros": EspecialVetorizada(no_alvo=(("sangramento_turnos", 5),)),
+    "esp_estilo_do_cacador": EspecialVetorizada(flecha_critica=True),
+    "esp_marca_fatal": EspecialVetorizada(no_alvo=(("marca_fatal_turnos", 7),)),
+    "esp_aljava_da_ruina": EspecialVetorizada(),
+    "esp_contaminar": EspecialVetorizada(no_alvo=(("veneno_turnos", 3),)),
+    "esp_as_na_manga": EspecialVetorizada(),
+    # Curandeiro
+    "esp_capitulo_final": EspecialVetorizada(),
+    "esp_semente_engatilhada": EspecialVetorizada(),
+    "esp_ventos_revigorantes": EspecialVetorizada(em_si=(("refletir_dano_turnos", 1),)),
+    "esp_golpe_de_misericordia": EspecialVetorizada((4, 20), sacrificio=True),
+    "esp_hemofagia": EspecialVetorizada((2, 6), cura=(1, 6)),
+    "esp_transfusao_vital": EspecialVetorizada(),
+    "esp_resplendor_cosmico": EspecialVetorizada(),
+}
+
+# Defensivas do Curandeiro com HP < 35% (mesma heurística de decidir_acao_auto)
+DEFENSIVAS = {"Capítulo Final", "Semente Engatilhada", "Ventos Revigorantes"}
+_BASICO = -1
+
+
+class ResultadoDuelos(NamedTuple):
+    venceu: np.ndarray          # inimigo derrotado
+    turnos: np.ndarray          # turnos jogados em cada duelo
+    vida_heroi: np.ndarray
+    vida_inimigo: np.ndarray
+    mana_gasta: np.ndarray
+
+    @property
+    def taxa_vitoria(self) -> float:
+        return float(self.venceu.mean()) if len(self.venceu) else 0.0
+
+    @property
+    def turnos_medios(self) -> float:
+        """Turnos até vencer (só duelos vencidos)."""
+        return float(self.turnos[self.venceu].mean()) if self.venceu.any() else float("nan")
+
+
+class _Lado:
+    """Colunas de um combatente em todos os duelos."""
+
+    def __init__(self, n: int, entidade: Entidade):
+        a = entidade._atrib
+        self.vida = np.full(n, a.vida, dtype=np.int32)
+        self.vida_max = np.full(n, a.vida_max or a.vida, dtype=np.int32)
+        self.mana = np.full(n, getattr(a, "mana", 0), dtype=np.int32)
+        self.ataque = int(a.ataque)
+        self.defesa = max(0, int(a.defesa))
+        ef = getattr(entidade, "efeitos", None) or {}
+        self.efeitos = {c: np.full(n, int(ef.get(c, 0) or 0), dtype=np.int32) for c in REGISTRO}
+        self.sangra_d6 = np.full(n, ef.get("sangramento_tipo") == "d6", dtype=bool)
+        self.veneno_dano = np.full(n, max(0, int(ef.get("veneno_dano", 2))), dtype=np.int32)
+
+    def receber_dano(self, dano, mascara):
+        """Entidade.receber_dano nas posições de 'mascara'; devolve o dano aplicado."""
+        aplicado = np.where(mascara, np.maximum(0, np.maximum(0, dano) - self.defesa), 0)
+        np.maximum(self.vida - aplicado, 0, out=self.vida)
+        return aplicado
+
+    def curar(self, qtd, mascara) -> None:
+        self.vida[mascara] = np.minimum(self.vida_max, self.vida + np.maximum(0, qtd))[mascara]
+
+    def aplicar_efeito(self, chave: str, turnos: int, mascara) -> None:
+        """aplicar_efeito (regra de acúmulo do registro) nas posições de 'mascara'."""
+        col = self.efeitos[chave]
+        acumulo = REGISTRO[chave].acumulo
+        if acumulo == SOMAR:
+            col[mascara] += turnos
+        elif acumulo == MAXIMO:
+            col[mascara] = np.maximum(col[mascara], turnos)
+        else:
+            col[mascara] = turnos
+
+
+class DuelosVetorizados:
+    """
+    n duelos 'heroi' x 'inimigo' (cópias dos atributos e efeitos atuais de cada um).
+    O herói joga como decidir_acao_auto com as especiais liberadas no nível dele.
+    """
+
+    def __init__(self, heroi: Personagem, inimigo: Entidade, n: int, rng: GeradorDados | None = None):
+        if np is None:
+            raise ImportError("DuelosVetorizados requer NumPy (pip install numpy).")
+        self.n = int(n)
+        self.rng = rng or gerador_atual()
+        self.classe = type(heroi).__name__
+        self.heroi = _Lado(self.n, heroi)
+        self.inimigo = _Lado(self.n, inimigo)
+        self.custo_basico = custo_ataque_basico(heroi)
+        self.especiais: Tuple[Tuple[Habilidade, EspecialVetorizada], ...] = tuple(
+            (hab, ESPECIAIS[hab.handler]) for hab, _ in visao_habilidades(type(heroi), heroi.nivel).por_id.values()
+        )
+
+        n_ = self.n
+        self.turnos_heroi = np.full(n_, int(heroi.efeitos.get("turnos", 0)), dtype=np.int32)
+        self.flecha_critica = np.full(n_, bool(heroi.efeitos.get("prox_flecha_d20_critico")), dtype=bool)
+        self.empurrao_usado = np.full(n_, bool(heroi.efeitos.get("empurrao_sismico_usado")), dtype=bool)
+        self.turnos = np.zeros(n_, dtype=np.int32)
+        self.mana_gasta = np.zeros(n_, dtype=np.int32)
+        self.ativo = (self.heroi.vida > 0) & (self.inimigo.vida > 0)
+
+    # ---------------- dados ----------------
+    def _rolar(self, quantidade: int, faces: int):
+        """Soma de 'quantidade' d'faces' para cada duelo."""
+        if quantidade <= 0:
+            return np.zeros(self.n, dtype=np.int64)
+        return self.rng.matriz_numpy(self.n, quantidade, faces).sum(axis=1)
+
+    # ---------------- regras ----------------
+    def _tick(self, lado: _Lado, mascara):
+        """tick_efeitos_inicio_turno para 'lado' nas posições de 'mascara'."""
+        ef = lado.efeitos
+        invulneravel = ef["invulneravel_turnos"] > 0
+        total = np.zeros(self.n, dtype=np.int64)
+        for chave in REGISTRO:          # já em ordem de tick
+            ativos = mascara & (ef[chave] > 0)
+            if not ativos.any():
+                continue
+            if chave == "semente_turnos":
+                ef[chave][ativos] -= 1
+                lado.curar(np.maximum(0, self._rolar(1, 20) - 5), ativos & (ef[chave] == 0))
+                continue
+            sofre = ativos & ~invulneravel
+            if chave == "eletro_turnos":
+                total += lado.receber_dano(np.maximum(0, self._rolar(1, 6) - 1), sofre)
+            elif chave == "veneno_turnos":
+                total += lado.receber_dano(lado.veneno_dano, sofre)
+            elif chave == "sangramento_turnos":
+                total += lado.receber_dano(np.where(lado.sangra_d6, self._rolar(1, 6), 1), sofre)
+            elif chave == "marca_fatal_turnos":
+                total += lado.receber_dano(self._rolar(1, 6), sofre)
+            ef[chave][ativos] -= 1
+        return total
+
+    def _escolher(self, mascara):
+        """decidir_acao_auto por duelo: índice em self.especiais ou _BASICO."""
+        h = self.heroi
+        escolha = np.full(self.n, _BASICO, dtype=np.int8)
+        livre = mascara.copy()
+        if self.classe == "Curandeiro":
+            critico = livre & (h.vida * 100 < 35 * h.vida_max)
+            for i, (hab, _) in enumerate(self.especiais):
+                if hab.nome in DEFENSIVAS:
+                    pega = critico & (h.mana >= hab.custo)
+                    escolha[pega] = i
+                    critico &= ~pega
+                    livre &= ~pega
+        for i, (hab, _) in enumerate(self.especiais):
+            if hab.custo > 0:
+                pega = livre & (h.mana >= hab.custo)
+                escolha[pega] = i
+                livre &= ~pega
+        return escolha
+
+    def _ataque_basico(self, mascara) -> None:
+        h, alvo = self.heroi, self.inimigo
+        pode = mascara & (h.mana >= self.custo_basico)      # bloqueio por mana (Mago)
+        h.mana[pode] -= self.custo_basico
+        dano = self._rolar(1, 6) + h.ataque
+        if self.classe == "Curandeiro":
+            dano = np.maximum(0, dano - 2)
+        elif self.classe == "Arqueiro":
+            critico = pode & self.flecha_critica
+            dano = np.where(critico, self._rolar(1, 20) * 2 + h.ataque, dano)
+            self.flecha_critica[critico] = False
+        alvo.receber_dano(dano, pode)
+
+    def _especial(self, hab: Habilidade, esp: EspecialVetorizada, mascara) -> None:
+        h, alvo = self.heroi, self.inimigo
+        if esp.apos_turnos:
+            mascara = mascara & (self.turnos_heroi >= esp.apos_turnos)
+        if esp.uma_vez:
+            mascara = mascara & ~self.empurrao_usado
+            self.empurrao_usado |= mascara
+        if not mascara.any():
+            return
+        h.mana[mascara] -= hab.custo
+        if esp.mana:
+            h.mana[mascara] += esp.mana
+        for chave, turnos in esp.no_alvo:
+            alvo.aplicar_efeito(chave, turnos, mascara)
+            if chave == "sangramento_turnos":
+                alvo.sangra_d6 |= mascara
+            elif chave == "veneno_turnos":
+                alvo.veneno_dano[mascara] = 2
+        for chave, turnos in esp.em_si:
+            h.aplicar_efeito(chave, turnos, mascara)
+        if esp.flecha_critica:
+            self.flecha_critica |= mascara
+        if esp.cura[0]:
+            h.curar(self._rolar(*esp.cura), mascara)
+        if esp.dados[0]:
+            dano = self._rolar(*esp.dados) * esp.multiplicador + esp.bonus
+            if esp.soma_ataque:
+                dano += h.ataque
+            alvo.receber_dano(dano, mascara)
+        if esp.sacrificio:
+            h.vida[mascara] = 0
+
+    def passo(self) -> int:
+        """Avança um turno em todos os duelos ativos; devolve quantos seguem ativos."""
+        h, i = self.heroi, self.inimigo
+        ativo = self.ativo
+        self.turnos[ativo] += 1
+        self.turnos_heroi[ativo] += 1
+
+        self._tick(h, ativo)
+        age = ativo & (h.efeitos["nao_pode_atacar"] == 0)
+        if age.any():
+            mana_antes = h.mana.copy()
+            escolha = self._escolher(age)
+            self._ataque_basico(age & (escolha == _BASICO))
+            for k, (hab, esp) in enumerate(self.especiais):
+                usa = age & (escolha == k)
+                if usa.any():
+                    self._especial(hab, esp, usa)
+            self.mana_gasta += np.maximum(0, mana_antes - h.mana)
+
+        # inimigo vivo após a ação: efeitos dele e depois o ataque
+        segue = ativo & (i.vida > 0)
+        self._tick(i, segue)
+        segue &= i.vida > 0
+        ataca = segue & (i.efeitos["nao_pode_atacar"] == 0)
+        dano = np.where(h.efeitos["invulneravel_turnos"] > 0, 0, np.maximum(0, self._rolar(1, 6) + i.ataque))
+        aplicado = h.receber_dano(dano, ataca)
+        i.receber_dano(aplicado, ataca & (aplicado > 0) & (h.efeitos["refletir_dano_turnos"] > 0))
+
+        self.ativo = ativo & (h.vida > 0) & (i.vida > 0)
+        return int(self.ativo.sum())
+
+    def simular(self, max_turnos: int = 1000) -> ResultadoDuelos:
+        """Roda até todos os duelos terminarem (ou 'max_turnos')."""
+        for _ in range(max_turnos):
+            if not self.passo():
+                break
+        return ResultadoDuelos(
+            venceu=self.inimigo.vida == 0,
+            turnos=self.turnos.copy(),
+            vida_heroi=self.heroi.vida.copy(),
+            vida_inimigo=self.inimigo.vida.copy(),
+            mana_gasta=self.mana_gasta.copy(),
+        )
+
+
+def simular_duelos(heroi: Personagem, inimigo: Entidade, n: int = 100_000,
+                   semente: Optional[int] = None, max_turnos: int = 1000) -> ResultadoDuelos:
+    """Atalho: n duelos com um fluxo de dados próprio (semente reproduzível)."""
+    return DuelosVetorizados(heroi, inimigo, n, rng=GeradorDados(semente)).simular(max_turnos)
@@ -0,0 +1,192 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING, Callable, Dict, List, NamedTuple, Optional, Sequence
+
+from dado import d6, d20, dados_sorteados, rolar_lote
+from utils.logger import logger
+
+if TYPE_CHECKING:
+    from .base import Entidade
+
+"""
+Registro de efeitos com contador de turnos (DoTs, controle, mitigação)
+- Cada efeito declara: ordem no tick, fase, regra de acúmulo, função de tick e
+  se avisa no último turno ("prestes a terminar")
+- Cada entidade mantém um índice só dos efeitos ativos (Efeitos.indice()), então
+  o tick custa O(efeitos ativos) e efeitos novos não encarecem os demais
+- Chaves auxiliares (veneno_dano, sangramento_tipo, is_boss...) continuam no dict
+  de efeitos, fora do registro
+- tick_lote(entidades): todos os d6 dos DoTs do turno saem de um único rolar_lote
+  e o retorno é o dano total por entidade
+
+Novo efeito:
+    registrar(Efeito("queimadura_turnos", 60, INICIO, SOMAR, _dot(...), aviso=True, dados=_um_dado))
+"""
+
+# Fases do tick: INICIO roda antes do aviso de fim de efeito, FIM depois dele
+INICIO = "inicio"
+FIM = "fim"
+
+# Regras de acúmulo ao reaplicar um efeito já ativo
+MAXIMO = "maximo"            # fica a maior duração
+SOMAR = "somar"              # durações se somam
+SUBSTITUIR = "substituir"    # a nova duração sobrescreve
+
+
+Rolar = Callable[[str], int]     # contexto -> resultado do d6
+
+
+class Efeito(NamedTuple):
+    chave: str
+    ordem: int
+    fase: str
+    acumulo: str
+    tick: Callable[["Entidade", bool, Rolar], int]   # (alvo, invulneravel, rolar) -> dano sofrido
+    aviso: bool = False
+    dados: Optional[Callable[["Entidade", bool], int]] = None   # quantos d6 o tick vai rolar
+
+
+REGISTRO: Dict[str, Efeito] = {}
+
+
+def registrar(efeito: Efeito) -> Efeito:
+    REGISTRO[efeito.chave] = efeito
+    # mantém o registro em ordem de tick (os índices das entidades dependem disso)
+    for chave in sorted(REGISTRO, key=lambda c: REGISTRO[c].ordem):
+        REGISTRO[chave] = REGISTRO.pop(chave)
+    return efeito
+
+
+# ---------------- ticks ----------------
+
+def _dot(chave: str, emoji: str, nome: str, dano: Callable[["Entidade", Rolar], int]):
+    """Dano por turno (bloqueado por invulnerabilidade) + decremento da duração."""
+    def tick(alvo: Entidade, invulneravel: bool, rolar: Rolar) -> int:
+        total = 0
+        if not invulneravel:
+            valor = dano(alvo, rolar)
+            total = alvo.receber_dano(valor)
+            logger.info("%s %s em %s: %s de dano", emoji, nome, alvo.nome, valor)
+        alvo.efeitos[chave] -= 1
+        return total
+    return tick
+
+
+def _contador(chave: str):
+    """Efeito sem dano: só conta os turnos."""
+    def tick(alvo: Entidade, invulneravel: bool, rolar: Rolar) -> int:
+        alvo.efeitos[chave] -= 1
+        return 0
+    return tick
+
+
+def _um_dado(alvo: Entidade, invulneravel: bool) -> int:
+    return 0 if invulneravel else 1
+
+
+def _sangramento(alvo: Entidade, rolar: Rolar) -> int:
+    if alvo.efeitos.get("sangramento_tipo") == "d6":
+        return rolar("Sangramento - Dano por Turno")
+    return max(0, alvo.efeitos.get("sangramento_dano", 1))
+
+
+def _dados_sangramento(alvo: Entidade, invulneravel: bool) -> int:
+    return 0 if invulneravel or alvo.efeitos.get("sangramento_tipo") != "d6" else 1
+
+
+def _semente(alvo: Entidade, invulneravel: bool, rolar: Rolar) -> int:
+    # Semente Engatilhada: quando zera, cura 1d20-5
+    alvo.efeitos["semente_turnos"] -= 1
+    if alvo.efeitos["semente_turnos"] == 0 and hasattr(alvo, "curar"):
+        cura_semente = max(0, d20("Semente Engatilhada - Cura") - 5)
+        alvo.curar(cura_semente)
+        logger.info("🌱 Semente Engatilhada ativa em %s: +%s de vida", alvo.nome, cura_semente)
+    return 0
+
+
+registrar(Efeito("eletro_turnos", 10, INICIO, SOMAR, _dot(
+    "eletro_turnos", "⚡", "Eletrocussão",
+    lambda alvo, rolar: max(0, rolar("Eletrocussão - Dano por Turno") - 1)), aviso=True, dados=_um_dado))
+registrar(Efeito("veneno_turnos", 20, INICIO, MAXIMO, _dot(
+    "veneno_turnos", "☠️", "Veneno",
+    lambda alvo, rolar: max(0, alvo.efeitos.get("veneno_dano", 2))), aviso=True))
+registrar(Efeito("sangramento_turnos", 30, INICIO, MAXIMO, _dot(
+    "sangramento_turnos", "🩸", "Sangramento", _sangramento), aviso=True, dados=_dados_sangramento))
+registrar(Efeito("marca_fatal_turnos", 40, INICIO, MAXIMO, _dot(
+    "marca_fatal_turnos", "🎯", "Marca Fatal",
+    lambda alvo, rolar: rolar("Marca Fatal - Dano por Turno")), aviso=True, dados=_um_dado))
+registrar(Efeito("semente_turnos", 50, INICIO, SUBSTITUIR, _semente, aviso=True))
+registrar(Efeito("nao_pode_atacar", 60, FIM, SOMAR, _contador("nao_pode_atacar")))
+registrar(Efeito("refletir_dano_turnos", 70, FIM, MAXIMO, _contador("refletir_dano_turnos"), aviso=True))
+registrar(Efeito("invulneravel_turnos", 80, FIM, MAXIMO, _contador("invulneravel_turnos"), aviso=True))
+
+
+# ---------------- API ----------------
+
+def ativos_de(efeitos) -> List[str]:
+    """Chaves registradas ativas; usa o índice da entidade quando existe."""
+    indice = getattr(efeitos, "indice", None)
+    if indice is not None:
+        return indice()
+    return [k for k, v in efeitos.items() if k in REGISTRO and isinstance(v, int) and v > 0]
+
+
+def aplicar_efeito(alvo: Entidade, chave: str, turnos: int) -> int:
+    """Aplica/reaplica 'chave' respeitando a regra de acúmulo. Retorna a duração final."""
+    efeito = REGISTRO[chave]
+    atual = alvo.efeitos.get(chave, 0)
+    if efeito.acumulo == SOMAR:
+        turnos = atual + turnos
+    elif efeito.acumulo == MAXIMO:
+        turnos = max(atual, turnos)
+    alvo.efeitos[chave] = turnos
+    return turnos
+
+
+def _tick(alvo: Entidade, ordem: List[str], invulneravel: bool, rolar: Rolar) -> int:
+    efeitos = alvo.efeitos
+    total = 0
+    for chave in ordem:
+        efeito = REGISTRO[chave]
+        if efeito.fase == INICIO:
+            total += efeito.tick(alvo, invulneravel, rolar)
+
+    # Log de efeitos que estão terminando
+    for chave in ativos_de(efeitos):
+        if REGISTRO[chave].aviso and efeitos.get(chave) == 1:
+            logger.info("⏰ %s está prestes a terminar em %s", chave.replace('_turnos', '').title(), alvo.nome)
+
+    for chave in ordem:
+        efeito = REGISTRO[chave]
+        if efeito.fase == FIM and efeitos.get(chave, 0) > 0:
+            total += efeito.tick(alvo, invulneravel, rolar)
+    return total
+
+
+def tick_lote(alvos: Sequence[Entidade]) -> List[int]:
+    """
+    Início de turno de vários combatentes numa passada só. Os d6 de todos os
+    DoTs saem de um único rolar_lote; retorna o dano sofrido por entidade.
+    """
+    planos = []
+    n_dados = 0
+    for alvo in alvos:
+        efeitos = getattr(alvo, "efeitos", None)
+        ativos = ativos_de(efeitos) if efeitos is not None else []
+        if not ativos:
+            planos.append(None)
+            continue
+        ordem = sorted(ativos, key=lambda c: REGISTRO[c].ordem)
+        invulneravel = efeitos.get("invulneravel_turnos", 0) > 0
+        for chave in ordem:
+            dados = REGISTRO[chave].dados
+            if dados is not None:
+                n_dados += dados(alvo, invulneravel)
+        planos.append((ordem, invulneravel))
+
+    rolar = dados_sorteados(rolar_lote(1, 6, n_dados).somas, 6) if n_dados else d6
+    return [_tick(alvo, *plano, rolar) if plano else 0 for alvo, plano in zip(alvos, planos)]
+
+
+def tick_inicio_turno(alvo: Entidade) -> int:
+    """Roda os efeitos ativos de 'alvo' em ordem de registro; retorna o dano sofrido."""
+    return tick_lote((alvo,))[0]
@@ -0,0 +1,263 @@
+from __future__ import annotations
+from array import array
+from collections.abc import MutableMapping
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence
+
+from .base import Entidade
+from .efeitos import REGISTRO, tick_lote
+
+try:  # NumPy é opcional: sem ele as colunas são array('i') e os lotes viram laços
+    import numpy as np
+except ImportError:  # pragma: no cover - depende do ambiente
+    np = None
+
+"""
+EntityStore — estado de muitas entidades em colunas contíguas (struct-of-arrays)
+- Colunas: vida, vida_max, ataque, defesa, mana + contadores de efeitos (turnos)
+- Entidades vinculadas viram "views": _atrib e efeitos leem/escrevem a linha
+  da store, então todo o código existente (receber_dano, ticks, skills) segue igual
+- Operações em lote por coluna: receber_dano_lote, decrementar, com_efeito, vivos
+- tick_efeitos: início de turno de toda a horda com um único sorteio de d6
+
+Exemplo:
+    store = EntityStore()
+    horda = generate_horde("Caverna", "Difícil")
+    linhas = store.vincular_todos(horda)
+    store.receber_dano_lote(linhas, [12] * len(linhas))
+"""
+
+ATRIBUTOS = ("vida", "vida_max", "ataque", "defesa", "mana")
+
+# Contadores de efeitos guardados em coluna (o resto de 'efeitos' fica num dict por linha)
+CONTADORES = tuple(REGISTRO)
+_COLUNAS = ATRIBUTOS + CONTADORES
+_EH_CONTADOR = frozenset(CONTADORES)
+
+
+class LinhaAtributos:
+    """View de uma linha da store com a mesma interface de Atributos."""
+
+    __slots__ = ("_store", "_linha")
+
+    def __init__(self, store: EntityStore, linha: int):
+        object.__setattr__(self, "_store", store)
+        object.__setattr__(self, "_linha", linha)
+
+    def __getattr__(self, nome: str) -> int:
+        # só chega aqui para nomes que não são slots
+        if nome in ATRIBUTOS:
+            return int(self._store.colunas[nome][self._linha])
+        raise AttributeError(nome)
+
+    def __setattr__(self, nome: str, valor: int) -> None:
+        if nome not in ATRIBUTOS:
+            raise AttributeError(f"'{nome}' não é um atributo da EntityStore")
+        self._store.colunas[nome][self._linha] = int(valor)
+
+    def __repr__(self) -> str:
+        valores = ", ".join(f"{c}={getattr(self, c)}" for c in ATRIBUTOS)
+        return f"LinhaAtributos(#{self._linha}: {valores})"
+
+
+class EfeitosLinha(MutableMapping):
+    """
+    View dos efeitos de uma linha: contadores vêm das colunas (sempre presentes,
+    0 quando inativos); chaves não numéricas (veneno_dano, sangramento_tipo,
+    is_boss...) ficam num dict da própria linha.
+    """
+
+    __slots__ = ("_store", "_linha", "_extras")
+
+    def __init__(self, store: EntityStore, linha: int, extras: Dict[str, Any]):
+        self._store = store
+        self._linha = linha
+        self._extras = extras
+
+    def __getitem__(self, chave: str) -> Any:
+        if chave in _EH_CONTADOR:
+            return int(self._store.colunas[chave][self._linha])
+        return self._extras[chave]
+
+    def get(self, chave: str, padrao: Any = None) -> Any:
+        if chave in _EH_CONTADOR:
+            return int(self._store.colunas[chave][self._linha])
+        return self._extras.get(chave, padrao)
+
+    def __setitem__(self, chave: str, valor: Any) -> None:
+        if chave in _EH_CONTADOR:
+            self._store.colunas[chave][self._linha] = int(valor)
+        else:
+            self._extras[chave] = valor
+
+    def __delitem__(self, chave: str) -> None:
+        if chave in _EH_CONTADOR:
+            self._store.colunas[chave][self._linha] = 0
+        else:
+            del self._extras[chave]
+
+    def __iter__(self) -> Iterator[str]:
+        yield from CONTADORES
+        yield from self._extras
+
+    def __len__(self) -> int:
+        return len(CONTADORES) + len(self._extras)
+
+    def ativos(self) -> dict:
+        return {k: v for k, v in self.items() if v}
+
+    def indice(self) -> list:
+        """Efeitos registrados ativos: lê só as colunas de contadores."""
+        colunas, linha = self._store.colunas, self._linha
+        return [c for c in CONTADORES if colunas[c][linha] > 0]
+
+
+class EntityStore:
+    """
+    Colunas contíguas (NumPy int32 ou array('i')) para milhares de entidades.
+    Linhas removidas vão para uma lista livre e são reaproveitadas.
+    """
+
+    def __init__(self, capacidade: int = 1024, usar_numpy: bool | None = None):
+        self.numpy = np is not None if usar_numpy is None else bool(usar_numpy and np is not None)
+        self.capacidade = max(1, int(capacidade))
+        self.colunas: Dict[str, Any] = {c: self._coluna_vazia(self.capacidade) for c in _COLUNAS}
+        self.extras: List[Optional[Dict[str, Any]]] = [None] * self.capacidade
+        self.entidades: List[Optional[Entidade]] = [None] * self.capacidade
+        self.tamanho = 0                 # linhas já usadas (inclui as livres)
+        self._livres: List[int] = []
+
+    def __len__(self) -> int:
+        return self.tamanho - len(self._livres)
+
+    def _coluna_vazia(self, n: int):
+        if self.numpy:
+            return np.zeros(n, dtype=np.int32)
+        return array("i", bytes(4 * n))
+
+    def _crescer(self) -> None:
+        nova = self.capacidade * 2
+        for c, col in self.colunas.items():
+            if self.numpy:
+                maior = np.zeros(nova, dtype=np.int32)
+                maior[:self.capacidade] = col
+            else:
+                maior = col
+                maior.extend(array("i", bytes(4 * (nova - self.capacidade))))
+            self.colunas[c] = maior
+        self.extras.extend([None] * (nova - self.capacidade))
+        self.entidades.extend([None] * (nova - self.capacidade))
+        self.capacidade = nova
+
+    # ---------------- linhas ----------------
+    def adicionar(self, vida: int, ataque: int, defesa: int, mana: int = 0, vida_max: int | None = None) -> int:
+        """Reserva uma linha e devolve o índice."""
+        if self._livres:
+            linha = self._livres.pop()
+        else:
+            if self.tamanho == self.capacidade:
+                self._crescer()
+            linha = self.tamanho
+            self.tamanho += 1
+        valores = {"vida": vida, "vida_max": vida if vida_max is None else vida_max,
+                   "ataque": ataque, "defesa": defesa, "mana": mana}
+        for c in _COLUNAS:
+            self.colunas[c][linha] = int(valores.get(c, 0))
+        self.extras[linha] = {}
+        return linha
+
+    def vincular(self, entidade: Entidade) -> int:
+        """
+        Copia _atrib/efeitos da entidade para uma linha nova e troca-os por views.
+        A partir daí a entidade lê e escreve direto na store.
+        """
+        atrib = entidade._atrib
+        linha = self.adicionar(atrib.vida, atrib.ataque, atrib.defesa,
+                               getattr(atrib, "mana", 0), atrib.vida_max)
+        extras = self.extras[linha]
+        for chave, valor in dict(getattr(entidade, "efeitos", None) or {}).items():
+            if chave in _EH_CONTADOR:
+                self.colunas[chave][linha] = int(valor)
+            else:
+                extras[chave] = valor
+        entidade._atrib = LinhaAtributos(self, linha)
+        entidade.efeitos = EfeitosLinha(self, linha, extras)
+        self.entidades[linha] = entidade
+        return linha
+
+    def vincular_todos(self, entidades: Iterable[Entidade]) -> List[int]:
+        return [self.vincular(e) for e in entidades]
+
+    def remover(self, linha: int) -> None:
+        """Libera a linha (a entidade, se houver, deixa de ser válida)."""
+        for c in _COLUNAS:
+            self.colunas[c][linha] = 0
+        self.extras[linha] = None
+        self.entidades[linha] = None
+        self._livres.append(linha)
+
+    def linha_de(self, entidade: Entidade) -> int:
+        atrib = entidade._atrib
+        if not isinstance(atrib, LinhaAtributos) or atrib._store is not self:
+            raise ValueError(f"{entidade.nome} não está vinculada a esta EntityStore")
+        return atrib._linha
+
+    # ---------------- operações em lote ----------------
+    def _indices(self, linhas: Sequence[int] | None):
+        if linhas is None:
+            ocupadas = [i for i in range(self.tamanho) if self.extras[i] is not None]
+            return np.asarray(ocupadas, dtype=np.intp) if self.numpy else ocupadas
+        return np.asarray(linhas, dtype=np.intp) if self.numpy else list(linhas)
+
+    def receber_dano_lote(self, linhas: Sequence[int], danos: Sequence[int]):
+        """
+        Entidade.receber_dano para várias linhas de uma vez: aplica a defesa de
+        cada alvo e devolve o dano efetivo de cada golpe. Linhas repetidas acumulam.
+        """
+        idx = self._indices(linhas)
+        vida, defesa = self.colunas["vida"], self.colunas["defesa"]
+        if self.numpy:
+            brutos = np.maximum(0, np.asarray(danos, dtype=np.int64))
+            aplicado = np.maximum(0, brutos - np.maximum(0, defesa[idx]))
+            np.subtract.at(vida, idx, aplicado.astype(np.int32))
+            np.maximum(vida, 0, out=vida)
+            return aplicado
+        saida = []
+        for i, dano in zip(idx, danos):
+            aplicado = max(0, max(0, int(dano)) - max(0, defesa[i]))
+            vida[i] = max(0, vida[i] - aplicado)
+            saida.append(aplicado)
+        return saida
+
+    def decrementar(self, contadores: Iterable[str], linhas: Sequence[int] | None = None) -> None:
+        """Diminui em 1 os contadores ativos (> 0) — o 'fim de turno' de cada efeito."""
+        idx = self._indices(linhas)
+        for c in contadores:
+            col = self.colunas[c]
+            if self.numpy:
+                valores = col[idx]
+                col[idx] = valores - (valores > 0)
+            else:
+                for i in idx:
+                    if col[i] > 0:
+                        col[i] -= 1
+
+    def com_efeito(self, contador: str, linhas: Sequence[int] | None = None) -> List[int]:
+        """Linhas em que o contador está ativo."""
+        idx = self._indices(linhas)
+        col = self.colunas[contador]
+        if self.numpy:
+            return idx[col[idx] > 0].tolist()
+        return [i for i in idx if col[i] > 0]
+
+    def vivos(self, linhas: Sequence[int] | None = None) -> List[int]:
+        idx = self._indices(linhas)
+        vida = self.colunas["vida"]
+        if self.numpy:
+            return idx[vida[idx] > 0].tolist()
+        return [i for i in idx if vida[i] > 0]
+
+    def tick_efeitos(self, linhas: Sequence[int] | None = None) -> Dict[int, int]:
+        """Início de turno das entidades vinculadas (efeitos.tick_lote). Retorna linha -> dano."""
+        idx = [int(i) for i in self._indices(linhas) if self.entidades[int(i)] is not None]
+        danos = tick_lote([self.entidades[i] for i in idx])
+        return dict(zip(idx, danos))
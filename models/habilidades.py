@@ -0,0 +1,107 @@
+from __future__ import annotations
+from functools import lru_cache
+from typing import TYPE_CHECKING, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+if TYPE_CHECKING:
+    from .base import Entidade
+    from .personagem import Personagem
+
+"""
+Registro de habilidades especiais (fonte única de id, nome, custo e desbloqueio)
+- 7 especiais por classe: as 4 "originais" desde o nível 1, +1 nos níveis 2, 4 e 6
+- Cada habilidade declara o tipo de alvo e o método esp_* que a executa
+- visao_habilidades(classe, nivel) é pré-calculada e cacheada: HUD, menu e
+  autoplay não remontam tabelas a cada turno, e o despacho por id é O(1)
+"""
+
+# Tipos de alvo (decidem quais argumentos o handler recebe)
+ALVO_INIMIGO = "inimigo"     # esp_x(alvo)
+ALVO_PROPRIO = "proprio"     # esp_x()
+ALVO_ALIADO = "aliado"       # esp_x(aliado)
+ALVO_ALIADOS = "aliados"     # esp_x(aliados)
+
+
+class Habilidade(NamedTuple):
+    id: int
+    nome: str
+    custo: int
+    nivel_minimo: int
+    alvo: str
+    handler: str      # nome do método esp_* da classe
+
+
+HABILIDADES: Dict[str, Tuple[Habilidade, ...]] = {
+    "Guerreiro": (
+        # 4 originais
+        Habilidade(1, "Execução Pública", 7, 1, ALVO_INIMIGO, "esp_execucao_publica"),
+        Habilidade(2, "Perseverança", 0, 1, ALVO_PROPRIO, "esp_perseveranca"),
+        Habilidade(3, "Golpe Trovejante", 1, 1, ALVO_INIMIGO, "esp_golpe_trovejante"),
+        Habilidade(4, "Lâmina Ínfera", 2, 1, ALVO_INIMIGO, "esp_lamina_infera"),
+        # 3 adicionais
+        Habilidade(5, "Duro na Queda", 0, 2, ALVO_PROPRIO, "esp_duro_na_queda"),
+        Habilidade(6, "Determinação Mortal", 2, 4, ALVO_PROPRIO, "esp_determinacao_mortal"),
+        Habilidade(7, "Golpe Estilhaçador", 0, 6, ALVO_PROPRIO, "esp_golpe_estilhacador"),
+    ),
+    "Mago": (
+        Habilidade(1, "Colapso Minguante", 15, 1, ALVO_INIMIGO, "esp_colapso_minguante"),
+        Habilidade(2, "Descarnar", 20, 1, ALVO_INIMIGO, "esp_descarnar"),
+        Habilidade(3, "Distorção no Tempo", 0, 1, ALVO_PROPRIO, "esp_distorcao_no_tempo"),
+        Habilidade(4, "Empurrão Sísmico", 8, 1, ALVO_INIMIGO, "esp_empurrao_sismico"),
+        Habilidade(5, "Paradoxo", 3, 2, ALVO_INIMIGO, "esp_paradoxo"),
+        Habilidade(6, "Eletrocussão", 2, 4, ALVO_INIMIGO, "esp_eletrocussao"),
+        Habilidade(7, "Explosão Florescente", 8, 6, ALVO_INIMIGO, "esp_explosao_florescente"),
+    ),
+    "Arqueiro": (
+        Habilidade(1, "Curingas", 8, 1, ALVO_INIMIGO, "esp_curingas"),
+        Habilidade(2, "Cortes Certeiros", 6, 1, ALVO_INIMIGO, "esp_cortes_certeiros"),
+        Habilidade(3, "Estilo do Caçador", 10, 1, ALVO_PROPRIO, "esp_estilo_do_cacador"),
+        Habilidade(4, "Marca Fatal", 10, 1, ALVO_INIMIGO, "esp_marca_fatal"),
+        Habilidade(5, "Aljava da Ruína", 1, 2, ALVO_PROPRIO, "esp_aljava_da_ruina"),
+        Habilidade(6, "Contaminar", 3, 4, ALVO_INIMIGO, "esp_contaminar"),
+        Habilidade(7, "Ás na Manga", 7, 6, ALVO_PROPRIO, "esp_as_na_manga"),
+    ),
+    "Curandeiro": (
+        Habilidade(1, "Capítulo Final", 3, 1, ALVO_ALIADOS, "esp_capitulo_final"),
+        Habilidade(2, "Semente Engatilhada", 5, 1, ALVO_ALIADO, "esp_semente_engatilhada"),
+        Habilidade(3, "Ventos Revigorantes", 15, 1, ALVO_PROPRIO, "esp_ventos_revigorantes"),
+        Habilidade(4, "Golpe de Misericórdia", 0, 1, ALVO_INIMIGO, "esp_golpe_de_misericordia"),
+        Habilidade(5, "Hemofagia", 4, 2, ALVO_INIMIGO, "esp_hemofagia"),
+        Habilidade(6, "Transfusão Vital", 30, 4, ALVO_ALIADO, "esp_transfusao_vital"),
+        Habilidade(7, "Resplendor Cósmico", 15, 6, ALVO_ALIADOS, "esp_resplendor_cosmico"),
+    ),
+}
+
+
+class VisaoHabilidades(NamedTuple):
+    """Habilidades de uma classe num nível: menu (id, nome, custo) + despacho por id."""
+    menu: Tuple[Tuple[int, str, int], ...]
+    por_id: Dict[int, Tuple[Habilidade, Callable]]
+
+
+@lru_cache(maxsize=None)
+def visao_habilidades(classe: type, nivel: Optional[int] = None) -> VisaoHabilidades:
+    """Visão cacheada de 'classe' no 'nivel' (None = todas, ignorando desbloqueio)."""
+    habilidades = HABILIDADES.get(classe.__name__, ())
+    if nivel is not None:
+        habilidades = tuple(h for h in habilidades if h.nivel_minimo <= nivel)
+    return VisaoHabilidades(
+        menu=tuple((h.id, h.nome, h.custo) for h in habilidades),
+        por_id={h.id: (h, getattr(classe, h.handler)) for h in habilidades},
+    )
+
+
+def usar_habilidade(heroi: Personagem, n: int, alvo: Optional[Entidade] = None,
+                    aliado: Optional[Personagem] = None,
+                    aliados: Optional[List[Personagem]] = None) -> int:
+    """Executa a especial 'n' de 'heroi'; 0 se não existir ou faltar o alvo exigido."""
+    entrada = visao_habilidades(type(heroi)).por_id.get(n)
+    if entrada is None:
+        return 0
+    hab, funcao = entrada
+    if hab.alvo == ALVO_PROPRIO:
+        return funcao(heroi)
+    if hab.alvo == ALVO_INIMIGO:
+        return funcao(heroi, alvo) if alvo is not None else 0
+    if hab.alvo == ALVO_ALIADO:
+        return funcao(heroi, aliado) if aliado is not None else 0
+    return funcao(heroi, aliados) if aliados is not None else 0
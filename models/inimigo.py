@@ -1,25 +1,17 @@
 from __future__ import annotations
 from typing import Callable, Dict, List, Optional, Union
-from .base import Entidade, Atributos
+from .base import Entidade, Atributos, Efeitos
 import random
 
 
 class Inimigo(Entidade):
+    __slots__ = ("efeitos",)
+
     def __init__(self, nome: str, vida: int, ataque: int, defesa: int):
         super().__init__(nome, Atributos(vida=vida, ataque=ataque, defesa=defesa, mana=0, vida_max=vida))
-        # efeitos usados pela engine/skills (podem começar zerados)
-        self.efeitos = {
-            "eletro_turnos": 0,
-            "veneno_turnos": 0, "veneno_dano": 2,
-            "sangramento_turnos": 0, "sangramento_tipo": None, "sangramento_dano": 0,
-            "marca_fatal_turnos": 0,
-            "semente_turnos": 0,
-            "nao_pode_atacar": 0,
-            "refletir_dano_turnos": 0,
-            "invulneravel_turnos": 0,
-            "critico_proximo": False,
-            "bonus_proximo": 0,
-        }
+        # efeitos usados pela engine/skills — esparso: começa vazio e as leituras
+        # usam .get(chave, padrão) (mesmas chaves de Personagem.efeitos)
+        self.efeitos: Efeitos = Efeitos()
 
 # --------- Tabelas de configuração ----------
 
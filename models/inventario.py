@@ -1,12 +1,16 @@
 from __future__ import annotations
 from .base import Entidade
-import random
+from dado import GeradorDados, gerador_atual
+from utils.logger import exibir
+from utils.perfil import perfil
 
 # ============================================================
 #  CLASSE ITEM
 # ============================================================
 
 class Item:
+    __slots__ = ("nome", "tipo", "valor", "raridade", "dano", "defesa", "extra")
+
     def __init__(
         self,
         nome: str,
@@ -77,18 +81,33 @@ class Inventario:
     def __init__(self, capacidade_maxima: int = 20):
         self.itens = []
         self.capacidade_maxima = capacidade_maxima
+        self.sujo = False   # alterado desde o último checkpoint (saves incrementais)
+
+    @property
+    def itens(self) -> list:
+        return self._itens
+
+    @itens.setter
+    def itens(self, valor: list) -> None:
+        self._itens = valor
+        self.sujo = True
+
+    def limpar_sujos(self) -> None:
+        self.sujo = False
 
     def adicionar_item(self, item: Item):
         if len(self.itens) >= self.capacidade_maxima:
-            print("❌ Inventário cheio! Não foi possível adicionar o item.")
+            exibir("❌ Inventário cheio! Não foi possível adicionar o item.")
             return False
         self.itens.append(item)
-        print(f"📦 Item adicionado ao inventário: {item.nome} ({item.raridade})")
+        self.sujo = True
+        exibir(f"📦 Item adicionado ao inventário: {item.nome} ({item.raridade})")
         return True
 
     def remover_item(self, item):
         if item in self.itens:
             self.itens.remove(item)
+            self.sujo = True
             return True
         return False
 
@@ -110,8 +129,9 @@ class Drop_rate:
         "lendário": 0.1,
     }
 
-    def __init__(self, personagem):
+    def __init__(self, personagem, rng: GeradorDados | None = None):
         self.personagem = personagem
+        self.rng = rng  # None => usa o gerador do contexto atual (dado.usar_gerador)
 
     def calcular_drop_rate(self, raridade: str) -> float:
         base_rate = 0.50
@@ -122,24 +142,26 @@ class Drop_rate:
         return min(chance, 0.50)
 
     @staticmethod
-    def gerar_item_da_raridade(raridade: str) -> Item | None:
+    def gerar_item_da_raridade(raridade: str, rng: GeradorDados | None = None) -> Item | None:
         itens = [i for i in Item.items if i["raridade"] == raridade]
         if not itens:
             return None
-        escolhido = random.choice(itens)
+        escolhido = (rng or gerador_atual()).choice(itens)
         return Item(**escolhido)
 
+    @perfil.medir()
     def tentar_drop(self) -> Item | None:
+        rng = self.rng or gerador_atual()
         raridades = list(self.RARIDADE_MODIFICADOR.keys())
         pesos = [self.RARIDADE_MODIFICADOR[r] for r in raridades]
 
-        raridade_escolhida = random.choices(raridades, weights=pesos, k=1)[0]
+        raridade_escolhida = rng.choices(raridades, weights=pesos, k=1)[0]
         chance = self.calcular_drop_rate(raridade_escolhida)
 
-        print(f"🔍 Tentando drop {raridade_escolhida.upper()} — Chance: {chance*100:.1f}%")
+        exibir(f"🔍 Tentando drop {raridade_escolhida.upper()} — Chance: {chance*100:.1f}%")
 
-        if random.random() < chance:
-            return self.gerar_item_da_raridade(raridade_escolhida)
+        if rng.random() < chance:
+            return self.gerar_item_da_raridade(raridade_escolhida, rng)
 
         return None
 
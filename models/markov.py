@@ -0,0 +1,412 @@
+from __future__ import annotations
+import hashlib
+import json
+import math
+import os
+from functools import lru_cache
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from utils.autosave import gravar_atomico
+from .base import Entidade
+from .duelo_vetorizado import DEFENSIVAS, ESPECIAIS
+from .efeitos import MAXIMO, REGISTRO, SOMAR
+from .habilidades import visao_habilidades
+from .personagem import Personagem, custo_ataque_basico
+
+"""
+Chance exata de vencer um encontro (cadeia de Markov, sem amostragem)
+- Estado: vida/mana do herói, vida do inimigo, contadores de efeitos dos dois
+  lados, turnos (até o limiar da Execução Pública) e flags (flecha crítica, Empurrão)
+- Transição = um turno completo de MissaoHordas com a política decidir_acao_auto,
+  com as probabilidades exatas de cada d6/d20 (regras das especiais em
+  duelo_vetorizado.ESPECIAIS)
+- A cadeia só tem laços de um estado para ele mesmo (mana, vidas e contadores só
+  andam num sentido): resolve em ordem topológica, sem sistema linear genérico
+- Resultados memoizados em disco (cache/markov/<hash>.json), chave = atributos,
+  nível, classe e efeitos dos dois lados
+
+Exemplo:
+    sol = resolver_encontro(heroi, criar_inimigo("Orc", "Fácil"))
+    print(f"{sol.vitoria:.1%} em {sol.turnos_ate_vencer:.1f} turnos")
+"""
+
+VERSAO = 1              # mude ao alterar regras: invalida o cache em disco
+LIMITE_ESTADOS = 2_000_000
+
+_CONTADORES = tuple(REGISTRO)
+_K = {c: k for k, c in enumerate(_CONTADORES)}
+
+# Layout do estado (tupla)
+HV, HM, IV, TURNOS, FLECHA, EMPURRAO = range(6)
+_H = 6                          # contadores do herói: _H + k
+_I = _H + len(_CONTADORES)      # contadores do inimigo: _I + k
+
+# Estados absorventes
+VITORIA = "V"
+DERROTA = "D"
+_FIM = (VITORIA, DERROTA)
+
+Estado = Tuple[int, ...]
+Ramos = Dict[object, float]
+
+
+class SolucaoEncontro(NamedTuple):
+    vitoria: float                # P(inimigo cai com o herói vivo)
+    derrota: float                # P(herói cai)
+    turnos_medios: float          # E[turnos até o fim do encontro]
+    turnos_ate_vencer: float      # E[turnos | vitória]
+    estados: int                  # estados transitórios da cadeia
+
+    def to_dict(self) -> dict:
+        return self._asdict()
+
+    @classmethod
+    def from_dict(cls, d: dict) -> SolucaoEncontro:
+        return cls(**{k: d[k] for k in cls._fields})
+
+
+# ---------------- distribuições ----------------
+
+@lru_cache(maxsize=None)
+def _soma(quantidade: int, faces: int) -> Tuple[Tuple[int, float], ...]:
+    """Distribuição exata da soma de 'quantidade' d'faces'."""
+    dist = {0: 1.0}
+    for _ in range(quantidade):
+        novo: Dict[int, float] = {}
+        for s, p in dist.items():
+            for f in range(1, faces + 1):
+                novo[s + f] = novo.get(s + f, 0.0) + p / faces
+        dist = novo
+    return tuple(sorted(dist.items()))
+
+
+def _mapear(dist: Iterable[Tuple[int, float]], f: Callable[[int], int]) -> Tuple[Tuple[int, float], ...]:
+    saida: Dict[int, float] = {}
+    for v, p in dist:
+        saida[f(v)] = saida.get(f(v), 0.0) + p
+    return tuple(saida.items())
+
+
+_D6 = _soma(1, 6)
+_D20 = _soma(1, 20)
+
+# Dano por turno de cada DoT (as especiais sempre aplicam sangramento d6 e veneno 2)
+_DANO_DOT = {
+    "eletro_turnos": _mapear(_D6, lambda v: max(0, v - 1)),
+    "veneno_turnos": ((2, 1.0),),
+    "sangramento_turnos": _D6,
+    "marca_fatal_turnos": _D6,
+}
+_CURA_SEMENTE = _mapear(_D20, lambda v: max(0, v - 5))
+
+
+def _passo(ramos: Ramos, f: Callable[[Estado], Iterable[Tuple[object, float]]]) -> Ramos:
+    """Aplica um passo aleatório a cada ramo, somando ramos que caem no mesmo estado."""
+    novo: Ramos = {}
+    for st, p in ramos.items():
+        if st in _FIM:
+            novo[st] = novo.get(st, 0.0) + p
+            continue
+        for n, q in f(st):
+            novo[n] = novo.get(n, 0.0) + p * q
+    return novo
+
+
+def _com(st: Estado, **mudancas: int) -> Estado:
+    lista = list(st)
+    for campo, valor in mudancas.items():
+        lista[_CAMPOS[campo]] = valor
+    return tuple(lista)
+
+
+def _trocar(st: Estado, indice: int, valor: int) -> Estado:
+    lista = list(st)
+    lista[indice] = valor
+    return tuple(lista)
+
+
+_CAMPOS = {"hv": HV, "hm": HM, "iv": IV, "turnos": TURNOS, "flecha": FLECHA, "empurrao": EMPURRAO}
+
+
+# ---------------- regras de um turno ----------------
+
+class _Encontro:
+    """Parâmetros fixos do duelo + a função de transição de um turno."""
+
+    def __init__(self, heroi: Personagem, inimigo: Entidade):
+        h, i = heroi._atrib, inimigo._atrib
+        self.classe = type(heroi).__name__
+        self.h_vida_max = h.vida_max or h.vida
+        self.h_ataque, self.h_defesa = int(h.ataque), max(0, int(h.defesa))
+        self.i_ataque, self.i_defesa = int(i.ataque), max(0, int(i.defesa))
+        self.custo_basico = custo_ataque_basico(heroi)
+        self.especiais = tuple(
+            (hab, ESPECIAIS[hab.handler]) for hab, _ in visao_habilidades(type(heroi), heroi.nivel).por_id.values()
+        )
+        # turnos só importam até o limiar da Execução Pública
+        self.teto_turnos = max((e.apos_turnos for _, e in self.especiais), default=0)
+
+        ef_h = heroi.efeitos
+        ef_i = getattr(inimigo, "efeitos", None) or {}
+        self.inicial: Estado = (
+            int(h.vida), int(getattr(h, "mana", 0)), int(i.vida),
+            min(int(ef_h.get("turnos", 0)), self.teto_turnos),
+            int(bool(ef_h.get("prox_flecha_d20_critico"))), int(bool(ef_h.get("empurrao_sismico_usado"))),
+            *(int(ef_h.get(c, 0) or 0) for c in _CONTADORES),
+            *(int(ef_i.get(c, 0) or 0) for c in _CONTADORES),
+        )
+
+    def chave(self) -> str:
+        """Hash dos parâmetros que definem a cadeia (chave do cache em disco)."""
+        bruto = json.dumps({
+            "versao": VERSAO, "classe": self.classe, "especiais": [h.id for h, _ in self.especiais],
+            "heroi": [self.h_vida_max, self.h_ataque, self.h_defesa],
+            "inimigo": [self.i_ataque, self.i_defesa], "inicial": self.inicial,
+        }, sort_keys=True)
+        return hashlib.sha256(bruto.encode("utf-8")).hexdigest()[:32]
+
+    # -------- efeitos --------
+    def _aplicar(self, st: Estado, base: int, chave: str, turnos: int) -> Estado:
+        i = base + _K[chave]
+        acumulo = REGISTRO[chave].acumulo
+        if acumulo == SOMAR:
+            turnos = st[i] + turnos
+        elif acumulo == MAXIMO:
+            turnos = max(st[i], turnos)
+        return _trocar(st, i, turnos)
+
+    def _tick(self, st: Estado, base: int, vida: int, defesa: int, cura: bool) -> Ramos:
+        """tick_efeitos_inicio_turno de um lado (herói: base _H, inimigo: base _I)."""
+        invulneravel = st[base + _K["invulneravel_turnos"]] > 0
+        ramos: Ramos = {st: 1.0}
+        for k, chave in enumerate(_CONTADORES):
+            if st[base + k] <= 0:
+                continue
+            i = base + k
+
+            def efeito(s: Estado, chave=chave, i=i):
+                s = _trocar(s, i, s[i] - 1)
+                if chave == "semente_turnos":
+                    if s[i] == 0 and cura:
+                        return [(_trocar(s, vida, min(self.h_vida_max, s[vida] + c)), p) for c, p in _CURA_SEMENTE]
+                    return [(s, 1.0)]
+                dano = _DANO_DOT.get(chave)
+                if dano is None or invulneravel:
+                    return [(s, 1.0)]
+                return [(_trocar(s, vida, max(0, s[vida] - max(0, d - defesa))), p) for d, p in dano]
+
+            ramos = _passo(ramos, efeito)
+        return ramos
+
+    # -------- ação do herói --------
+    def _escolher(self, st: Estado) -> int:
+        """decidir_acao_auto: índice em self.especiais ou -1 (básico)."""
+        mana = st[HM]
+        if self.classe == "Curandeiro" and st[HV] * 100 < 35 * self.h_vida_max:
+            for n, (hab, _) in enumerate(self.especiais):
+                if hab.nome in DEFENSIVAS and mana >= hab.custo:
+                    return n
+        for n, (hab, _) in enumerate(self.especiais):
+            if hab.custo > 0 and mana >= hab.custo:
+                return n
+        return -1
+
+    def _dano_no_inimigo(self, st: Estado, dist) -> List[Tuple[Estado, float]]:
+        return [(_trocar(st, IV, max(0, st[IV] - max(0, d - self.i_defesa))), p) for d, p in dist]
+
+    def _acao(self, st: Estado) -> Ramos:
+        if st[_H + _K["nao_pode_atacar"]] > 0:
+            return {st: 1.0}
+        escolha = self._escolher(st)
+        if escolha < 0:
+            if st[HM] < self.custo_basico:                 # bloqueio por mana (Mago)
+                return {st: 1.0}
+            st = _com(st, hm=st[HM] - self.custo_basico)
+            if self.classe == "Arqueiro" and st[FLECHA]:
+                dist = _mapear(_D20, lambda v: v * 2 + self.h_ataque)
+                st = _com(st, flecha=0)
+            elif self.classe == "Curandeiro":
+                dist = _mapear(_D6, lambda v: max(0, v - 2 + self.h_ataque))
+            else:
+                dist = _mapear(_D6, lambda v: v + self.h_ataque)
+            return dict(_passo({st: 1.0}, lambda s: self._dano_no_inimigo(s, dist)))
+
+        hab, esp = self.especiais[escolha]
+        if st[TURNOS] < esp.apos_turnos or (esp.uma_vez and st[EMPURRAO]):
+            return {st: 1.0}                               # falha sem gastar mana
+        st = _com(st, hm=st[HM] - hab.custo + esp.mana)
+        if esp.uma_vez:
+            st = _com(st, empurrao=1)
+        for chave, turnos in esp.no_alvo:
+            st = self._aplicar(st, _I, chave, turnos)
+        for chave, turnos in esp.em_si:
+            st = self._aplicar(st, _H, chave, turnos)
+        if esp.flecha_critica:
+            st = _com(st, flecha=1)
+        ramos: Ramos = {st: 1.0}
+        if esp.cura[0]:
+            cura = _soma(*esp.cura)
+            ramos = _passo(ramos, lambda s: [(_com(s, hv=min(self.h_vida_max, s[HV] + c)), p) for c, p in cura])
+        if esp.dados[0]:
+            dist = _mapear(_soma(*esp.dados), lambda v: v * esp.multiplicador + esp.bonus
+                           + (self.h_ataque if esp.soma_ataque else 0))
+            ramos = _passo(ramos, lambda s: self._dano_no_inimigo(s, dist))
+        if esp.sacrificio:
+            ramos = _passo(ramos, lambda s: [(_com(s, hv=0), 1.0)])
+        return ramos
+
+    # -------- ataque do inimigo --------
+    def _ataque_inimigo(self, st: Estado) -> List[Tuple[object, float]]:
+        if st[_I + _K["nao_pode_atacar"]] > 0:
+            return [(_fim(st), 1.0)]
+        invulneravel = st[_H + _K["invulneravel_turnos"]] > 0
+        refletir = st[_H + _K["refletir_dano_turnos"]] > 0
+        saida = []
+        for d, p in _D6:
+            dano = 0 if invulneravel else max(0, d + self.i_ataque)
+            aplicado = max(0, dano - self.h_defesa)
+            s = _com(st, hv=max(0, st[HV] - aplicado))
+            if aplicado > 0 and refletir:
+                s = _com(s, iv=max(0, s[IV] - max(0, aplicado - self.i_defesa)))
+            saida.append((_fim(s), p))
+        return saida
+
+    # -------- turno completo (mesma ordem de EstadoEncontro) --------
+    def turno(self, st: Estado) -> Ramos:
+        if self.teto_turnos:
+            st = _com(st, turnos=min(st[TURNOS] + 1, self.teto_turnos))
+        ramos = self._tick(st, _H, HV, self.h_defesa, cura=True)
+        ramos = _passo(ramos, lambda s: self._acao(s).items())
+        ramos = _passo(ramos, lambda s: [(_fim_apos_acao(s), 1.0)])
+        ramos = _passo(ramos, lambda s: [(_fim_apos_acao(n), p)
+                                         for n, p in self._tick(s, _I, IV, self.i_defesa, cura=False).items()])
+        return _passo(ramos, self._ataque_inimigo)
+
+
+def _fim_apos_acao(st: Estado):
+    """Inimigo caído encerra o encontro (vitória só com o herói de pé)."""
+    if st[IV] <= 0:
+        return VITORIA if st[HV] > 0 else DERROTA
+    return st
+
+
+def _fim(st: Estado):
+    if st[HV] <= 0:
+        return DERROTA
+    if st[IV] <= 0:
+        return VITORIA
+    return st
+
+
+# ---------------- solução ----------------
+
+def _montar_cadeia(encontro: _Encontro, limite: int) -> Tuple[List[Estado], List[List[Tuple[object, float]]]]:
+    """Estados alcançáveis a partir do inicial e as transições de cada um."""
+    indice: Dict[Estado, int] = {encontro.inicial: 0}
+    estados: List[Estado] = [encontro.inicial]
+    transicoes: List[List[Tuple[object, float]]] = []
+    for st in estados:                      # a lista cresce durante o laço (BFS)
+        saida = []
+        for n, p in encontro.turno(st).items():
+            if n not in _FIM and n not in indice:
+                if len(estados) >= limite:
+                    raise ValueError(f"Cadeia passou de {limite} estados; use duelo_vetorizado.")
+                indice[n] = len(estados)
+                estados.append(n)
+            saida.append((n if n in _FIM else indice[n], p))
+        transicoes.append(saida)
+    return estados, transicoes
+
+
+def _pos_ordem(transicoes: List[List[Tuple[object, float]]]) -> List[int]:
+    """Pós-ordem da DFS: sucessores antes dos predecessores (ignora laços s -> s)."""
+    visto = [False] * len(transicoes)
+    ordem: List[int] = []
+    for raiz in range(len(transicoes)):
+        if visto[raiz]:
+            continue
+        visto[raiz] = True
+        pilha = [(raiz, iter(transicoes[raiz]))]
+        while pilha:
+            s, filhos = pilha[-1]
+            for n, _ in filhos:
+                if n not in _FIM and not visto[n]:
+                    visto[n] = True
+                    pilha.append((n, iter(transicoes[n])))
+                    break
+            else:
+                pilha.pop()
+                ordem.append(s)
+    return ordem
+
+
+def _resolver(transicoes: List[List[Tuple[object, float]]]) -> SolucaoEncontro:
+    n = len(transicoes)
+    vitoria = [0.0] * n      # P(vitória)
+    derrota = [0.0] * n      # P(derrota)
+    turnos = [0.0] * n       # E[turnos]
+    t_vit = [0.0] * n        # E[turnos * 1{vitória}]
+    ordem = _pos_ordem(transicoes)
+    # Em ordem topológica uma varredura basta; a segunda confirma (e cobre ciclos raros)
+    for _ in range(10_000):
+        delta = 0.0
+        for s in ordem:
+            fica = v = d = t = tv = 0.0
+            for alvo, p in transicoes[s]:
+                if alvo == s:
+                    fica += p
+                elif alvo == VITORIA:
+                    v += p
+                    tv += p
+                elif alvo == DERROTA:
+                    d += p
+                else:
+                    v += p * vitoria[alvo]
+                    d += p * derrota[alvo]
+                    t += p * turnos[alvo]
+                    tv += p * (t_vit[alvo] + vitoria[alvo])
+            sai = 1.0 - fica
+            if sai <= 1e-15:                 # impasse: ninguém causa dano, para sempre
+                v, d, t, tv, sai = 0.0, 0.0, math.inf, 0.0, 1.0
+            else:
+                t += 1.0
+                tv += fica * v / sai         # turnos parados antes de sair
+            novo_v = v / sai
+            delta = max(delta, abs(novo_v - vitoria[s]))
+            vitoria[s], derrota[s] = novo_v, d / sai
+            turnos[s], t_vit[s] = t / sai, tv / sai
+        if delta < 1e-13:
+            break
+    return SolucaoEncontro(
+        vitoria=vitoria[0], derrota=derrota[0], turnos_medios=turnos[0],
+        turnos_ate_vencer=t_vit[0] / vitoria[0] if vitoria[0] > 0 else math.nan,
+        estados=n,
+    )
+
+
+def _pasta_padrao() -> str:
+    return os.path.join(os.getcwd(), "cache", "markov")
+
+
+def resolver_encontro(heroi: Personagem, inimigo: Entidade, pasta: Optional[str] = None,
+                      limite_estados: int = LIMITE_ESTADOS) -> SolucaoEncontro:
+    """
+    Chance exata de 'heroi' vencer 'inimigo' num encontro (política decidir_acao_auto).
+    Memoizado em disco por atributos/efeitos; pasta="" desliga o cache.
+    """
+    encontro = _Encontro(heroi, inimigo)
+    pasta = _pasta_padrao() if pasta is None else pasta
+    caminho = os.path.join(pasta, f"{encontro.chave()}.json") if pasta else None
+    if caminho and os.path.exists(caminho):
+        try:
+            with open(caminho, "r", encoding="utf-8") as f:
+                return SolucaoEncontro.from_dict(json.load(f))
+        except (OSError, ValueError, KeyError, TypeError):
+            pass                              # cache corrompido: recalcula
+
+    _, transicoes = _montar_cadeia(encontro, limite_estados)
+    solucao = _resolver(transicoes)
+    if caminho:
+        os.makedirs(pasta, exist_ok=True)
+        gravar_atomico(caminho, json.dumps(solucao.to_dict()).encode("utf-8"))
+    return solucao
@@ -1,7 +1,8 @@
 # models/missao.py
 from __future__ import annotations
-from dataclasses import dataclass
-from typing import List, Tuple, Dict, Optional
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Callable, Iterator, List, Tuple, Dict, Optional, Sequence
 from .inventario import Item, Inventario,Loot,Drop_rate
 from .personagem import (
     Personagem,
@@ -10,8 +11,10 @@ from .personagem import (
     tick_efeitos_inicio_turno,    # aplica efeitos (fonte única)
 )
 from .inimigo import Inimigo, generate_horde
-from dado import d6, d20
+from dado import d6, d20, GeradorDados, gerador_atual, usar_gerador, observar_rolagens
 from utils.logger import logger
+from utils.eventos import Evento, RegistroEventos, TipoEvento
+from utils.perfil import perfil
 
 
 @dataclass
@@ -21,14 +24,317 @@ class ResultadoMissao:
     detalhes: str = ""
 
 
+@dataclass
+class RelatorioMissao(ResultadoMissao):
+    """Resultado do modo headless: números da missão inteira, montados a partir dos eventos."""
+    heroi: str = ""
+    nivel_final: int = 0
+    turnos_por_encontro: List[int] = field(default_factory=list)
+    dano_causado: int = 0
+    dano_recebido: int = 0
+    mana_gasta: int = 0
+    xp: int = 0
+    drops: List[str] = field(default_factory=list)
+
+    def registrar(self, tipo: TipoEvento, ator: str, alvo: str, valor: int, detalhe: str) -> None:
+        if tipo == TipoEvento.INICIO_ENCONTRO:
+            self.turnos_por_encontro.append(0)
+        elif tipo == TipoEvento.INICIO_TURNO:
+            self.turnos_por_encontro[-1] += 1
+        elif tipo in (TipoEvento.DANO, TipoEvento.TICK_EFEITO):
+            if alvo == self.heroi:
+                self.dano_recebido += valor
+            else:
+                self.dano_causado += valor
+        elif tipo == TipoEvento.XP:
+            self.xp += valor
+        elif tipo == TipoEvento.DROP:
+            self.drops.append(detalhe)
+
+
+# Fases de um encontro
+AGUARDANDO_ACAO = "aguardando_acao"   # o herói precisa decidir (step(acao))
+VITORIA = "vitoria"                   # inimigo derrotado pelo herói/efeitos (dá recompensa)
+FUGA = "fuga"                         # herói fugiu da missão
+FIM = "fim"                           # laço encerrado sem vitória (herói caiu, reflexão...)
+
+
+class EstadoEncontro:
+    """
+    Um encontro herói x inimigo como máquina de estados, sem input().
+    - iniciar() e step(acao) avançam o combate até o herói precisar decidir de
+      novo (fase AGUARDANDO_ACAO) ou o encontro acabar (VITORIA, FUGA ou FIM)
+    - Cada chamada devolve os eventos (Evento) gerados nela
+    - Terminal, autoplay, sessões de rede e simuladores dirigem a mesma máquina
+    Recompensas e a passagem para o próximo encontro ficam com MissaoHordas.step.
+    """
+
+    def __init__(self, missao: MissaoHordas, inimigo: Inimigo, indice: int, total: int):
+        self.missao = missao
+        self.heroi = missao.heroi
+        self.inimigo = inimigo
+        self.indice = indice
+        self.total = total
+        self.turno = 1
+        self.fase: Optional[str] = None
+
+    @property
+    def aguardando_acao(self) -> bool:
+        return self.fase == AGUARDANDO_ACAO
+
+    @property
+    def terminado(self) -> bool:
+        return self.fase in (VITORIA, FUGA, FIM)
+
+    def iniciar(self) -> List[Evento]:
+        """Abre o encontro e roda até a primeira decisão do herói."""
+        m, inimigo = self.missao, self.inimigo
+        with m._contexto(), m._coletar() as saida:
+            is_boss = getattr(inimigo, "efeitos", {}).get("is_boss", False)
+            titulo = f"{inimigo.nome} (CHEFE)" if is_boss else inimigo.nome
+            if m.verboso:
+                print(f"\n=== Encontro {self.indice}/{self.total} — {inimigo.nome} ===")
+            logger.info("⚔️ Iniciando encontro %s/%s: %s", self.indice, self.total, titulo)
+
+            if is_boss:
+                logger.warning("👑 CHEFE ENCONTRADO: %s!", inimigo.nome)
+
+            m._posicionar(self.indice, 0)
+            m._evento(TipoEvento.INICIO_ENCONTRO, self.heroi.nome, inimigo.nome, inimigo._atrib.vida, titulo)
+            self._avancar()
+        return saida
+
+    def step(self, acao: str) -> List[Evento]:
+        """Executa a ação do herói ("1" básico, "2".."8" especiais, "0" fugir) e avança."""
+        if self.fase != AGUARDANDO_ACAO:
+            raise RuntimeError(f"Encontro não aguarda ação (fase: {self.fase}).")
+        m = self.missao
+        with m._contexto(), m._coletar() as saida:
+            with perfil.fase("acao"):
+                self._acao_heroi(acao)
+            if self.fase != FUGA and not self._fim_do_turno():
+                self._avancar()
+        return saida
+
+    # ----------------- etapas do turno -----------------
+    def _avancar(self) -> None:
+        """Começo de turno; se o herói não pode agir, o turno segue direto para o inimigo."""
+        m, heroi, inimigo = self.missao, self.heroi, self.inimigo
+        while heroi.esta_vivo() and inimigo.esta_vivo():
+            if m.verboso:
+                print(f"\n--- Turno {self.turno} ---")
+            logger.debug("🔄 Turno %s iniciado", self.turno)
+            m._posicionar(self.indice, self.turno)
+            m._evento(TipoEvento.INICIO_TURNO, heroi.nome, inimigo.nome)
+
+            # Controle de turno do herói (p/ Execução Pública, etc.)
+            heroi.efeitos["turnos"] = heroi.efeitos.get("turnos", 0) + 1
+
+            # Efeitos no HERÓI (usa a lógica central do personagem)
+            with perfil.fase("efeitos_heroi"):
+                dano_tick = heroi.inicio_turno()
+                if dano_tick:
+                    if m.verboso:
+                        print(f"(Efeitos) {heroi.nome} sofre {dano_tick} | {heroi.barra_hp()}")
+                    logger.info("💥 Efeitos em %s: %s de dano", heroi.nome, dano_tick)
+                    m._evento(TipoEvento.TICK_EFEITO, "", heroi.nome, dano_tick)
+
+            if heroi.efeitos.get("nao_pode_atacar", 0) > 0:
+                if m.verboso:
+                    print(f"{heroi.nome} está impossibilitado de agir neste turno!")
+                if self._fim_do_turno():
+                    return
+                continue
+
+            if m.verboso:
+                with perfil.fase("hud"):
+                    m._mostrar_hud(inimigo)
+            self.fase = AGUARDANDO_ACAO
+            return
+        self.fase = FIM
+
+    def _acao_heroi(self, acao: str) -> None:
+        m, heroi, inimigo = self.missao, self.heroi, self.inimigo
+        m._evento(TipoEvento.ACAO, heroi.nome, inimigo.nome, detalhe=acao)
+        dano_causado = 0
+        bloqueado = False
+
+        mana_atual = getattr(heroi._atrib, "mana", 0)
+        custo_basico = custo_ataque_basico(heroi)
+
+        # Bloqueio por mana (básico e especiais)
+        if acao == "1":
+            if mana_atual < custo_basico:
+                if m.verboso:
+                    print(f"Mana insuficiente para Ataque Básico ({mana_atual}/{custo_basico}).")
+                bloqueado = True
+        elif acao.isdigit() and int(acao) >= 2:
+            esp_idx = int(acao) - 2
+            especs = m._lista_especiais()
+            if 0 <= esp_idx < len(especs):
+                _id, nome, custo = especs[esp_idx]
+                if mana_atual < custo:
+                    if m.verboso:
+                        print(f"Mana insuficiente para {nome} ({mana_atual}/{custo}).")
+                    bloqueado = True
+            else:
+                if m.verboso:
+                    print("Especial inválida.")
+                bloqueado = True
+
+        # Execução
+        if acao == "1" and not bloqueado:
+            dano_causado = heroi.ataque_basico(inimigo)
+
+        elif acao.isdigit() and int(acao) >= 2 and not bloqueado:
+            esp_idx = int(acao) - 2
+            especs = m._lista_especiais()
+            _id, nome, _c = especs[esp_idx]
+
+            # Cada especial usa o alvo que declara no registro (aliados: missão solo)
+            dano_causado = heroi.usar_especial(_id, alvo=inimigo, aliado=None, aliados=[])
+
+        elif acao == "0":
+            if m.verboso:
+                print("Você recuou da missão!")
+            logger.warning("🏃 %s fugiu da missão!", heroi.nome)
+            self.fase = FUGA
+            return
+        else:
+            if not bloqueado:
+                if m.verboso:
+                    print("Ação inválida.")
+
+        if m._relatorio is not None:
+            m._relatorio.mana_gasta += max(0, mana_atual - getattr(heroi._atrib, "mana", 0))
+
+        if dano_causado:
+            if m.verboso:
+                print(f"Você causou {dano_causado}. HP do {inimigo.nome}: {inimigo.barra_hp()}")
+            m._evento(TipoEvento.DANO, heroi.nome, inimigo.nome, dano_causado)
+
+    def _vitoria(self, mensagem: str, log: str) -> bool:
+        m = self.missao
+        if m.verboso:
+            print(mensagem)
+        logger.info(log, self.inimigo.nome)
+        m._evento(TipoEvento.FIM_ENCONTRO, self.heroi.nome, self.inimigo.nome, 1)
+        self.fase = VITORIA
+        return True
+
+    def _fim_do_turno(self) -> bool:
+        """Depois da ação: efeitos e ataque do inimigo. True se o encontro acabou."""
+        m, heroi, inimigo = self.missao, self.heroi, self.inimigo
+        if not inimigo.esta_vivo():
+            return self._vitoria(f"{inimigo.nome} foi derrotado!", "💀 %s foi derrotado!")
+
+        # Efeitos no INIMIGO (usa helper central)
+        with perfil.fase("efeitos_inimigo"):
+            dano_tick_i = tick_efeitos_inicio_turno(inimigo)
+            if dano_tick_i:
+                if m.verboso:
+                    print(f"(Efeitos) {inimigo.nome} sofre {dano_tick_i} | {inimigo.barra_hp()}")
+                logger.info("💥 Efeitos em %s: %s de dano", inimigo.nome, dano_tick_i)
+                m._evento(TipoEvento.TICK_EFEITO, "", inimigo.nome, dano_tick_i)
+        if not inimigo.esta_vivo():
+            return self._vitoria(f"{inimigo.nome} caiu pelos efeitos!", "💀 %s caiu pelos efeitos!")
+
+        with perfil.fase("ataque_inimigo"):
+            if inimigo.efeitos.get("nao_pode_atacar", 0) > 0:
+                if m.verboso:
+                    print(f"{inimigo.nome} está atordoado e não ataca.")
+                logger.info("😵 %s está atordoado e não ataca.", inimigo.nome)
+            else:
+                # Dano do inimigo (Entidade.receber_dano já considera defesa do herói)
+                dano_in = max(0, d6(f"{inimigo.nome} - Ataque") + inimigo._atrib.ataque)
+                logger.debug("🎲 %s rola ataque: %s + %s = %s", inimigo.nome, dano_in - inimigo._atrib.ataque, inimigo._atrib.ataque, dano_in)
+
+                # Invulnerável anula dano direto
+                if heroi.efeitos.get("invulneravel_turnos", 0) > 0:
+                    if m.verboso:
+                        print(f"{heroi.nome} está invulnerável e não sofre dano.")
+                    logger.info("🛡️ %s está invulnerável e não sofre dano.", heroi.nome)
+                    dano_in = 0
+
+                aplicado = heroi.receber_dano(dano_in)
+                if m.verboso:
+                    print(f"{inimigo.nome} causa {aplicado}. Seu HP: {heroi.barra_hp()} "
+                          f"(Mana: {getattr(heroi._atrib, 'mana', 0)})")
+
+                if aplicado > 0:
+                    logger.info("⚔️ %s causa %s de dano em %s", inimigo.nome, aplicado, heroi.nome)
+                    m._evento(TipoEvento.DANO, inimigo.nome, heroi.nome, aplicado)
+
+                # Reflexão de dano
+                if aplicado > 0 and heroi.efeitos.get("refletir_dano_turnos", 0) > 0:
+                    refle = inimigo.receber_dano(aplicado)
+                    if m.verboso:
+                        print(f"Ventos Revigorantes refletem {refle} ao {inimigo.nome}! HP: {inimigo.barra_hp()}")
+                    logger.info("💨 Ventos Revigorantes refletem %s de dano para %s", refle, inimigo.nome)
+                    m._evento(TipoEvento.DANO, heroi.nome, inimigo.nome, refle, "reflexão")
+
+        self.turno += 1
+        return False
+
+
 class MissaoHordas:
-    def __init__(self, heroi: Personagem, cenario: str, dificuldade: str):
+    def __init__(self, heroi: Personagem, cenario: str, dificuldade: str, rng: GeradorDados | None = None,
+                 eventos: RegistroEventos | None = None, ao_checkpoint: Callable[[int], None] | None = None):
         self.heroi = heroi
         self.cenario = cenario
         self.dificuldade = dificuldade
+        # Fluxo de dados próprio da missão (semente em self.rng.semente p/ replay)
+        self.rng = rng or gerador_atual()
+        # Log estruturado de eventos (opcional): turnos, ações, rolagens, dano, drops, XP
+        self.eventos = eventos
+        # Chamado após cada encontro vencido (nº de encontros vencidos), ex.: autosave
+        self.ao_checkpoint = ao_checkpoint
+        # Modo headless (executar_headless): sem print/HUD/input e com relatório
+        self.verboso = True
+        self.politica: Callable[[MissaoHordas, Inimigo], str] | None = None
+        self._relatorio: RelatorioMissao | None = None
+        # Máquina de estados (iniciar/step): horda, encontro atual e resultado final
+        self.encontro: EstadoEncontro | None = None
+        self.resultado: ResultadoMissao | None = None
+        self.encontros_vencidos = 0
+        self._horda: List[Inimigo] = []
+        self._posicao = (0, 0)                       # (encontro, turno) dos eventos
+        self._coletores: List[List[Evento]] = []     # quem recebe os eventos do step atual
+
+    def _evento(self, tipo: TipoEvento, ator: str = "", alvo: str = "", valor: int = 0, detalhe: str = "") -> None:
+        if self._relatorio is not None:
+            self._relatorio.registrar(tipo, ator, alvo, valor, detalhe)
+        if self.eventos is not None:
+            self.eventos.registrar(tipo, ator, alvo, valor, detalhe)
+        if self._coletores:
+            ev = Evento(int(tipo), *self._posicao, ator, alvo, int(valor), detalhe)
+            for saida in self._coletores:
+                saida.append(ev)
+
+    def _posicionar(self, encontro: int, turno: int) -> None:
+        self._posicao = (encontro, turno)
+        if self.eventos is not None:
+            self.eventos.posicionar(encontro, turno)
+
+    @contextmanager
+    def _contexto(self) -> Iterator[None]:
+        # Todas as rolagens (herói, inimigos, drops) saem do gerador da missão
+        observador = self.eventos.ao_rolar if self.eventos is not None else None
+        with usar_gerador(self.rng), observar_rolagens(observador):
+            yield
+
+    @contextmanager
+    def _coletar(self) -> Iterator[List[Evento]]:
+        """Junta os eventos emitidos no bloco (aninhável: cada nível recebe os seus)."""
+        saida: List[Evento] = []
+        self._coletores.append(saida)
+        try:
+            yield saida
+        finally:
+            self._coletores.pop()
 
     # Agora a fonte da verdade de especiais vem de models.personagem
-    def _lista_especiais(self) -> List[Tuple[int, str, int]]:
+    def _lista_especiais(self) -> Sequence[Tuple[int, str, int]]:
         """
         Retorna a lista de especiais (id, nome, custo) conforme o nível do herói.
         - No nível baixo, apenas as 4 "originais" ficam disponíveis (liberadas por nível).
@@ -87,246 +393,170 @@ class MissaoHordas:
 
         return "1"
 
-    # ----------------- Execução (com auto) -----------------
+    # ----------------- Máquina de estados (iniciar/step) -----------------
+    @property
+    def aguardando_acao(self) -> bool:
+        return self.resultado is None and self.encontro is not None and self.encontro.aguardando_acao
+
+    def iniciar(self) -> List[Evento]:
+        """Começa a missão (gera a horda) e avança até a primeira decisão do herói."""
+        with self._contexto(), self._coletar() as saida:
+            self.encontros_vencidos = 0
+            self.resultado = None
+            self.encontro = None
+            logger.info("🚀 Iniciando missão...")
+            logger.debug("🎲 Semente da missão: %s", self.rng.semente)
+            logger.info("📍 Cenário: %s | 🎯 Dificuldade: %s", self.cenario, self.dificuldade)
+            logger.info("🧙 Herói: %s (Nível %s)", self.heroi.nome, self.heroi.nivel)
+            self._evento(TipoEvento.INICIO_MISSAO, self.heroi.nome, valor=self.heroi.nivel,
+                         detalhe=f"{self.heroi.__class__.__name__}|{self.cenario}|{self.dificuldade}|{self.rng.semente}")
+
+            try:
+                self._horda = generate_horde(self.cenario, self.dificuldade, getattr(self, "missao", None))
+            except TypeError:
+                # Versão que aceita apenas (cenario, dificuldade)
+                self._horda = generate_horde(self.cenario, self.dificuldade)
+            self._avancar()
+        return saida
+
+    def step(self, acao: str) -> List[Evento]:
+        """Ação do herói no encontro atual; avança até a próxima decisão ou o fim da missão."""
+        if not self.aguardando_acao:
+            raise RuntimeError("A missão não está aguardando uma ação.")
+        with self._contexto(), self._coletar() as saida:
+            self.encontro.step(acao)
+            self._avancar()
+        return saida
+
+    def _avancar(self) -> None:
+        """Fecha o encontro atual (recompensa, derrota, fuga) e abre os próximos até precisar de ação."""
+        while self.resultado is None:
+            encontro = self.encontro
+            if encontro is not None:
+                if encontro.aguardando_acao:
+                    return
+                if encontro.fase == FUGA:
+                    self._encerrar(ResultadoMissao(False, self.encontros_vencidos, "Fugiu da missão."))
+                    return
+                if encontro.fase == VITORIA:
+                    self.encontros_vencidos += 1
+                    self._recompensar(encontro.inimigo)
+                    if self.ao_checkpoint is not None:
+                        self.ao_checkpoint(self.encontros_vencidos)
+                if not self.heroi.esta_vivo():
+                    if self.verboso:
+                        print("\nVocê foi derrotado... Missão falhou.")
+                    logger.warning("💀 %s foi derrotado! Missão falhou.", self.heroi.nome)
+                    self._encerrar(ResultadoMissao(False, self.encontros_vencidos, "Derrotado nas hordas."))
+                    return
+
+            indice = encontro.indice if encontro is not None else 0
+            if indice >= len(self._horda):
+                if self.verboso:
+                    print("\nParabéns! Você venceu todas as hordas da missão!")
+                logger.info("🏆 %s venceu todas as hordas da missão!", self.heroi.nome)
+                self._encerrar(ResultadoMissao(True, self.encontros_vencidos, "Vitória!"))
+                return
+            self.encontro = EstadoEncontro(self, self._horda[indice], indice + 1, len(self._horda))
+            self.encontro.iniciar()
+
+    def _encerrar(self, resultado: ResultadoMissao) -> None:
+        self.resultado = resultado
+        self._evento(TipoEvento.FIM_MISSAO, self.heroi.nome, valor=int(resultado.venceu), detalhe=resultado.detalhes)
+        if self.eventos is not None:
+            self.eventos.descarregar()
+
+    # ----------------- Execução (driver: terminal/autoplay) -----------------
     def executar(self, auto: bool = False) -> ResultadoMissao:
-        encontros_vencidos = 0
-        logger.info("🚀 Iniciando missão...")
-        logger.info(f"📍 Cenário: {self.cenario} | 🎯 Dificuldade: {self.dificuldade}")
-        logger.info(f"🧙 Herói: {self.heroi.nome} (Nível {self.heroi.nivel})")
-
+        """Dirige a máquina de estados até o fim: política, autoplay ou input() a cada decisão."""
+        with self._contexto():
+            with perfil.fase("executar"):
+                self.iniciar()
+            while self.aguardando_acao:
+                acao = self._decidir(auto)      # fora das fases: o tempo do jogador não conta
+                with perfil.fase("executar"):
+                    self.step(acao)
+        return self.resultado
+
+    def _decidir(self, auto: bool) -> str:
+        inimigo = self.encontro.inimigo
+        if self.politica is not None:
+            return self.politica(self, inimigo)
+        return self.decidir_acao_auto(inimigo) if auto else input("> ").strip()
+
+    def executar_headless(self, politica: Callable[[MissaoHordas, Inimigo], str] | None = None) -> RelatorioMissao:
+        """
+        Roda a missão com as regras reais e sem I/O de terminal (print, HUD, input, log).
+        politica(missao, inimigo) devolve a ação do turno ("1", "2".."8", "0");
+        padrão: decidir_acao_auto.
+        """
+        relatorio = RelatorioMissao(False, 0, heroi=self.heroi.nome)
+        self.verboso, self._relatorio = False, relatorio
+        self.politica = politica or MissaoHordas.decidir_acao_auto
         try:
-            horda = generate_horde(self.cenario, self.dificuldade, getattr(self, "missao", None))
-            encontros_vencidos = 0
-        except TypeError:
-            # Versão que aceita apenas (cenario, dificuldade)
-            horda = generate_horde(self.cenario, self.dificuldade)
-
-        for idx, inimigo in enumerate(horda, start=1):
-
-            is_boss = getattr(inimigo, "efeitos", {}).get("is_boss", False)
-            titulo = f"{inimigo.nome} (CHEFE)" if is_boss else inimigo.nome
-            print(f"\n=== Encontro {idx}/{len(horda)} — {inimigo.nome} ===")
-            logger.info(f"⚔️ Iniciando encontro {idx}/{len(horda)}: {titulo}")
-            
-            if is_boss:
-                logger.warning(f"👑 CHEFE ENCONTRADO: {inimigo.nome}!")
-                
-            turno = 1
-
-            while self.heroi.esta_vivo() and inimigo.esta_vivo():
-                print(f"\n--- Turno {turno} ---")
-                logger.debug(f"🔄 Turno {turno} iniciado")
-
-                # Controle de turno do herói (p/ Execução Pública, etc.)
-                self.heroi.efeitos["turnos"] = self.heroi.efeitos.get("turnos", 0) + 1
-
-                # Efeitos no HERÓI (usa a lógica central do personagem)
-                dano_tick = self.heroi.inicio_turno()
-                if dano_tick:
-                    print(f"(Efeitos) {self.heroi.nome} sofre {dano_tick} | {self.heroi.barra_hp()}")
-                    logger.info(f"💥 Efeitos em {self.heroi.nome}: {dano_tick} de dano")
-
-                if self.heroi.efeitos.get("nao_pode_atacar", 0) > 0:
-                    print(f"{self.heroi.nome} está impossibilitado de agir neste turno!")
-                else:
-                    self._mostrar_hud(inimigo)
-
-                    acao = self.decidir_acao_auto(inimigo) if auto else input("> ").strip()
-                    dano_causado = 0
-                    bloqueado = False
-
-                    mana_atual = getattr(self.heroi._atrib, "mana", 0)
-                    custo_basico = custo_ataque_basico(self.heroi)
-
-                    # Bloqueio por mana (básico e especiais)
-                    if acao == "1":
-                        if mana_atual < custo_basico:
-                            print(f"Mana insuficiente para Ataque Básico ({mana_atual}/{custo_basico}).")
-                            bloqueado = True
-                    elif acao.isdigit() and int(acao) >= 2:
-                        esp_idx = int(acao) - 2
-                        especs = self._lista_especiais()
-                        if 0 <= esp_idx < len(especs):
-                            _id, nome, custo = especs[esp_idx]
-                            if mana_atual < custo:
-                                print(f"Mana insuficiente para {nome} ({mana_atual}/{custo}).")
-                                bloqueado = True
-                        else:
-                            print("Especial inválida.")
-                            bloqueado = True
-
-                    # Execução
-                    if acao == "1" and not bloqueado:
-                        dano_causado = self.heroi.ataque_basico(inimigo)
-
-                    elif acao.isdigit() and int(acao) >= 2 and not bloqueado:
-                        esp_idx = int(acao) - 2
-                        especs = self._lista_especiais()
-                        _id, nome, _c = especs[esp_idx]
-
-                        # Curandeiro tem assinaturas variadas; demais usam alvo=Inimigo
-                        if self.heroi.__class__.__name__ == "Curandeiro":
-                            if _id == 1:          # Capítulo Final (cura grupo)
-                                self.heroi.usar_especial(1, aliados=[])
-                            elif _id == 2:        # Semente Engatilhada
-                                self.heroi.usar_especial(2, aliado=None)
-                            elif _id == 3:        # Ventos Revigorantes
-                                self.heroi.usar_especial(3)
-                            elif _id in (4, 5):   # Golpe de Misericórdia / Hemofagia
-                                dano_causado = self.heroi.usar_especial(_id, alvo=inimigo)
-                            elif _id == 6:        # Transfusão Vital
-                                self.heroi.usar_especial(6, aliado=None)
-                            elif _id == 7:        # Resplendor Cósmico
-                                self.heroi.usar_especial(7, aliados=[])
-                        else:
-                            dano_causado = self.heroi.usar_especial(_id, alvo=inimigo)
-
-                    elif acao == "0":
-                        print("Você recuou da missão!")
-                        logger.warning(f"🏃 {self.heroi.nome} fugiu da missão!")
-                        return ResultadoMissao(False, encontros_vencidos, "Fugiu da missão.")
-                    else:
-                        if not bloqueado:
-                            print("Ação inválida.")
-
-                    if dano_causado:
-                        print(f"Você causou {dano_causado}. HP do {inimigo.nome}: {inimigo.barra_hp()}")
-
-                if not inimigo.esta_vivo():
-                    print(f"{inimigo.nome} foi derrotado!")
-                    logger.info(f"💀 {inimigo.nome} foi derrotado!")
-                    encontros_vencidos += 1
-
-                    xp_base = getattr(inimigo, "xp_recompensa", 0) 
-                    if xp_base == 0:
-                        # Fallback: Se não tiver XP definido, calcula baseado no ataque/vida dele
-                        xp_base = (inimigo._atrib.ataque * 2) + (inimigo._atrib.vida_max // 2)
-
-                    # Bônus de dificuldade (Opcional)
-                    if self.dificuldade == "Dificil":
-                        xp_base = int(xp_base * 1.5)
-
-                    # O Heroi ganha o XP calculado do inimigo
-                    logs_xp = self.heroi.ganhar_xp(xp_base)
-
-                    for log in logs_xp:
-                        print(log) # Imprime no console para você ver na hora
-                        logger.info(f"📈 {log}")
-                    
-
-                    drop_system = Drop_rate(self.heroi)
-                    item = drop_system.tentar_drop()
-
-                    if item:
-                        print(f"🎁 {inimigo.nome} dropou: {item.nome} ({item.raridade})!")
-                        logger.info(f"🎁 Item dropado: {item.nome} ({item.raridade})")
-
-                        # ⬇️ AQUI: adiciona ao inventário do herói
-                        self.heroi.inventario.adicionar_item(item)
-                    else:
-                        print("❌ Nenhum item dropado.")
-                        logger.info("❌ Nenhum item dropado.")
-
-                    # XP por derrotar inimigo
-                    xp_ganho = 10 * self.heroi.nivel
-                    logs_xp = self.heroi.ganhar_xp(xp_ganho)
-                    for log in logs_xp:
-                        logger.info(f"📈 {log}")
-                    
-                    break
-
-                # Efeitos no INIMIGO (usa helper central)
-                dano_tick_i = tick_efeitos_inicio_turno(inimigo)
-                if dano_tick_i:
-                    print(f"(Efeitos) {inimigo.nome} sofre {dano_tick_i} | {inimigo.barra_hp()}")
-                    logger.info(f"💥 Efeitos em {inimigo.nome}: {dano_tick_i} de dano")
-                if not inimigo.esta_vivo():
-                    print(f"{inimigo.nome} caiu pelos efeitos!")
-                    logger.info(f"💀 {inimigo.nome} caiu pelos efeitos!")
-                    encontros_vencidos += 1
-
-                    xp_base = getattr(inimigo, "xp_recompensa", 0) 
-                    if xp_base == 0:
-                        # Fallback: Se não tiver XP definido, calcula baseado no ataque/vida dele
-                        xp_base = (inimigo._atrib.ataque * 2) + (inimigo._atrib.vida_max // 2)
-
-                    # Bônus de dificuldade (Opcional)
-                    if self.dificuldade == "Dificil":
-                        xp_base = int(xp_base * 1.5)
-
-                    # O Heroi ganha o XP calculado do inimigo
-                    logs_xp = self.heroi.ganhar_xp(xp_base)
-
-                    for log in logs_xp:
-                        print(log) # Imprime no console para você ver na hora
-                        logger.info(f"📈 {log}")
-
-                    drop_system = Drop_rate(self.heroi)
-                    item = drop_system.tentar_drop()
-
-                    if item:
-                        print(f"🎁 {inimigo.nome} dropou: {item.nome} ({item.raridade})!")
-                        logger.info(f"🎁 Item dropado: {item.nome} ({item.raridade})")
-
-                        # ⬇️ AQUI: adiciona ao inventário do herói
-                        self.heroi.inventario.adicionar_item(item)
-                    else:
-                        print("❌ Nenhum item dropado.")
-                        logger.info("❌ Nenhum item dropado.")
-                    
-                    # XP por derrotar inimigo
-                    xp_ganho = 10 * self.heroi.nivel
-                    logs_xp = self.heroi.ganhar_xp(xp_ganho)
-                    for log in logs_xp:
-                        logger.info(f"📈 {log}")
-                    
-                    break
-
-                if inimigo.efeitos.get("nao_pode_atacar", 0) > 0:
-                    print(f"{inimigo.nome} está atordoado e não ataca.")
-                    logger.info(f"😵 {inimigo.nome} está atordoado e não ataca.")
-                else:
-                    # Dano do inimigo (Entidade.receber_dano já considera defesa do herói)
-                    dano_in = max(0, d6(f"{inimigo.nome} - Ataque") + inimigo._atrib.ataque)
-                    logger.debug(f"🎲 {inimigo.nome} rola ataque: {dano_in - inimigo._atrib.ataque} + {inimigo._atrib.ataque} = {dano_in}")
-
-                    # Invulnerável anula dano direto
-                    if self.heroi.efeitos.get("invulneravel_turnos", 0) > 0:
-                        print(f"{self.heroi.nome} está invulnerável e não sofre dano.")
-                        logger.info(f"🛡️ {self.heroi.nome} está invulnerável e não sofre dano.")
-                        dano_in = 0
-
-                    aplicado = self.heroi.receber_dano(dano_in)
-                    print(f"{inimigo.nome} causa {aplicado}. Seu HP: {self.heroi.barra_hp()} "
-                          f"(Mana: {getattr(self.heroi._atrib, 'mana', 0)})")
-                    
-                    if aplicado > 0:
-                        logger.info(f"⚔️ {inimigo.nome} causa {aplicado} de dano em {self.heroi.nome}")
-
-                    # Reflexão de dano
-                    if aplicado > 0 and self.heroi.efeitos.get("refletir_dano_turnos", 0) > 0:
-                        refle = inimigo.receber_dano(aplicado)
-                        print(f"Ventos Revigorantes refletem {refle} ao {inimigo.nome}! HP: {inimigo.barra_hp()}")
-                        logger.info(f"💨 Ventos Revigorantes refletem {refle} de dano para {inimigo.nome}")
-
-                turno += 1
-
-            if not self.heroi.esta_vivo():
-                print("\nVocê foi derrotado... Missão falhou.")
-                logger.warning(f"💀 {self.heroi.nome} foi derrotado! Missão falhou.")
-                return ResultadoMissao(False, encontros_vencidos, "Derrotado nas hordas.")
+            with logger.silenciar():
+                resultado = self.executar(auto=True)
+        finally:
+            self.verboso, self.politica, self._relatorio = True, None, None
+        relatorio.venceu = resultado.venceu
+        relatorio.encontros_vencidos = resultado.encontros_vencidos
+        relatorio.detalhes = resultado.detalhes
+        relatorio.nivel_final = self.heroi.nivel
+        return relatorio
+
+    @perfil.medir("recompensa")
+    def _recompensar(self, inimigo: Inimigo) -> None:
+        """XP do inimigo, tentativa de drop e XP por derrota (após o inimigo cair)."""
+        xp_base = getattr(inimigo, "xp_recompensa", 0) 
+        if xp_base == 0:
+            # Fallback: Se não tiver XP definido, calcula baseado no ataque/vida dele
+            xp_base = (inimigo._atrib.ataque * 2) + (inimigo._atrib.vida_max // 2)
+
+        # Bônus de dificuldade (Opcional)
+        if self.dificuldade == "Dificil":
+            xp_base = int(xp_base * 1.5)
+
+        # O Heroi ganha o XP calculado do inimigo
+        logs_xp = self.heroi.ganhar_xp(xp_base)
+        self._evento(TipoEvento.XP, self.heroi.nome, inimigo.nome, xp_base)
+
+        for log in logs_xp:
+            if self.verboso:
+                print(log) # Imprime no console para você ver na hora
+            logger.info("📈 %s", log)
+
+        drop_system = Drop_rate(self.heroi, rng=self.rng)
+        item = drop_system.tentar_drop()
+
+        if item:
+            if self.verboso:
+                print(f"🎁 {inimigo.nome} dropou: {item.nome} ({item.raridade})!")
+            logger.info("🎁 Item dropado: %s (%s)", item.nome, item.raridade)
+            self._evento(TipoEvento.DROP, inimigo.nome, self.heroi.nome, detalhe=f"{item.nome} ({item.raridade})")
+
+            # ⬇️ AQUI: adiciona ao inventário do herói
+            self.heroi.inventario.adicionar_item(item)
+        else:
+            if self.verboso:
+                print("❌ Nenhum item dropado.")
+            logger.info("❌ Nenhum item dropado.")
 
-        print("\nParabéns! Você venceu todas as hordas da missão!")
-        logger.info(f"🏆 {self.heroi.nome} venceu todas as hordas da missão!")
-        return ResultadoMissao(True, encontros_vencidos, "Vitória!")
+        # XP por derrotar inimigo
+        xp_ganho = 10 * self.heroi.nivel
+        logs_xp = self.heroi.ganhar_xp(xp_ganho)
+        self._evento(TipoEvento.XP, self.heroi.nome, inimigo.nome, xp_ganho)
+        for log in logs_xp:
+            logger.info("📈 %s", log)
 
 
 class Missao(MissaoHordas):
     """
     Estrutura da missão com mecânica de combate (usa helpers centrais).
     """
-    def __init__(self, inimigo: Inimigo, heroi: Personagem, cenario: str, dificuldade: str, missao: dict | None = None):
-        super().__init__(heroi, cenario, dificuldade)
+    def __init__(self, inimigo: Inimigo, heroi: Personagem, cenario: str, dificuldade: str, missao: dict | None = None,
+                 rng: GeradorDados | None = None, eventos: RegistroEventos | None = None,
+                 ao_checkpoint: Callable[[int], None] | None = None):
+        super().__init__(heroi, cenario, dificuldade, rng=rng, eventos=eventos, ao_checkpoint=ao_checkpoint)
         self.inimigo = inimigo
         self.missao = missao
 
@@ -1,95 +1,49 @@
 # models/personagem.py
 from __future__ import annotations
-from typing import Optional, List, Dict
+from typing import Optional, List, Sequence
 from dado import d6, d20, rolar_multiplos_dados, somar_dados
 from utils.logger import logger
-from .base import Atributos, Entidade  # mantém compat: from models.personagem import Entidade
+from utils.perfil import perfil
+from .base import Atributos, Efeitos, Entidade  # mantém compat: from models.personagem import Entidade
+from .efeitos import aplicar_efeito, tick_inicio_turno
+from .habilidades import usar_habilidade, visao_habilidades
+from .progressao import (GANHO, GANHO_POR_NIVEL, MAXIMO, NIVEL, NIVEL_MAXIMO, STATUS, XP_ACUMULADO,
+                         EventoXP, nivel_para_xp)
 from .inventario import Inventario
 
 # ========================== EFEITOS / TICKS ===============================
 
 def log_efeito_aplicado(alvo: Entidade, efeito: str, duracao: int = 0) -> None:
     """Loga a aplicação de efeitos em entidades."""
-    logger.info(f"💫 {efeito} aplicado em {alvo.nome}" + (f" por {duracao} turnos" if duracao > 0 else ""))
+    if duracao > 0:
+        logger.info("💫 %s aplicado em %s por %s turnos", efeito, alvo.nome, duracao)
+    else:
+        logger.info("💫 %s aplicado em %s", efeito, alvo.nome)
 
 def log_dano_causado(atacante: Entidade, alvo: Entidade, dano: int, habilidade: str = "") -> None:
     """Loga o dano causado em combate."""
     if habilidade:
-        logger.info(f"⚔️ {atacante.nome} usa {habilidade} em {alvo.nome}: {dano} de dano")
+        logger.info("⚔️ %s usa %s em %s: %s de dano", atacante.nome, habilidade, alvo.nome, dano)
     else:
-        logger.info(f"⚔️ {atacante.nome} ataca {alvo.nome}: {dano} de dano")
+        logger.info("⚔️ %s ataca %s: %s de dano", atacante.nome, alvo.nome, dano)
 
 def log_cura_realizada(curandeiro: Entidade, alvo: Entidade, cura: int, habilidade: str = "") -> None:
     """Loga ações de cura."""
     if habilidade:
-        logger.info(f"✨ {curandeiro.nome} usa {habilidade} em {alvo.nome}: +{cura} de vida")
+        logger.info("✨ %s usa %s em %s: +%s de vida", curandeiro.nome, habilidade, alvo.nome, cura)
     else:
-        logger.info(f"✨ {curandeiro.nome} cura {alvo.nome}: +{cura} de vida")
+        logger.info("✨ %s cura %s: +%s de vida", curandeiro.nome, alvo.nome, cura)
 
+@perfil.medir()
 def tick_efeitos_inicio_turno(alvo: Entidade) -> int:
     """
-    Aplica efeitos de início de turno em 'alvo'.
+    Aplica efeitos de início de turno em 'alvo' (regras em models/efeitos.py).
     Retorna o dano total sofrido neste início de turno.
     """
     if not hasattr(alvo, "efeitos"):
         return 0
 
-    total = 0
-    inv = alvo.efeitos.get("invulneravel_turnos", 0) > 0
-
-    # Eletrocussão: 1d6-1 por turno
-    if alvo.efeitos.get("eletro_turnos", 0) > 0:
-        if not inv:
-            dano_eletro = max(0, d6("Eletrocussão - Dano por Turno") - 1)
-            total += alvo.receber_dano(dano_eletro)
-            logger.info(f"⚡ Eletrocussão em {alvo.nome}: {dano_eletro} de dano")
-        alvo.efeitos["eletro_turnos"] -= 1
-
-    # Veneno: dano fixo (default 2)
-    if alvo.efeitos.get("veneno_turnos", 0) > 0:
-        if not inv:
-            dano_veneno = max(0, alvo.efeitos.get("veneno_dano", 2))
-            total += alvo.receber_dano(dano_veneno)
-            logger.info(f"☠️ Veneno em {alvo.nome}: {dano_veneno} de dano")
-        alvo.efeitos["veneno_turnos"] -= 1
-
-    # Sangramento: tipo "d6" (rola 1d6/turno) ou fixo
-    if alvo.efeitos.get("sangramento_turnos", 0) > 0:
-        if not inv:
-            if alvo.efeitos.get("sangramento_tipo") == "d6":
-                dano_sangramento = d6("Sangramento - Dano por Turno")
-            else:
-                dano_sangramento = max(0, alvo.efeitos.get("sangramento_dano", 1))
-            total += alvo.receber_dano(dano_sangramento)
-            logger.info(f"🩸 Sangramento em {alvo.nome}: {dano_sangramento} de dano")
-        alvo.efeitos["sangramento_turnos"] -= 1
-
-    # Marca Fatal: 1d6 por turno
-    if alvo.efeitos.get("marca_fatal_turnos", 0) > 0:
-        if not inv:
-            dano_marca = d6("Marca Fatal - Dano por Turno")
-            total += alvo.receber_dano(dano_marca)
-            logger.info(f"🎯 Marca Fatal em {alvo.nome}: {dano_marca} de dano")
-        alvo.efeitos["marca_fatal_turnos"] -= 1
-
-    # Semente Engatilhada: quando zera, cura 1d20-5
-    if alvo.efeitos.get("semente_turnos", 0) > 0:
-        alvo.efeitos["semente_turnos"] -= 1
-        if alvo.efeitos["semente_turnos"] == 0 and hasattr(alvo, "curar"):
-            cura_semente = max(0, d20("Semente Engatilhada - Cura") - 5)
-            alvo.curar(cura_semente)
-            logger.info(f"🌱 Semente Engatilhada ativa em {alvo.nome}: +{cura_semente} de vida")
-
-    # Log de efeitos que estão terminando
-    for efeito, turnos in list(alvo.efeitos.items()):
-        if isinstance(turnos, int) and turnos == 1:  # Último turno
-            if "turnos" in efeito and efeito != "turnos":
-                logger.info(f"⏰ {efeito.replace('_turnos', '').title()} está prestes a terminar em {alvo.nome}")
-
-    # Contadores "não-dano"
-    for k in ("nao_pode_atacar", "refletir_dano_turnos", "invulneravel_turnos"):
-        if alvo.efeitos.get(k, 0) > 0:
-            alvo.efeitos[k] -= 1
+    total = tick_inicio_turno(alvo)
 
     # Normalização simples
     try:
@@ -113,7 +67,7 @@ def aplicar_buffs_de_ataque(user: "Personagem", dano_base: int) -> int:
     if user.efeitos.get("critico_proximo"):
         dano *= 2
         user.efeitos["critico_proximo"] = False
-        logger.info(f"🎯 Crítico aplicado! Dano dobrado: {dano}")
+        logger.info("🎯 Crítico aplicado! Dano dobrado: %s", dano)
     return max(0, dano)
 
 # =============================== PERSONAGEM ===============================
@@ -125,6 +79,8 @@ class Personagem(Entidade):
     - 7 especiais por classe (4 originais liberadas desde o nível 1; +1 nos níveis 2, 4 e 6).
     """
 
+    __slots__ = ("ataque_magico", "nivel", "xp", "inventario", "efeitos")
+
     def __init__(self, nome: str, atrib: Atributos, ataque_magico: int = 0):
         super().__init__(nome, atrib)
         self.ataque_magico: int = ataque_magico
@@ -132,25 +88,15 @@ class Personagem(Entidade):
         self.xp: int = 0
         self.inventario = Inventario()
 
-        self.efeitos: Dict[str, int | bool] = {
-            # DOTs
-            "eletro_turnos": 0,
-            "veneno_turnos": 0, "veneno_dano": 2,
-            "sangramento_turnos": 0, "sangramento_tipo": None, "sangramento_dano": 0,
-            "marca_fatal_turnos": 0,
-            "semente_turnos": 0,
-            # CC/mitigação
-            "nao_pode_atacar": 0,
-            "refletir_dano_turnos": 0,
-            "invulneravel_turnos": 0,
-            # Bônus de ataque
-            "critico_proximo": False,
-            "bonus_proximo": 0,
-            # Controle de missão/habilidade
-            "turnos": 0,
-            "empurrao_sismico_usado": False,
-            "prox_flecha_d20_critico": False,
-        }
+        # Efeitos esparsos: só entram as chaves já aplicadas; o resto vale o padrão
+        # lido com .get(chave, padrão). Chaves usadas:
+        #   DOTs: eletro_turnos, veneno_turnos/veneno_dano (2), sangramento_turnos/
+        #         sangramento_tipo/sangramento_dano, marca_fatal_turnos, semente_turnos
+        #   CC/mitigação: nao_pode_atacar, refletir_dano_turnos, invulneravel_turnos
+        #   (regras de tick/acúmulo dos contadores: models/efeitos.py)
+        #   Bônus de ataque: critico_proximo, bonus_proximo
+        #   Controle de missão/habilidade: turnos, empurrao_sismico_usado, prox_flecha_d20_critico
+        self.efeitos: Efeitos = Efeitos()
 
     # -------- utilitários --------
     def inicio_turno(self) -> int:
@@ -162,7 +108,7 @@ class Personagem(Entidade):
         self._atrib.vida = min(vmax, self._atrib.vida + max(0, int(qtd)))
         curado = self._atrib.vida - ant
         if curado > 0:
-            logger.info(f"❤️ {self.nome} cura {curado} de vida")
+            logger.info("❤️ %s cura %s de vida", self.nome, curado)
         return curado
 
     def gastar_mana(self, custo: int) -> bool:
@@ -170,16 +116,22 @@ class Personagem(Entidade):
             return True
         atual = getattr(self._atrib, "mana", 0)
         if atual < custo:
-            logger.warning(f"🔮 {self.nome} não tem mana suficiente ({atual}/{custo}).")
+            logger.warning("🔮 %s não tem mana suficiente (%s/%s).", self.nome, atual, custo)
             return False
         self._atrib.mana = atual - custo
-        logger.debug(f"🔮 {self.nome} gasta {custo} de mana (restante: {self._atrib.mana})")
+        logger.debug("🔮 %s gasta %s de mana (restante: %s)", self.nome, custo, self._atrib.mana)
         return True
 
+    def usar_especial(self, n: int, alvo: Optional[Entidade] = None,
+                      aliado: Optional[Personagem] = None,
+                      aliados: Optional[List[Personagem]] = None, **kwargs) -> int:
+        """Especial 'n' da classe (registro em models/habilidades.py); cada uma usa o alvo que declara."""
+        return usar_habilidade(self, n, alvo=alvo, aliado=aliado, aliados=aliados)
+
     def calcular_dano_base(self) -> int:
         """Dano físico base: 1d6 + ataque (+ buffs/crítico do próximo ataque)."""
         if self.efeitos.get("nao_pode_atacar", 0) > 0:
-            logger.warning(f"🚫 {self.nome} está impossibilitado de atacar!")
+            logger.warning("🚫 %s está impossibilitado de atacar!", self.nome)
             return 0
         bruto = d6("Ataque Básico - Dano Base") + self._atrib.ataque
         return aplicar_buffs_de_ataque(self, bruto)
@@ -189,53 +141,56 @@ class Personagem(Entidade):
         # Fórmula atual: 100 * nivel (100, 200, 300...)
         return 100 * self.nivel
 
-    def ganhar_xp(self, qtd: int) -> List[str]:
-        logs: List[str] = []
+    def ganhar_xp(self, qtd: int) -> List[EventoXP]:
+        """
+        Soma XP e aplica todos os níveis ganhos de uma vez (curva em models/progressao.py).
+        Retorna eventos estruturados; str(evento) é a linha de log.
+        """
+        eventos: List[EventoXP] = []
         qtd = max(0, int(qtd))
-        
-        if qtd == 0 or self.nivel >= 10:
-            return logs
-
-        self.xp += qtd
-        
-        # Log inicial apenas informativo
-        xp_necessario = self._xp_para_proximo()
-        logs.append(f"Ganhou {qtd} XP. (Atual: {self.xp}/{xp_necessario})")
-
-        # Loop de Level Up (suporta subir múltiplos níveis de uma vez)
-        subiu_nivel = False
-        while self.nivel < 10 and self.xp >= self._xp_para_proximo():
-            custo_nivel = self._xp_para_proximo()
-            self.xp -= custo_nivel
-            self.nivel += 1
-            subiu_nivel = True
-
-            # Progressão de atributos
-            self._atrib.vida_max = (self._atrib.vida_max or self._atrib.vida) + 5
-            self._atrib.vida = self._atrib.vida_max # Recupera vida ao upar (opcional, mas gratificante)
-            self._atrib.ataque += 1
-            self._atrib.defesa += 1
-            self._atrib.mana += 5
-
-            if self.nivel in (2, 4, 6):
-                logs.append(f"🎉 SUBIU PARA O NÍVEL {self.nivel}! Nova habilidade desbloqueada.")
-            else:
-                logs.append(f"🎉 SUBIU PARA O NÍVEL {self.nivel}!")
-
-        if subiu_nivel:
-            # Mostra como ficou a barra APÓS subir de nível
-            if self.nivel < 10:
-                logs.append(f"Status Pós-Nível: {self.xp}/{self._xp_para_proximo()} XP para o próximo.")
-            else:
-                self.xp = 0
-                logs.append("🏆 Nível Máximo (10) atingido!")
-
-        return logs
+        if qtd == 0 or self.nivel >= NIVEL_MAXIMO:
+            return eventos
+
+        nivel_antes = self.nivel
+        eventos.append(EventoXP(GANHO, nivel_antes, self.xp + qtd, self._xp_para_proximo(), qtd))
+
+        total = XP_ACUMULADO[nivel_antes] + self.xp + qtd
+        novo = nivel_para_xp(total)
+        if novo == nivel_antes:
+            self.xp += qtd
+            return eventos
+
+        # Progressão de atributos (todos os níveis ganhos de uma vez)
+        ganhos = novo - nivel_antes
+        self.nivel = novo
+        self._atrib.vida_max = (self._atrib.vida_max or self._atrib.vida) + GANHO_POR_NIVEL["vida_max"] * ganhos
+        self._atrib.vida = self._atrib.vida_max  # Recupera vida ao upar
+        self._atrib.ataque += GANHO_POR_NIVEL["ataque"] * ganhos
+        self._atrib.defesa += GANHO_POR_NIVEL["defesa"] * ganhos
+        self._atrib.mana += GANHO_POR_NIVEL["mana"] * ganhos
+        eventos.extend(EventoXP(NIVEL, n) for n in range(nivel_antes + 1, novo + 1))
+
+        if novo < NIVEL_MAXIMO:
+            self.xp = total - XP_ACUMULADO[novo]
+            eventos.append(EventoXP(STATUS, novo, self.xp, self._xp_para_proximo()))
+        else:
+            self.xp = 0
+            eventos.append(EventoXP(MAXIMO, novo))
+        return eventos
+
+    def avancar_para_nivel(self, nivel: int) -> List[EventoXP]:
+        """Concede exatamente o XP que falta para chegar a 'nivel' (jobs de simulação/balanceamento)."""
+        nivel = min(NIVEL_MAXIMO, int(nivel))
+        if nivel <= self.nivel:
+            return []
+        return self.ganhar_xp(XP_ACUMULADO[nivel] - XP_ACUMULADO[self.nivel] - self.xp)
 
 # =============================== GUERREIRO ================================
 
 class Guerreiro(Personagem):
     """Vida 50 | Ataque 8 | Defesa 10 | Mana 5 | Magia 0"""
+    __slots__ = ()
+
     def __init__(self, nome: str):
         super().__init__(nome, Atributos(vida=50, ataque=8, defesa=10, mana=5, vida_max=50), ataque_magico=0)
 
@@ -257,7 +212,7 @@ class Guerreiro(Personagem):
             return 0
         dano = somar_dados(5, 6, "Execução Pública - Dano")
         dano = dano * 2 + 3
-        logger.info(f"🎯 Execução Pública - Crítico garantido +3!")
+        logger.info("🎯 Execução Pública - Crítico garantido +3!")
         log_dano_causado(self, alvo, dano, "Execução Pública")
         return alvo.receber_dano(dano)
 
@@ -265,8 +220,8 @@ class Guerreiro(Personagem):
         # 0 mana | 1 turno invulnerável
         if not self.gastar_mana(0):
             return 0
-        self.efeitos["invulneravel_turnos"] = max(self.efeitos.get("invulneravel_turnos", 0), 1)
-        logger.info(f"🛡️ {self.nome} está impenetrável por 1 turno.")
+        aplicar_efeito(self, "invulneravel_turnos", 1)
+        logger.info("🛡️ %s está impenetrável por 1 turno.", self.nome)
         return 0
 
     def esp_golpe_trovejante(self, alvo: Entidade) -> int:
@@ -284,7 +239,7 @@ class Guerreiro(Personagem):
             return 0
         dano_dados = somar_dados(3, 6, "Lâmina Ínfera - Dano")
         if hasattr(alvo, "efeitos"):
-            alvo.efeitos["sangramento_turnos"] = max(alvo.efeitos.get("sangramento_turnos", 0), 2)
+            aplicar_efeito(alvo, "sangramento_turnos", 2)
             alvo.efeitos["sangramento_tipo"] = "d6"
             log_efeito_aplicado(alvo, "Sangramento", 2)
         log_dano_causado(self, alvo, dano_dados, "Lâmina Ínfera")
@@ -297,7 +252,7 @@ class Guerreiro(Personagem):
             return 0
         bonus = d6("Duro na Queda - Bônus")
         self.efeitos["bonus_proximo"] = self.efeitos.get("bonus_proximo", 0) + bonus
-        logger.info(f"💪 {self.nome} ativa Duro na Queda: +{bonus} no próximo ataque.")
+        logger.info("💪 %s ativa Duro na Queda: +%s no próximo ataque.", self.nome, bonus)
         return 0
 
     def esp_determinacao_mortal(self) -> int:
@@ -306,7 +261,7 @@ class Guerreiro(Personagem):
             return 0
         cura = d20("Determinação Mortal - Cura")
         self.curar(cura)
-        logger.info(f"❤️ {self.nome} usa Determinação Mortal e cura {cura}.")
+        logger.info("❤️ %s usa Determinação Mortal e cura %s.", self.nome, cura)
         return 0
 
     def esp_golpe_estilhacador(self) -> int:
@@ -314,23 +269,15 @@ class Guerreiro(Personagem):
         if not self.gastar_mana(0):
             return 0
         self.efeitos["critico_proximo"] = True
-        logger.info(f"🔪 {self.nome} prepara Golpe Estilhaçador (próximo ataque crítico).")
-        return 0
-
-    def usar_especial(self, n: int, alvo: Optional[Entidade] = None, **kwargs) -> int:
-        if n == 1 and alvo: return self.esp_execucao_publica(alvo)
-        if n == 2:          return self.esp_perseveranca()
-        if n == 3 and alvo: return self.esp_golpe_trovejante(alvo)
-        if n == 4 and alvo: return self.esp_lamina_infera(alvo)
-        if n == 5:          return self.esp_duro_na_queda()
-        if n == 6:          return self.esp_determinacao_mortal()
-        if n == 7:          return self.esp_golpe_estilhacador()
+        logger.info("🔪 %s prepara Golpe Estilhaçador (próximo ataque crítico).", self.nome)
         return 0
 
 # ================================= MAGO ==================================
 
 class Mago(Personagem):
     """Vida 30 | Ataque 1 | Defesa 4 | Mana 40 | Magia 10"""
+    __slots__ = ()
+
     def __init__(self, nome: str):
         super().__init__(nome, Atributos(vida=30, ataque=1, defesa=4, mana=40, vida_max=30), ataque_magico=10)
 
@@ -357,7 +304,7 @@ class Mago(Personagem):
             return 0
         dano = somar_dados(3, 20, "Descarnar - Dano")
         if hasattr(alvo, "efeitos"):
-            alvo.efeitos["sangramento_turnos"] = max(alvo.efeitos.get("sangramento_turnos", 0), 2)
+            aplicar_efeito(alvo, "sangramento_turnos", 2)
             alvo.efeitos["sangramento_tipo"] = "d6"
             log_efeito_aplicado(alvo, "Sangramento", 2)
         log_dano_causado(self, alvo, dano, "Descarnar")
@@ -366,7 +313,7 @@ class Mago(Personagem):
     def esp_distorcao_no_tempo(self) -> int:
         # 0 mana | recupera 50 mana
         self._atrib.mana += 50
-        logger.info(f"🔮 {self.nome} recupera 50 de mana.")
+        logger.info("🔮 %s recupera 50 de mana.", self.nome)
         return 0
 
     def esp_empurrao_sismico(self, alvo: Entidade) -> int:
@@ -378,7 +325,7 @@ class Mago(Personagem):
             return 0
         dano = somar_dados(3, 6, "Empurrão Sísmico - Dano")
         if hasattr(alvo, "efeitos"):
-            alvo.efeitos["nao_pode_atacar"] = alvo.efeitos.get("nao_pode_atacar", 0) + 1
+            aplicar_efeito(alvo, "nao_pode_atacar", 1)
             log_efeito_aplicado(alvo, "Atordoado", 1)
         self.efeitos["empurrao_sismico_usado"] = True
         log_dano_causado(self, alvo, dano, "Empurrão Sísmico")
@@ -399,7 +346,7 @@ class Mago(Personagem):
             return 0
         dano = somar_dados(3, 6, "Eletrocussão - Dano Inicial")
         if hasattr(alvo, "efeitos"):
-            alvo.efeitos["eletro_turnos"] = alvo.efeitos.get("eletro_turnos", 0) + 2
+            aplicar_efeito(alvo, "eletro_turnos", 2)
             log_efeito_aplicado(alvo, "Eletrocussão", 2)
         log_dano_causado(self, alvo, dano, "Eletrocussão")
         return alvo.receber_dano(dano)
@@ -409,25 +356,17 @@ class Mago(Personagem):
         if not self.gastar_mana(8):
             return 0
         total = somar_dados(10, 6, "Explosão Florescente - Dano")
-        self.efeitos["nao_pode_atacar"] = self.efeitos.get("nao_pode_atacar", 0) + 1
-        logger.warning(f"💥 {self.nome} não poderá agir no próximo turno!")
+        aplicar_efeito(self, "nao_pode_atacar", 1)
+        logger.warning("💥 %s não poderá agir no próximo turno!", self.nome)
         log_dano_causado(self, alvo, total, "Explosão Florescente")
         return alvo.receber_dano(total)
 
-    def usar_especial(self, n: int, alvo: Optional[Entidade] = None, **kwargs) -> int:
-        if n == 1 and alvo: return self.esp_colapso_minguante(alvo)
-        if n == 2 and alvo: return self.esp_descarnar(alvo)
-        if n == 3:          return self.esp_distorcao_no_tempo()
-        if n == 4 and alvo: return self.esp_empurrao_sismico(alvo)
-        if n == 5 and alvo: return self.esp_paradoxo(alvo)
-        if n == 6 and alvo: return self.esp_eletrocussao(alvo)
-        if n == 7 and alvo: return self.esp_explosao_florescente(alvo)
-        return 0
-
 # ================================ ARQUEIRO ================================
 
 class Arqueiro(Personagem):
     """Vida 35 | Ataque 5 | Defesa 4 | Mana 25 | Magia 3"""
+    __slots__ = ()
+
     def __init__(self, nome: str):
         super().__init__(nome, Atributos(vida=35, ataque=5, defesa=4, mana=25, vida_max=35), ataque_magico=3)
 
@@ -459,10 +398,10 @@ class Arqueiro(Personagem):
         if not self.gastar_mana(6):
             return 0
         if hasattr(alvo, "efeitos"):
-            alvo.efeitos["sangramento_turnos"] = max(alvo.efeitos.get("sangramento_turnos", 0), 5)
+            aplicar_efeito(alvo, "sangramento_turnos", 5)
             alvo.efeitos["sangramento_tipo"] = "d6"
             log_efeito_aplicado(alvo, "Cortes Certeiros", 5)
-        logger.info(f"🎯 {self.nome} aplica cortes certeiros! O alvo sangrará por 5 turnos.")
+        logger.info("🎯 %s aplica cortes certeiros! O alvo sangrará por 5 turnos.", self.nome)
         return 0
 
     def esp_estilo_do_cacador(self) -> int:
@@ -470,7 +409,7 @@ class Arqueiro(Personagem):
         if not self.gastar_mana(10):
             return 0
         self.efeitos["prox_flecha_d20_critico"] = True
-        logger.info(f"🎯 {self.nome} prepara Estilo do Caçador (próximo tiro: d20 crítico).")
+        logger.info("🎯 %s prepara Estilo do Caçador (próximo tiro: d20 crítico).", self.nome)
         return 0
 
     def esp_marca_fatal(self, alvo: Entidade) -> int:
@@ -478,9 +417,9 @@ class Arqueiro(Personagem):
         if not self.gastar_mana(10):
             return 0
         if hasattr(alvo, "efeitos"):
-            alvo.efeitos["marca_fatal_turnos"] = max(alvo.efeitos.get("marca_fatal_turnos", 0), 7)
+            aplicar_efeito(alvo, "marca_fatal_turnos", 7)
             log_efeito_aplicado(alvo, "Marca Fatal", 7)
-        logger.info(f"🎯 {self.nome} marca o alvo: 1d6 por 7 turnos.")
+        logger.info("🎯 %s marca o alvo: 1d6 por 7 turnos.", self.nome)
         return 0
 
     # 3 ADICIONAIS
@@ -490,7 +429,7 @@ class Arqueiro(Personagem):
             return 0
         bonus = d6("Aljava da Ruína - Bônus") + 2
         self.efeitos["bonus_proximo"] = self.efeitos.get("bonus_proximo", 0) + bonus
-        logger.info(f"🏹 {self.nome} ativa Aljava da Ruína: +{bonus} no próximo tiro.")
+        logger.info("🏹 %s ativa Aljava da Ruína: +%s no próximo tiro.", self.nome, bonus)
         return 0
 
     def esp_contaminar(self, alvo: Entidade) -> int:
@@ -498,10 +437,10 @@ class Arqueiro(Personagem):
         if not self.gastar_mana(3):
             return 0
         if hasattr(alvo, "efeitos"):
-            alvo.efeitos["veneno_turnos"] = max(alvo.efeitos.get("veneno_turnos", 0), 3)
+            aplicar_efeito(alvo, "veneno_turnos", 3)
             alvo.efeitos["veneno_dano"] = 2
             log_efeito_aplicado(alvo, "Veneno", 3)
-        logger.info(f"☠️ {self.nome} contamina o alvo (veneno por 3 turnos).")
+        logger.info("☠️ %s contamina o alvo (veneno por 3 turnos).", self.nome)
         return 0
 
     def esp_as_na_manga(self) -> int:
@@ -510,23 +449,15 @@ class Arqueiro(Personagem):
             return 0
         self.efeitos["critico_proximo"] = True
         self.efeitos["bonus_proximo"] = self.efeitos.get("bonus_proximo", 0) + 10
-        logger.info(f"🎲 {self.nome} prepara o Ás na Manga (próximo tiro crítico +10).")
-        return 0
-
-    def usar_especial(self, n: int, alvo: Optional[Entidade] = None, **kwargs) -> int:
-        if n == 1 and alvo: return self.esp_curingas(alvo)
-        if n == 2 and alvo: return self.esp_cortes_certeiros(alvo)
-        if n == 3:          return self.esp_estilo_do_cacador()
-        if n == 4 and alvo: return self.esp_marca_fatal(alvo)
-        if n == 5:          return self.esp_aljava_da_ruina()
-        if n == 6 and alvo: return self.esp_contaminar(alvo)
-        if n == 7:          return self.esp_as_na_manga()
+        logger.info("🎲 %s prepara o Ás na Manga (próximo tiro crítico +10).", self.nome)
         return 0
 
 # =============================== CURANDEIRO ===============================
 
 class Curandeiro(Personagem):
     """Vida 20 | Ataque 0 | Defesa 3 | Mana 35 | Magia 8"""
+    __slots__ = ()
+
     def __init__(self, nome: str):
         super().__init__(nome, Atributos(vida=20, ataque=0, defesa=3, mana=35, vida_max=20), ataque_magico=8)
 
@@ -549,7 +480,7 @@ class Curandeiro(Personagem):
         cura = d6("Capítulo Final - Cura")
         for a in aliados:
             a.curar(cura)
-        logger.info(f"📖 {self.nome} usa Capítulo Final e cura todos os aliados em {cura}.")
+        logger.info("📖 %s usa Capítulo Final e cura todos os aliados em %s.", self.nome, cura)
         return 0
 
     def esp_semente_engatilhada(self, aliado: Optional[Personagem]) -> int:
@@ -560,17 +491,17 @@ class Curandeiro(Personagem):
             logger.warning("(Sem aliado alvo para a semente.)")
             return 0
         if hasattr(aliado, "efeitos"):
-            aliado.efeitos["semente_turnos"] = 2
+            aplicar_efeito(aliado, "semente_turnos", 2)
             log_efeito_aplicado(aliado, "Semente Engatilhada", 2)
-        logger.info(f"🌱 {self.nome} planta uma semente curativa em {getattr(aliado, 'nome', 'aliado')}.")
+        logger.info("🌱 %s planta uma semente curativa em %s.", self.nome, getattr(aliado, 'nome', 'aliado'))
         return 0
 
     def esp_ventos_revigorantes(self) -> int:
         # 15 mana | por 1 rodada reflete dano recebido
         if not self.gastar_mana(15):
             return 0
-        self.efeitos["refletir_dano_turnos"] = max(self.efeitos.get("refletir_dano_turnos", 0), 1)
-        logger.info(f"💨 {self.nome} invoca Ventos Revigorantes (reflexão por 1 rodada).")
+        aplicar_efeito(self, "refletir_dano_turnos", 1)
+        logger.info("💨 %s invoca Ventos Revigorantes (reflexão por 1 rodada).", self.nome)
         return 0
 
     def esp_golpe_de_misericordia(self, alvo: Entidade) -> int:
@@ -580,7 +511,7 @@ class Curandeiro(Personagem):
         dano = somar_dados(4, 20, "Golpe de Misericórdia - Dano")
         ef = alvo.receber_dano(dano)
         self._atrib.vida = 0
-        logger.warning(f"💀 {self.nome} sacrifica-se em um Golpe de Misericórdia!")
+        logger.warning("💀 %s sacrifica-se em um Golpe de Misericórdia!", self.nome)
         log_dano_causado(self, alvo, dano, "Golpe de Misericórdia")
         return ef
 
@@ -592,7 +523,7 @@ class Curandeiro(Personagem):
         dano = somar_dados(2, 6, "Hemofagia - Dano")
         cura = d6("Hemofagia - Cura")
         self.curar(cura)
-        logger.info(f"🩸 {self.nome} usa Hemofagia: causa {dano} e cura {cura}.")
+        logger.info("🩸 %s usa Hemofagia: causa %s e cura %s.", self.nome, dano, cura)
         ef = alvo.receber_dano(dano)
         return ef
 
@@ -604,10 +535,9 @@ class Curandeiro(Personagem):
             logger.warning("(Sem aliado para Transfusão Vital.)")
             return 0
         qtd = min(15, self._atrib.vida)
-        self._attrib_vida_backup = self._atrib.vida  # opcional debug
         self._atrib.vida -= qtd
         aliado.curar(qtd)
-        logger.info(f"💝 {self.nome} transfere {qtd} de vida para {getattr(aliado, 'nome', 'aliado')}.")
+        logger.info("💝 %s transfere %s de vida para %s.", self.nome, qtd, getattr(aliado, 'nome', 'aliado'))
         return 0
 
     def esp_resplendor_cosmico(self, aliados: Optional[List[Personagem]]) -> int:
@@ -619,19 +549,7 @@ class Curandeiro(Personagem):
             return 0
         for a in aliados:
             a.curar(20)
-        logger.info(f"🌟 {self.nome} usa Resplendor Cósmico e cura todos os aliados em 20.")
-        return 0
-
-    def usar_especial(self, n: int, alvo: Optional[Entidade] = None,
-                      aliado: Optional[Personagem] = None,
-                      aliados: Optional[List[Personagem]] = None) -> int:
-        if n == 1 and aliados is not None: return self.esp_capitulo_final(aliados)
-        if n == 2 and aliado  is not None: return self.esp_semente_engatilhada(aliado)
-        if n == 3:                         return self.esp_ventos_revigorantes()
-        if n == 4 and alvo  is not None:   return self.esp_golpe_de_misericordia(alvo)
-        if n == 5 and alvo  is not None:   return self.esp_hemofagia(alvo)
-        if n == 6 and aliado is not None:  return self.esp_transfusao_vital(aliado)
-        if n == 7 and aliados is not None: return self.esp_resplendor_cosmico(aliados)
+        logger.info("🌟 %s usa Resplendor Cósmico e cura todos os aliados em 20.", self.nome)
         return 0
 
 # ========================== HELPERS PÚBLICOS ==============================
@@ -653,69 +571,14 @@ def custo_ataque_basico(p: Personagem) -> int:
     """Custo de mana do ataque básico (Mago=1; demais=0)."""
     return 1 if isinstance(p, Mago) else 0
 
-def _num_especiais_desbloqueadas(nivel: int) -> int:
-    """
-    7 especiais no total. Começa com 4 "originais" e ganha +1 nos níveis 2, 4 e 6.
-    """
-    count = 4
-    for marco in (2, 4, 6):
-        if nivel >= marco:
-            count += 1
-    return min(7, count)
-
-def especiais_do_personagem(p: Personagem, considerar_nivel: bool = True) -> List[tuple[int, str, int]]:
+@perfil.medir()
+def especiais_do_personagem(p: Personagem, considerar_nivel: bool = True) -> Sequence[tuple[int, str, int]]:
     """
     Retorna (id, nome, custo) das especiais — 7 por classe.
-    As 4 primeiras são as "originais", seguidas das 3 "anteriores".
+    As 4 primeiras são as "originais", seguidas das 3 desbloqueadas nos níveis 2, 4 e 6.
     """
-    base_por_classe: dict[str, List[tuple[int, str, int]]] = {
-        "Guerreiro": [
-            # 4 originais
-            (1, "Execução Pública", 7),
-            (2, "Perseverança", 0),
-            (3, "Golpe Trovejante", 1),
-            (4, "Lâmina Ínfera", 2),
-            # 3 anteriores
-            (5, "Duro na Queda", 0),
-            (6, "Determinação Mortal", 2),
-            (7, "Golpe Estilhaçador", 0),
-        ],
-        "Mago": [
-            (1, "Colapso Minguante", 15),
-            (2, "Descarnar", 20),
-            (3, "Distorção no Tempo", 0),
-            (4, "Empurrão Sísmico", 8),
-            (5, "Paradoxo", 3),
-            (6, "Eletrocussão", 2),
-            (7, "Explosão Florescente", 8),
-        ],
-        "Arqueiro": [
-            (1, "Curingas", 8),
-            (2, "Cortes Certeiros", 6),
-            (3, "Estilo do Caçador", 10),
-            (4, "Marca Fatal", 10),
-            (5, "Aljava da Ruína", 1),
-            (6, "Contaminar", 3),
-            (7, "Ás na Manga", 7),
-        ],
-        "Curandeiro": [
-            (1, "Capítulo Final", 3),
-            (2, "Semente Engatilhada", 5),
-            (3, "Ventos Revigorantes", 15),
-            (4, "Golpe de Misericórdia", 0),
-            (5, "Hemofagia", 4),
-            (6, "Transfusão Vital", 30),
-            (7, "Resplendor Cósmico", 15),
-        ],
-    }
-
-    chave = p.__class__.__name__
-    todos = base_por_classe.get(chave, [])
-    if not considerar_nivel:
-        return todos
-
-    n = getattr(p, "nivel", 1)
-    return todos[:_num_especiais_desbloqueadas(n)]
+    nivel = getattr(p, "nivel", 1) if considerar_nivel else None
+    return visao_habilidades(type(p), nivel).menu
 
 def preview_personagem(p: Personagem) -> dict[str, int]:
     """Dados principais para HUD/preview."""
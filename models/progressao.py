@@ -0,0 +1,62 @@
+from __future__ import annotations
+from math import isqrt
+from typing import NamedTuple
+
+from .habilidades import HABILIDADES
+
+"""
+Curva de XP e eventos de progressão
+- Custo do nível n para n+1: 100 * n  =>  XP acumulado até o nível n: 50 * n * (n - 1)
+- nivel_para_xp(total) resolve o nível em forma fechada (sem laço), então qualquer
+  ganho de XP — ou um "avançar até o nível N" — custa O(1)
+- ganhar_xp devolve EventoXP (estruturados); str(evento) é a mesma linha de texto de antes
+"""
+
+NIVEL_MAXIMO = 10
+
+# XP_ACUMULADO[n] = XP total (desde o nível 1) para chegar ao nível n
+XP_ACUMULADO: tuple[int, ...] = tuple(50 * n * (n - 1) for n in range(NIVEL_MAXIMO + 1))
+
+# Níveis em que uma especial nova é liberada (vem do registro de habilidades)
+NIVEIS_COM_HABILIDADE = frozenset(
+    h.nivel_minimo for habs in HABILIDADES.values() for h in habs if h.nivel_minimo > 1
+)
+
+# Progressão de atributos por nível ganho
+GANHO_POR_NIVEL = {"vida_max": 5, "ataque": 1, "defesa": 1, "mana": 5}
+
+
+def nivel_para_xp(total: int) -> int:
+    """Nível correspondente a 'total' de XP acumulado (limitado a NIVEL_MAXIMO)."""
+    m = max(0, int(total)) // 50            # n(n-1) <= total/50
+    return min(NIVEL_MAXIMO, (1 + isqrt(1 + 4 * m)) // 2)
+
+
+# Tipos de evento
+GANHO = "ganho"
+NIVEL = "nivel"
+STATUS = "status"
+MAXIMO = "maximo"
+
+
+class EventoXP(NamedTuple):
+    tipo: str
+    nivel: int
+    xp: int = 0
+    necessario: int = 0
+    qtd: int = 0
+
+    @property
+    def habilidade_nova(self) -> bool:
+        return self.tipo == NIVEL and self.nivel in NIVEIS_COM_HABILIDADE
+
+    def __str__(self) -> str:
+        if self.tipo == GANHO:
+            return f"Ganhou {self.qtd} XP. (Atual: {self.xp}/{self.necessario})"
+        if self.tipo == NIVEL:
+            if self.habilidade_nova:
+                return f"🎉 SUBIU PARA O NÍVEL {self.nivel}! Nova habilidade desbloqueada."
+            return f"🎉 SUBIU PARA O NÍVEL {self.nivel}!"
+        if self.tipo == STATUS:
+            return f"Status Pós-Nível: {self.xp}/{self.necessario} XP para o próximo."
+        return f"🏆 Nível Máximo ({NIVEL_MAXIMO}) atingido!"
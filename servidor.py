@@ -0,0 +1,262 @@
+from __future__ import annotations
+import argparse
+import asyncio
+import contextlib
+import json
+from dataclasses import asdict
+from typing import Any, Dict, Iterable, List, Optional
+
+from dado import TAMANHO_BUFFER_PADRAO, GeradorDados
+from models.inimigo import BOSS_HP_BY_DIFFICULTY, SCENARIO_PLAN
+from models.missao import Missao
+from models.personagem import (
+    ARQUETIPOS,
+    Personagem,
+    criar_personagem,
+    custo_ataque_basico,
+    especiais_do_personagem,
+    preview_personagem,
+)
+from utils.eventos import Evento
+from utils.logger import logger
+
+"""
+Servidor de jogo multi-sessão (asyncio, uma linha JSON por mensagem)
+- Cada conexão TCP tem a sua Sessao (o equivalente a um Jogo): personagem,
+  configuração da missão, inventário e combate em andamento
+- O combate usa a máquina de estados da missão (iniciar/step): nenhuma sessão
+  bloqueia em input(), então um processo atende muitos jogadores
+- Cada sessão tem seu fluxo de dados (filho da semente do servidor, com rolagens
+  pré-sorteadas em bloco; a sequência é a mesma sem buffer) e o log do jogo fica
+  mudo por conexão (logger.silenciar vale só na task dela)
+
+Protocolo (pedido -> resposta, uma linha JSON cada):
+    {"cmd": "criar", "nome": "Ana", "arquetipo": "Mago"}   -> {"ok": true, "heroi": {...}}
+    {"cmd": "configurar", "cenario": "Trilha", "dificuldade": "Fácil"}
+    {"cmd": "iniciar"}                                      -> {"ok": true, "eventos": [...], "estado": {...}}
+    {"cmd": "acao", "acao": "2"}                            -> idem; no fim também "resultado"
+    {"cmd": "status"} | {"cmd": "inventario"} | {"cmd": "ajuda"} | {"cmd": "sair"}
+Erros: {"ok": false, "erro": "..."}
+
+Uso:
+    python servidor.py --porta 8765 --semente 42
+    python cliente.py --porta 8765
+"""
+
+PORTA_PADRAO = 8765
+
+
+class ErroProtocolo(ValueError):
+    """Pedido inválido do cliente (vira {"ok": false, "erro": ...})."""
+
+
+def _escolher(valor: Any, opcoes: Iterable[str], campo: str) -> str:
+    """Casa 'valor' com uma das opções, sem diferenciar maiúsculas."""
+    for opcao in opcoes:
+        if isinstance(valor, str) and valor.strip().lower() == opcao.lower():
+            return opcao
+    raise ErroProtocolo(f"{campo} inválido: {valor!r} (opções: {', '.join(opcoes)})")
+
+
+class Sessao:
+    """Estado de um jogador: o que o Jogo guarda, sem menus nem input()/print()."""
+
+    COMANDOS = ("criar", "configurar", "status", "iniciar", "acao", "inventario", "ajuda", "sair")
+
+    def __init__(self, rng: GeradorDados):
+        self.rng = rng
+        self.personagem: Dict[str, Optional[str]] = {"nome": None, "arquetipo": None}
+        self.missao_config: Dict[str, Any] = {"dificuldade": None, "cenario": None, "missao": None}
+        self.heroi: Optional[Personagem] = None
+        self.missao: Optional[Missao] = None
+
+    def tratar(self, pedido: Dict[str, Any]) -> Dict[str, Any]:
+        cmd = pedido.get("cmd")
+        if cmd not in self.COMANDOS:
+            raise ErroProtocolo(f"Comando desconhecido: {cmd!r} (use 'ajuda')")
+        return getattr(self, f"cmd_{cmd}")(pedido)
+
+    # ---------------- comandos ----------------
+    def cmd_ajuda(self, pedido: Dict[str, Any]) -> Dict[str, Any]:
+        return {"comandos": list(self.COMANDOS), "arquetipos": list(ARQUETIPOS),
+                "cenarios": list(SCENARIO_PLAN), "dificuldades": list(BOSS_HP_BY_DIFFICULTY)}
+
+    def cmd_criar(self, pedido: Dict[str, Any]) -> Dict[str, Any]:
+        self._fora_de_combate()
+        nome = str(pedido.get("nome") or "").strip()
+        if not nome:
+            raise ErroProtocolo("Informe o nome do personagem.")
+        arquetipo = _escolher(pedido.get("arquetipo"), ARQUETIPOS, "arquetipo")
+        self.personagem = {"nome": nome, "arquetipo": arquetipo}
+        self.heroi = criar_personagem(arquetipo, nome)
+        return {"heroi": self._heroi()}
+
+    def cmd_configurar(self, pedido: Dict[str, Any]) -> Dict[str, Any]:
+        self._fora_de_combate()
+        if "cenario" in pedido:
+            self.missao_config["cenario"] = _escolher(pedido["cenario"], SCENARIO_PLAN, "cenario")
+        if "dificuldade" in pedido:
+            self.missao_config["dificuldade"] = _escolher(pedido["dificuldade"], BOSS_HP_BY_DIFFICULTY, "dificuldade")
+        if "missao" in pedido:
+            missao = pedido["missao"]
+            self.missao_config["missao"] = {"nome": missao} if isinstance(missao, str) else missao
+        return {"missao_config": dict(self.missao_config)}
+
+    def cmd_status(self, pedido: Dict[str, Any]) -> Dict[str, Any]:
+        return {"personagem": dict(self.personagem), "missao_config": dict(self.missao_config),
+                "heroi": self._heroi(), "estado": self._estado()}
+
+    def cmd_inventario(self, pedido: Dict[str, Any]) -> Dict[str, Any]:
+        itens = self.heroi.inventario.itens if self.heroi is not None else []
+        return {"itens": [{"nome": i.nome, "tipo": i.tipo, "valor": i.valor, "raridade": i.raridade,
+                           "dano": i.dano, "defesa": i.defesa, **i.extra} for i in itens]}
+
+    def cmd_iniciar(self, pedido: Dict[str, Any]) -> Dict[str, Any]:
+        self._fora_de_combate()
+        if self.heroi is None:
+            raise ErroProtocolo("Crie um personagem antes de iniciar uma missão ('criar').")
+        cenario, dificuldade = self.missao_config["cenario"], self.missao_config["dificuldade"]
+        if not cenario or not dificuldade:
+            raise ErroProtocolo("Defina cenário e dificuldade antes ('configurar').")
+        self.missao = Missao(inimigo=None, heroi=self.heroi, cenario=cenario, dificuldade=dificuldade,
+                             missao=self.missao_config["missao"], rng=self.rng.filho())
+        self.missao.verboso = False
+        return self._passo(self.missao.iniciar())
+
+    def cmd_acao(self, pedido: Dict[str, Any]) -> Dict[str, Any]:
+        if self.missao is None:
+            raise ErroProtocolo("Nenhum combate em andamento ('iniciar').")
+        return self._passo(self.missao.step(str(pedido.get("acao", "")).strip()))
+
+    def cmd_sair(self, pedido: Dict[str, Any]) -> Dict[str, Any]:
+        return {"fim": True}
+
+    # ---------------- respostas ----------------
+    def _fora_de_combate(self) -> None:
+        if self.missao is not None:
+            raise ErroProtocolo("Há um combate em andamento: envie 'acao'.")
+
+    def _heroi(self) -> Optional[Dict[str, Any]]:
+        if self.heroi is None:
+            return None
+        return {"nome": self.heroi.nome, "arquetipo": type(self.heroi).__name__,
+                "nivel": self.heroi.nivel, "xp": self.heroi.xp, **preview_personagem(self.heroi)}
+
+    def _estado(self) -> Optional[Dict[str, Any]]:
+        """HUD do turno: vidas, mana e ações (com custo e se há mana)."""
+        if self.missao is None or self.missao.encontro is None:
+            return None
+        encontro, heroi = self.missao.encontro, self.heroi
+        inimigo = encontro.inimigo
+        mana = getattr(heroi._atrib, "mana", 0)
+        custo_basico = custo_ataque_basico(heroi)
+        acoes = [{"acao": "1", "nome": "Ataque básico", "custo": custo_basico, "disponivel": mana >= custo_basico}]
+        for n, (_id, nome, custo) in enumerate(especiais_do_personagem(heroi, considerar_nivel=True), start=2):
+            acoes.append({"acao": str(n), "nome": nome, "custo": custo, "disponivel": mana >= custo})
+        acoes.append({"acao": "0", "nome": "Fugir", "custo": 0, "disponivel": True})
+        return {
+            "encontro": encontro.indice, "total": encontro.total, "turno": encontro.turno,
+            "heroi": {"vida": heroi._atrib.vida, "vida_max": heroi._atrib.vida_max, "mana": mana},
+            "inimigo": {"nome": inimigo.nome, "vida": inimigo._atrib.vida, "vida_max": inimigo._atrib.vida_max},
+            "acoes": acoes,
+        }
+
+    def _passo(self, eventos: List[Evento]) -> Dict[str, Any]:
+        resposta: Dict[str, Any] = {"eventos": [e.como_dict() for e in eventos], "estado": self._estado()}
+        resultado = self.missao.resultado
+        if resultado is not None:
+            resposta["resultado"] = asdict(resultado)
+            resposta["estado"] = None
+            self.missao = None
+            # Mesmo padrão do Jogo (roguelike): herói morto precisa ser recriado
+            if not self.heroi.esta_vivo():
+                resposta["heroi_morreu"] = True
+                self.heroi = None
+        return resposta
+
+
+class Servidor:
+    """Aceita conexões e dá a cada uma a sua Sessao."""
+
+    def __init__(self, semente: Optional[int] = None, verboso: bool = False,
+                 buffer_dados: int = TAMANHO_BUFFER_PADRAO):
+        self.rng = GeradorDados(semente, buffer=buffer_dados)   # os filhos herdam o buffer
+        self.verboso = verboso
+        self.conexoes = 0
+
+    def responder(self, sessao: Sessao, linha: bytes) -> Dict[str, Any]:
+        try:
+            pedido = json.loads(linha)
+            if not isinstance(pedido, dict):
+                raise ErroProtocolo("O pedido deve ser um objeto JSON.")
+            return {"ok": True, **sessao.tratar(pedido)}
+        except json.JSONDecodeError:
+            return {"ok": False, "erro": "JSON inválido."}
+        except (ErroProtocolo, RuntimeError) as e:
+            return {"ok": False, "erro": str(e)}
+        except Exception as e:          # não derruba a conexão nem as outras sessões
+            logger.error("❌ Erro ao tratar pedido: %s", e)
+            return {"ok": False, "erro": "Erro interno."}
+
+    async def atender(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        endereco = writer.get_extra_info("peername")
+        sessao = Sessao(self.rng.filho())
+        self.conexoes += 1
+        logger.info("🔌 Sessão aberta: %s (%s ativas)", endereco, self.conexoes)
+        try:
+            with contextlib.ExitStack() as pilha:
+                if not self.verboso:
+                    pilha.enter_context(logger.silenciar())
+                while True:
+                    try:
+                        linha = await reader.readline()
+                    except (asyncio.LimitOverrunError, ValueError):
+                        writer.write(b'{"ok": false, "erro": "Linha longa demais."}\n')
+                        break
+                    if not linha:
+                        break
+                    if not linha.strip():
+                        continue
+                    resposta = self.responder(sessao, linha)
+                    writer.write(json.dumps(resposta, ensure_ascii=False).encode("utf-8") + b"\n")
+                    await writer.drain()
+                    if resposta.get("fim"):
+                        break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self.conexoes -= 1
+            logger.info("🔌 Sessão encerrada: %s (%s ativas)", endereco, self.conexoes)
+            writer.close()
+            with contextlib.suppress(ConnectionError):
+                await writer.wait_closed()
+
+
+async def servir(host: str = "127.0.0.1", porta: int = PORTA_PADRAO, semente: Optional[int] = None,
+                 verboso: bool = False, buffer_dados: int = TAMANHO_BUFFER_PADRAO) -> None:
+    servidor = Servidor(semente, verboso, buffer_dados)
+    tcp = await asyncio.start_server(servidor.atender, host, porta)
+    enderecos = ", ".join(str(s.getsockname()) for s in tcp.sockets)
+    logger.info("🛰️ Servidor ouvindo em %s (semente %s, buffer de dados %s)",
+                enderecos, servidor.rng.semente, servidor.rng.buffer)
+    async with tcp:
+        await tcp.serve_forever()
+
+
+def main(argv: List[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Servidor de jogo multi-sessão (JSON por linha).")
+    parser.add_argument("--host", default="127.0.0.1", help="endereço (padrão: 127.0.0.1)")
+    parser.add_argument("--porta", type=int, default=PORTA_PADRAO, help=f"porta TCP (padrão: {PORTA_PADRAO})")
+    parser.add_argument("--semente", type=int, default=None, help="semente-mãe das sessões")
+    parser.add_argument("--verboso", action="store_true", help="mostra o log do jogo de todas as sessões")
+    parser.add_argument("--buffer-dados", type=int, default=TAMANHO_BUFFER_PADRAO,
+                        help=f"rolagens pré-sorteadas por sessão (0 desliga; padrão: {TAMANHO_BUFFER_PADRAO})")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(servir(args.host, args.porta, args.semente, args.verboso, args.buffer_dados))
+    except KeyboardInterrupt:
+        print("\nServidor encerrado.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,265 @@
+from __future__ import annotations
+import copy
+import json
+import os
+import threading
+import time
+from collections.abc import Mapping
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+
+from utils import codec_save
+from utils.logger import logger
+
+"""
+Gravação segura de saves + autosave em segundo plano
+- gravar_atomico: temporário na mesma pasta + fsync + os.replace (uma queda no
+  meio da escrita nunca deixa o save pela metade)
+- Autosave: agendar() só tira um snapshot do estado e retorna; uma thread de
+  fundo codifica e grava. Pedidos em rajada para o mesmo arquivo viram uma escrita.
+- Saves incrementais: agendar_delta() anexa só os campos alterados num diário
+  (<save>.diario, JSONL); a cada N deltas o diário é compactado num save completo.
+- Todo save completo passa por substituir_save: o diário some ANTES do snapshot
+  novo entrar, então deltas velhos nunca são reaplicados sobre um save mais novo.
+"""
+
+EXTENSAO_DIARIO = ".diario"
+
+
+def codificar_save(caminho: str, dados: Dict[str, Any]) -> bytes:
+    """Bytes do save no formato indicado pela extensão (.json legível, senão .sav)."""
+    if caminho.endswith(".json"):
+        return json.dumps(dados, indent=4, ensure_ascii=False).encode("utf-8")
+    return codec_save.codificar(dados)
+
+
+def ler_save(caminho: str) -> Mapping[str, Any]:
+    """Lê um save .sav (seções sob demanda) ou .json, detectando o formato pelo conteúdo."""
+    with open(caminho, "rb") as f:
+        conteudo = f.read()
+    if codec_save.eh_binario(conteudo):
+        return codec_save.SaveLazy(conteudo)
+    return json.loads(conteudo.decode("utf-8"))
+
+
+def gravar_atomico(caminho: str, conteudo: bytes) -> None:
+    pasta = os.path.dirname(os.path.abspath(caminho))
+    temp = os.path.join(pasta, f".{os.path.basename(caminho)}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        with open(temp, "wb") as f:
+            f.write(conteudo)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp, caminho)
+    except BaseException:
+        if os.path.exists(temp):
+            os.remove(temp)
+        raise
+    # garante que a troca de nome também foi para o disco (POSIX)
+    _fsync_pasta(pasta)
+
+
+def _fsync_pasta(pasta: str) -> None:
+    if hasattr(os, "O_DIRECTORY"):
+        fd = os.open(pasta, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+
+def substituir_save(caminho: str, conteudo: bytes) -> None:
+    """
+    Grava um save completo em 'caminho' descartando antes o diário dele.
+    Os deltas guardam valores absolutos: se sobrevivessem ao snapshot novo, o
+    carregamento voltaria campos para valores antigos. Uma queda entre as duas
+    etapas só perde os deltas (o save antigo continua íntegro).
+    """
+    diario = caminho + EXTENSAO_DIARIO
+    if os.path.exists(diario):
+        os.remove(diario)
+        _fsync_pasta(os.path.dirname(os.path.abspath(caminho)))
+    gravar_atomico(caminho, conteudo)
+
+
+# ============================================================
+#  DIÁRIO DE DELTAS
+# ============================================================
+
+def mesclar_delta(destino: Dict[str, Any], delta: Dict[str, Any]) -> Dict[str, Any]:
+    """Aplica 'delta' sobre 'destino' (save completo ou outro delta) e devolve 'destino'."""
+    for chave, valor in delta.items():
+        if chave == "heroi_stats" and isinstance(valor, dict) and isinstance(destino.get(chave), dict):
+            stats = destino[chave]
+            for campo, v in valor.items():
+                if campo == "atributos":
+                    stats.setdefault("atributos", {}).update(v)
+                else:
+                    stats[campo] = v        # nivel, xp, efeitos (efeitos vêm inteiros)
+        else:
+            destino[chave] = valor
+    return destino
+
+
+def ler_diario(caminho: str) -> Iterator[Dict[str, Any]]:
+    """Deltas do diário de 'caminho' em ordem (ignora uma última linha truncada)."""
+    try:
+        f = open(caminho + EXTENSAO_DIARIO, "r", encoding="utf-8")
+    except FileNotFoundError:
+        return
+    with f:
+        for linha in f:
+            try:
+                yield json.loads(linha)["delta"]
+            except (ValueError, KeyError):
+                return
+
+
+def aplicar_diario(caminho: str, dados: Mapping[str, Any]) -> Dict[str, Any]:
+    """Save completo lido de 'caminho' + deltas do diário ao lado dele (se houver)."""
+    base = dict(dados)
+    for delta in ler_diario(caminho):
+        mesclar_delta(base, copy.deepcopy(delta))
+    return base
+
+
+class DiarioSave:
+    """
+    Save completo + diário de deltas ao lado (<caminho>.diario).
+    Mantém em memória o estado consolidado para compactar sem reler o disco.
+    """
+
+    def __init__(self, caminho: str, compactar_a_cada: int = 50):
+        self.caminho = caminho
+        self.caminho_diario = caminho + EXTENSAO_DIARIO
+        self.compactar_a_cada = max(1, int(compactar_a_cada))
+        self.base: Optional[Dict[str, Any]] = None
+        self.deltas = 0
+
+    def gravar_completo(self, dados: Dict[str, Any]) -> int:
+        conteudo = codificar_save(self.caminho, dados)
+        substituir_save(self.caminho, conteudo)
+        self.base = dados
+        self.deltas = 0
+        return len(conteudo)
+
+    def anexar(self, delta: Dict[str, Any]) -> int:
+        """Grava o delta no diário (compacta se chegou a hora). Retorna bytes escritos."""
+        if self.base is None:
+            raise RuntimeError("Diário sem save completo de base")
+        linha = json.dumps({"t": time.time(), "delta": delta}, ensure_ascii=False) + "\n"
+        with open(self.caminho_diario, "a", encoding="utf-8") as f:
+            f.write(linha)
+            f.flush()
+            os.fsync(f.fileno())
+        mesclar_delta(self.base, delta)
+        self.deltas += 1
+        if self.deltas >= self.compactar_a_cada:
+            return self.compactar()
+        return len(linha)
+
+    def compactar(self) -> int:
+        """Dobra o diário num save completo novo e apaga o diário."""
+        logger.debug("🗜️ Compactando diário de %s (%s deltas)", self.caminho, self.deltas)
+        return self.gravar_completo(self.base)
+
+
+# ============================================================
+#  SERVIÇO DE AUTOSAVE
+# ============================================================
+
+class Autosave:
+    """
+    Serviço de autosave com uma thread de fundo.
+    - atraso: janela (s) para juntar pedidos seguidos numa única gravação
+    - ao_gravar(caminho, dados, tamanho): chamado após cada escrita (ex.: manifesto),
+      com o estado consolidado mesmo quando só um delta foi gravado
+    - compactar_a_cada: deltas no diário antes de reescrever o save completo
+    """
+
+    def __init__(self, atraso: float = 0.5,
+                 ao_gravar: Optional[Callable[[str, Dict[str, Any], Optional[int]], None]] = None,
+                 compactar_a_cada: int = 50):
+        self.atraso = max(0.0, float(atraso))
+        self.ao_gravar = ao_gravar
+        self.compactar_a_cada = compactar_a_cada
+        # caminho -> (completo?, snapshot/delta acumulado)
+        self._pendentes: Dict[str, Tuple[bool, Dict[str, Any]]] = {}
+        self._diarios: Dict[str, DiarioSave] = {}
+        self._cond = threading.Condition()
+        self._gravando = False
+        self._parar = False
+        self.gravacoes = 0
+        self.pedidos = 0
+        self._thread = threading.Thread(target=self._laco, name="autosave", daemon=True)
+        self._thread.start()
+
+    def agendar(self, caminho: str, dados: Dict[str, Any]) -> None:
+        """Registra o estado para gravação; retorna na hora (o snapshot é copiado aqui)."""
+        snapshot = copy.deepcopy(dados)
+        with self._cond:
+            self._pendentes[caminho] = (True, snapshot)
+            self.pedidos += 1
+            self._cond.notify_all()
+
+    def agendar_delta(self, caminho: str, delta: Dict[str, Any]) -> None:
+        """Como agendar(), mas só com os campos alterados; deltas em rajada são mesclados."""
+        delta = copy.deepcopy(delta)
+        with self._cond:
+            pendente = self._pendentes.get(caminho)
+            if pendente is None:
+                self._pendentes[caminho] = (False, delta)
+            else:
+                mesclar_delta(pendente[1], delta)
+            self.pedidos += 1
+            self._cond.notify_all()
+
+    def _laco(self) -> None:
+        while True:
+            with self._cond:
+                while not self._pendentes and not self._parar:
+                    self._cond.wait()
+                if not self._pendentes and self._parar:
+                    return
+            # janela de coalescência: novos pedidos só substituem o snapshot
+            if self.atraso and not self._parar:
+                time.sleep(self.atraso)
+            with self._cond:
+                lote, self._pendentes = self._pendentes, {}
+                self._gravando = True
+            try:
+                for caminho, (completo, dados) in lote.items():
+                    self._gravar(caminho, completo, dados)
+            finally:
+                with self._cond:
+                    self._gravando = False
+                    self._cond.notify_all()
+
+    def _gravar(self, caminho: str, completo: bool, dados: Dict[str, Any]) -> None:
+        try:
+            diario = self._diarios.get(caminho)
+            if diario is None:
+                diario = self._diarios[caminho] = DiarioSave(caminho, self.compactar_a_cada)
+            if completo or diario.base is None:
+                if not completo:    # delta sem base em memória: parte do que está no disco
+                    dados = mesclar_delta(aplicar_diario(caminho, ler_save(caminho)), dados)
+                tamanho = diario.gravar_completo(dados)
+            else:
+                diario.anexar(dados)
+                tamanho = None      # o manifesto mede o arquivo
+            self.gravacoes += 1
+            if self.ao_gravar is not None:
+                self.ao_gravar(caminho, diario.base, tamanho)
+            logger.debug("💾 Autosave gravado: %s (%s)", caminho, "completo" if tamanho is not None else "delta")
+        except Exception as error:
+            logger.error("❌ Erro no autosave de %s: %s", caminho, error)
+
+    def esperar(self, timeout: float | None = None) -> bool:
+        """Bloqueia até não haver nada pendente (ex.: antes de sair do jogo)."""
+        with self._cond:
+            return self._cond.wait_for(lambda: not self._pendentes and not self._gravando, timeout)
+
+    def parar(self) -> None:
+        with self._cond:
+            self._parar = True
+            self._cond.notify_all()
+        self._thread.join(timeout=10)
@@ -0,0 +1,370 @@
+from __future__ import annotations
+import json
+import struct
+import time
+import zlib
+from collections.abc import Mapping
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+from models.inventario import Item
+
+"""
+Formato binário compacto de save (.sav)
+- Cabeçalho: mágico "RPGS" + versão + flags
+- v2: resumo de tamanho fixo (herói, classe, nível, XP, data) logo após o
+  cabeçalho — ler_resumo() lê só esses bytes, sem tocar no corpo
+- Corpo em seções independentes (personagem/missão, herói, inventário), cada
+  uma com zlib opcional e decodificada só quando for acessada (SaveLazy)
+- Inventário como (id no catálogo Item.items, quantidade) em sequências
+  consecutivas; itens fora do catálogo (ou alterados) vão como JSON
+O save JSON (indent=4) continua sendo o formato de exportação legível.
+
+Atenção: o id é a posição em Item.items — novos itens só devem entrar no FIM da lista.
+"""
+
+MAGICO = b"RPGS"
+VERSAO = 2
+FLAG_ZLIB = 0x01
+
+_CABECALHO = struct.Struct("<4sBB")      # mágico, versão, flags (v1: zlib no corpo todo)
+_RESUMO = struct.Struct("<48s24sHIdB")   # v2: nome, classe, nível, xp, timestamp, nº de seções
+_SECAO = struct.Struct("<BBII")          # v2: id, flags, offset, tamanho
+_TEXTO = struct.Struct("<H")             # tamanho da string (0xFFFF = None)
+_HEROI = struct.Struct("<HI6i")          # nível, xp, vida, vida_max, mana, ataque, defesa, ataque_magico
+_SEQUENCIA = struct.Struct("<HH")        # id do catálogo (0xFFFF = item avulso), quantidade
+_CONTAGEM = struct.Struct("<H")
+
+SECAO_PERSONAGEM = 1    # personagem + missao_config
+SECAO_HEROI = 2
+SECAO_INVENTARIO = 3
+
+_NULO = 0xFFFF
+_AVULSO = 0xFFFF
+_ATRIBUTOS = ("vida", "vida_max", "mana", "ataque", "defesa", "ataque_magico")
+_CAMPOS_CATALOGO = ("tipo", "valor", "raridade", "dano", "defesa")
+
+# nome -> id no catálogo (montado no primeiro uso)
+_IDS: Dict[str, int] = {}
+
+
+class ResumoSave(NamedTuple):
+    nome: Optional[str]
+    classe: Optional[str]
+    nivel: int
+    xp: int
+    timestamp: float
+    versao: int
+
+
+def _id_no_catalogo(item: Dict[str, Any]) -> Optional[int]:
+    """Id do item em Item.items se ele for idêntico ao do catálogo; senão None."""
+    if not _IDS:
+        for i, base in enumerate(Item.items):
+            _IDS.setdefault(base["nome"], i)
+    i = _IDS.get(item.get("nome"))
+    if i is None:
+        return None
+    base = Item.items[i]
+    if any(item.get(c) != base.get(c) for c in _CAMPOS_CATALOGO):
+        return None
+    if item.get("cura") is not None and item.get("cura") != base.get("cura"):
+        return None
+    return i
+
+
+# ============================================================
+#  ESCRITA
+# ============================================================
+
+def _texto(partes: List[bytes], valor: Optional[str]) -> None:
+    if valor is None:
+        partes.append(_TEXTO.pack(_NULO))
+        return
+    b = str(valor).encode("utf-8")
+    if len(b) >= _NULO:
+        raise ValueError("Texto grande demais para o save binário")
+    partes.append(_TEXTO.pack(len(b)))
+    partes.append(b)
+
+
+def _fixo(valor: Optional[str], tamanho: int) -> bytes:
+    """Texto cortado para caber no resumo (sem quebrar um caractere UTF-8 no meio)."""
+    b = (valor or "").encode("utf-8")[:tamanho]
+    return b.decode("utf-8", "ignore").encode("utf-8")
+
+
+def _sequencias(inventario: List[Any]) -> List[Tuple[Optional[int], Any, int]]:
+    """Agrupa itens iguais consecutivos: [(id ou None, item, quantidade), ...] (ordem preservada)."""
+    saida: List[Tuple[Optional[int], Any, int]] = []
+    for it in inventario:
+        if not isinstance(it, dict):
+            it = {"nome": str(it)}
+        i = _id_no_catalogo(it)
+        if i is not None and saida and saida[-1][0] == i and saida[-1][2] < 0xFFFF:
+            saida[-1] = (i, it, saida[-1][2] + 1)
+        else:
+            saida.append((i, it, 1))
+    return saida
+
+
+def _secao_personagem(dados: Dict[str, Any]) -> bytes:
+    partes: List[bytes] = []
+    pers = dados.get("personagem") or {}
+    _texto(partes, pers.get("nome"))
+    _texto(partes, pers.get("arquetipo"))
+    cfg = dados.get("missao_config") or {}
+    _texto(partes, cfg.get("dificuldade"))
+    _texto(partes, cfg.get("cenario"))
+    missao = cfg.get("missao")
+    _texto(partes, None if missao is None else json.dumps(missao, ensure_ascii=False))
+    return b"".join(partes)
+
+
+def _secao_heroi(dados: Dict[str, Any]) -> bytes:
+    stats = dados.get("heroi_stats")
+    if not stats:
+        return b"\x00"
+    atrib = stats.get("atributos") or {}
+    corpo = _HEROI.pack(int(stats.get("nivel") or 1), int(stats.get("xp") or 0),
+                        *(int(atrib.get(c) or 0) for c in _ATRIBUTOS))
+    efeitos = stats.get("efeitos")
+    if not efeitos:
+        return b"\x01" + corpo
+    partes = [b"\x02", corpo]      # 2 = stats + efeitos ativos (JSON)
+    _texto(partes, json.dumps(efeitos, ensure_ascii=False))
+    return b"".join(partes)
+
+
+def _secao_inventario(dados: Dict[str, Any]) -> bytes:
+    seqs = _sequencias(dados.get("inventario") or [])
+    partes: List[bytes] = [_CONTAGEM.pack(len(seqs))]
+    for i, it, qtd in seqs:
+        if i is None:
+            partes.append(_SEQUENCIA.pack(_AVULSO, 1))
+            _texto(partes, json.dumps(it, ensure_ascii=False))
+        else:
+            partes.append(_SEQUENCIA.pack(i, qtd))
+    return b"".join(partes)
+
+
+def codificar(dados: Dict[str, Any], comprimir: bool = True, timestamp: float | None = None) -> bytes:
+    """Dict do save (ver Jogo._montar_dados) -> bytes no formato .sav (v2)."""
+    secoes = [
+        (SECAO_PERSONAGEM, _secao_personagem(dados)),
+        (SECAO_HEROI, _secao_heroi(dados)),
+        (SECAO_INVENTARIO, _secao_inventario(dados)),
+    ]
+    pers = dados.get("personagem") or {}
+    stats = dados.get("heroi_stats") or {}
+    resumo = _RESUMO.pack(
+        _fixo(pers.get("nome"), 48), _fixo(pers.get("arquetipo"), 24),
+        int(stats.get("nivel") or 1), int(stats.get("xp") or 0),
+        time.time() if timestamp is None else float(timestamp), len(secoes),
+    )
+
+    offset = _CABECALHO.size + _RESUMO.size + _SECAO.size * len(secoes)
+    tabela: List[bytes] = []
+    corpos: List[bytes] = []
+    for ident, corpo in secoes:
+        flags = 0
+        if comprimir:
+            comprimido = zlib.compress(corpo, 9)
+            if len(comprimido) < len(corpo):    # seções pequenas ficam maiores com zlib
+                corpo, flags = comprimido, FLAG_ZLIB
+        tabela.append(_SECAO.pack(ident, flags, offset, len(corpo)))
+        corpos.append(corpo)
+        offset += len(corpo)
+    return b"".join([_CABECALHO.pack(MAGICO, VERSAO, 0), resumo, *tabela, *corpos])
+
+
+# ============================================================
+#  LEITURA
+# ============================================================
+
+class _Leitor:
+    __slots__ = ("buf", "pos")
+
+    def __init__(self, buf: bytes):
+        self.buf = buf
+        self.pos = 0
+
+    def struct(self, s: struct.Struct) -> Tuple[Any, ...]:
+        valores = s.unpack_from(self.buf, self.pos)
+        self.pos += s.size
+        return valores
+
+    def texto(self) -> Optional[str]:
+        (n,) = self.struct(_TEXTO)
+        if n == _NULO:
+            return None
+        b = self.buf[self.pos:self.pos + n]
+        self.pos += n
+        return b.decode("utf-8")
+
+    def byte(self) -> int:
+        b = self.buf[self.pos]
+        self.pos += 1
+        return b
+
+
+def _ler_personagem(r: _Leitor) -> Dict[str, Any]:
+    personagem = {"nome": r.texto(), "arquetipo": r.texto()}
+    dificuldade, cenario, missao = r.texto(), r.texto(), r.texto()
+    return {
+        "personagem": personagem,
+        "missao_config": {
+            "dificuldade": dificuldade,
+            "cenario": cenario,
+            "missao": None if missao is None else json.loads(missao),
+        },
+    }
+
+
+def _ler_heroi(r: _Leitor) -> Dict[str, Any]:
+    marca = r.byte()
+    if not marca:
+        return {"heroi_stats": None}
+    nivel, xp, *valores = r.struct(_HEROI)
+    stats = {"nivel": nivel, "xp": xp, "atributos": dict(zip(_ATRIBUTOS, valores))}
+    if marca == 2:
+        stats["efeitos"] = json.loads(r.texto() or "{}")
+    return {"heroi_stats": stats}
+
+
+def _ler_inventario(r: _Leitor) -> Dict[str, Any]:
+    inventario: List[Dict[str, Any]] = []
+    (n,) = r.struct(_CONTAGEM)
+    for _ in range(n):
+        i, qtd = r.struct(_SEQUENCIA)
+        if i == _AVULSO:
+            inventario.append(json.loads(r.texto() or "{}"))
+        else:
+            inventario.extend(dict(Item.items[i]) for _ in range(qtd))
+    return {"inventario": inventario}
+
+
+_LEITORES: Dict[int, Callable[[_Leitor], Dict[str, Any]]] = {
+    SECAO_PERSONAGEM: _ler_personagem,
+    SECAO_HEROI: _ler_heroi,
+    SECAO_INVENTARIO: _ler_inventario,
+}
+_SECAO_DA_CHAVE = {
+    "personagem": SECAO_PERSONAGEM,
+    "missao_config": SECAO_PERSONAGEM,
+    "heroi_stats": SECAO_HEROI,
+    "inventario": SECAO_INVENTARIO,
+}
+
+
+def eh_binario(conteudo: bytes) -> bool:
+    return conteudo[:4] == MAGICO
+
+
+def _versao(conteudo: bytes) -> Tuple[int, int]:
+    if len(conteudo) < _CABECALHO.size or not eh_binario(conteudo):
+        raise ValueError("Arquivo não é um save binário")
+    _, versao, flags = _CABECALHO.unpack_from(conteudo, 0)
+    if versao not in (1, VERSAO):
+        raise ValueError(f"Versão de save não suportada: {versao}")
+    return versao, flags
+
+
+class SaveLazy(Mapping):
+    """
+    Save aberto sem decodificar o corpo: .resumo vem do cabeçalho e cada seção
+    (personagem/missão, herói, inventário) só é lida no primeiro acesso.
+    Funciona como o dict do save (dados["inventario"], dados.get(...)).
+    """
+
+    def __init__(self, conteudo: bytes):
+        versao, flags = _versao(conteudo)
+        self.versao = versao
+        self._conteudo = conteudo
+        self._valores: Dict[str, Any] = {}
+        self._secoes: Dict[int, Tuple[int, int, int]] = {}     # id -> (flags, offset, tamanho)
+        if versao == 1:
+            # v1: corpo único, sem resumo — decodifica tudo de uma vez
+            corpo = conteudo[_CABECALHO.size:]
+            if flags & FLAG_ZLIB:
+                corpo = zlib.decompress(corpo)
+            r = _Leitor(corpo)
+            for ident in (SECAO_PERSONAGEM, SECAO_HEROI, SECAO_INVENTARIO):
+                self._valores.update(_LEITORES[ident](r))
+            stats = self._valores["heroi_stats"] or {}
+            pers = self._valores["personagem"]
+            self.resumo = ResumoSave(pers["nome"], pers["arquetipo"], stats.get("nivel", 1),
+                                     stats.get("xp", 0), 0.0, 1)
+            return
+        self.resumo = _resumo_v2(conteudo)
+        pos = _CABECALHO.size + _RESUMO.size
+        for _ in range(conteudo[pos - 1]):
+            ident, fl, offset, tamanho = _SECAO.unpack_from(conteudo, pos)
+            self._secoes[ident] = (fl, offset, tamanho)
+            pos += _SECAO.size
+
+    def _decodificar_secao(self, ident: int) -> None:
+        fl, offset, tamanho = self._secoes[ident]
+        corpo = self._conteudo[offset:offset + tamanho]
+        if fl & FLAG_ZLIB:
+            corpo = zlib.decompress(corpo)
+        self._valores.update(_LEITORES[ident](_Leitor(corpo)))
+
+    def __getitem__(self, chave: str) -> Any:
+        if chave not in self._valores:
+            ident = _SECAO_DA_CHAVE[chave]
+            if ident not in self._secoes:
+                raise KeyError(chave)
+            self._decodificar_secao(ident)
+        return self._valores[chave]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(_SECAO_DA_CHAVE)
+
+    def __len__(self) -> int:
+        return len(_SECAO_DA_CHAVE)
+
+    def como_dict(self) -> Dict[str, Any]:
+        return {chave: self[chave] for chave in self}
+
+
+def _resumo_v2(conteudo: bytes) -> ResumoSave:
+    nome, classe, nivel, xp, timestamp, _ = _RESUMO.unpack_from(conteudo, _CABECALHO.size)
+    nome = nome.rstrip(b"\x00").decode("utf-8") or None
+    classe = classe.rstrip(b"\x00").decode("utf-8") or None
+    return ResumoSave(nome, classe, nivel, xp, timestamp, 2)
+
+
+def decodificar(conteudo: bytes) -> Dict[str, Any]:
+    """Bytes .sav -> dict do save (mesmo formato do JSON), decodificando tudo."""
+    return SaveLazy(conteudo).como_dict()
+
+
+def abrir(caminho: str) -> SaveLazy:
+    """Abre o save sem decodificar as seções (ver SaveLazy)."""
+    with open(caminho, "rb") as f:
+        return SaveLazy(f.read())
+
+
+def ler_resumo(caminho: str) -> ResumoSave:
+    """Herói, classe, nível, XP e data lendo só o cabeçalho (saves v1 são lidos inteiros)."""
+    with open(caminho, "rb") as f:
+        inicio = f.read(_CABECALHO.size + _RESUMO.size)
+        versao, _ = _versao(inicio)
+        if versao == 1:
+            return SaveLazy(inicio + f.read()).resumo
+    if len(inicio) < _CABECALHO.size + _RESUMO.size:
+        raise ValueError("Save binário truncado")
+    return _resumo_v2(inicio)
+
+
+def salvar(caminho: str, dados: Dict[str, Any], comprimir: bool = True) -> int:
+    """Grava o save binário; retorna o tamanho em bytes."""
+    conteudo = codificar(dados, comprimir)
+    with open(caminho, "wb") as f:
+        f.write(conteudo)
+    return len(conteudo)
+
+
+def carregar(caminho: str) -> Dict[str, Any]:
+    with open(caminho, "rb") as f:
+        return decodificar(f.read())
@@ -0,0 +1,207 @@
+from __future__ import annotations
+import json
+import struct
+from enum import IntEnum
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple, Optional
+
+"""
+Log estruturado de eventos de combate (append-only)
+- Registros tipados (Evento) acumulados num buffer circular e gravados em lote
+- Dois formatos: binário com prefixo de tamanho (.bin) ou JSONL (.jsonl)
+- ler_eventos/reproduzir leem o arquivo de volta sem re-simular o combate
+"""
+
+MAGICO = b"RPGE"
+VERSAO = 1
+
+_CABECALHO = struct.Struct("<4sB")     # mágico + versão (arquivo binário)
+_TAMANHO = struct.Struct("<I")         # prefixo de cada registro
+_FIXO = struct.Struct("<BHHi")         # tipo, encontro, turno, valor
+_TEXTO = struct.Struct("<H")           # tamanho de cada string
+
+
+class TipoEvento(IntEnum):
+    INICIO_MISSAO = 1
+    INICIO_ENCONTRO = 2
+    INICIO_TURNO = 3
+    ACAO = 4
+    ROLAGEM = 5
+    DANO = 6
+    TICK_EFEITO = 7
+    DROP = 8
+    XP = 9
+    FIM_ENCONTRO = 10
+    FIM_MISSAO = 11
+
+
+class Evento(NamedTuple):
+    tipo: int
+    encontro: int = 0
+    turno: int = 0
+    ator: str = ""
+    alvo: str = ""
+    valor: int = 0
+    detalhe: str = ""
+
+    def como_dict(self) -> Dict[str, Any]:
+        d = self._asdict()
+        d["tipo"] = TipoEvento(self.tipo).name
+        return d
+
+
+# ============================================================
+#  CODIFICAÇÃO
+# ============================================================
+
+def _codificar_binario(ev: Evento) -> bytes:
+    partes = [_FIXO.pack(int(ev.tipo), ev.encontro & 0xFFFF, ev.turno & 0xFFFF, int(ev.valor))]
+    for texto in (ev.ator, ev.alvo, ev.detalhe):
+        b = (texto or "").encode("utf-8")
+        if len(b) > 0xFFFF:     # corta sem partir um caractere multibyte no meio
+            b = b[:0xFFFF].decode("utf-8", "ignore").encode("utf-8")
+        partes.append(_TEXTO.pack(len(b)))
+        partes.append(b)
+    corpo = b"".join(partes)
+    return _TAMANHO.pack(len(corpo)) + corpo
+
+
+def _decodificar_binario(corpo: bytes) -> Evento:
+    tipo, encontro, turno, valor = _FIXO.unpack_from(corpo, 0)
+    pos = _FIXO.size
+    textos: List[str] = []
+    for _ in range(3):
+        (n,) = _TEXTO.unpack_from(corpo, pos)
+        pos += _TEXTO.size
+        textos.append(corpo[pos:pos + n].decode("utf-8"))
+        pos += n
+    return Evento(tipo, encontro, turno, textos[0], textos[1], valor, textos[2])
+
+
+def _codificar_jsonl(ev: Evento) -> bytes:
+    return (json.dumps(ev.como_dict(), ensure_ascii=False) + "\n").encode("utf-8")
+
+
+# ============================================================
+#  REGISTRO (escrita)
+# ============================================================
+
+class RegistroEventos:
+    """
+    Grava eventos de combate em 'caminho' (formato pela extensão: .jsonl ou binário).
+    Os eventos ficam num buffer circular de 'capacidade' posições e vão para o
+    disco em lote quando ele enche (ou em descarregar()/fechar()).
+    """
+
+    def __init__(self, caminho: str, capacidade: int = 4096, formato: str | None = None):
+        self.caminho = caminho
+        self.formato = formato or ("jsonl" if caminho.endswith(".jsonl") else "bin")
+        self.capacidade = max(1, int(capacidade))
+        self._buffer: List[Optional[Evento]] = [None] * self.capacidade
+        self._pos = 0
+        self._codificar = _codificar_jsonl if self.formato == "jsonl" else _codificar_binario
+        # posição atual no combate (a engine atualiza via posicionar)
+        self.encontro = 0
+        self.turno = 0
+        self._arquivo = open(caminho, "ab")
+        if self.formato == "bin" and self._arquivo.tell() == 0:
+            self._arquivo.write(_CABECALHO.pack(MAGICO, VERSAO))
+
+    def __enter__(self) -> RegistroEventos:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.fechar()
+
+    def posicionar(self, encontro: int, turno: int) -> None:
+        self.encontro = encontro
+        self.turno = turno
+
+    def registrar(self, tipo: TipoEvento, ator: str = "", alvo: str = "", valor: int = 0, detalhe: str = "") -> None:
+        self._buffer[self._pos] = Evento(int(tipo), self.encontro, self.turno, ator, alvo, int(valor), detalhe)
+        self._pos += 1
+        if self._pos == self.capacidade:
+            self.descarregar()
+
+    def ao_rolar(self, faces: int, quantidade: int, resultado: int, contexto: str) -> None:
+        """Observador para dado.observar_rolagens (registra rolagens com contexto)."""
+        self.registrar(TipoEvento.ROLAGEM, valor=resultado, detalhe=f"{quantidade}d{faces} {contexto}")
+
+    def descarregar(self) -> None:
+        if self._pos:
+            codificar = self._codificar
+            self._arquivo.write(b"".join(codificar(ev) for ev in self._buffer[:self._pos]))
+            self._pos = 0
+        self._arquivo.flush()
+
+    def fechar(self) -> None:
+        if not self._arquivo.closed:
+            self.descarregar()
+            self._arquivo.close()
+
+
+# ============================================================
+#  LEITURA / REPLAY
+# ============================================================
+
+def ler_eventos(caminho: str) -> Iterator[Evento]:
+    """Lê os eventos na ordem em que foram gravados (detecta o formato pelo conteúdo)."""
+    with open(caminho, "rb") as f:
+        inicio = f.read(_CABECALHO.size)
+        if inicio[:4] == MAGICO:
+            while True:
+                tam = f.read(_TAMANHO.size)
+                if len(tam) < _TAMANHO.size:
+                    return
+                (n,) = _TAMANHO.unpack(tam)
+                corpo = f.read(n)
+                if len(corpo) < n:      # registro truncado (queda no meio da escrita)
+                    return
+                yield _decodificar_binario(corpo)
+        else:
+            f.seek(0)
+            for linha in f:
+                if linha.strip():
+                    try:
+                        d = json.loads(linha)
+                        d["tipo"] = int(TipoEvento[d["tipo"]])
+                    except (ValueError, KeyError):  # linha truncada (queda no meio da escrita)
+                        return
+                    yield Evento(**d)
+
+
+def reproduzir(caminho: str, ao_evento: Callable[[Evento], None] | None = None) -> List[Dict[str, Any]]:
+    """
+    Reproduz o log em velocidade máxima e devolve um resumo por missão:
+    encontros, turnos, dano causado/recebido, drops, XP e resultado.
+    'ao_evento' (opcional) recebe cada evento, ex.: para redesenhar o combate.
+    """
+    missoes: List[Dict[str, Any]] = []
+    atual: Dict[str, Any] | None = None
+    heroi = ""
+    for ev in ler_eventos(caminho):
+        if ao_evento is not None:
+            ao_evento(ev)
+        tipo = ev.tipo
+        if tipo == TipoEvento.INICIO_MISSAO:
+            heroi = ev.ator
+            atual = {"heroi": heroi, "config": ev.detalhe, "encontros": 0, "turnos": 0,
+                     "dano_causado": 0, "dano_recebido": 0, "drops": [], "xp": 0, "venceu": None}
+            missoes.append(atual)
+        elif atual is None:
+            continue
+        elif tipo == TipoEvento.INICIO_ENCONTRO:
+            atual["encontros"] += 1
+        elif tipo == TipoEvento.INICIO_TURNO:
+            atual["turnos"] += 1
+        elif tipo in (TipoEvento.DANO, TipoEvento.TICK_EFEITO):
+            if ev.alvo == heroi:
+                atual["dano_recebido"] += ev.valor
+            else:
+                atual["dano_causado"] += ev.valor
+        elif tipo == TipoEvento.DROP:
+            atual["drops"].append(ev.detalhe)
+        elif tipo == TipoEvento.XP:
+            atual["xp"] += ev.valor
+        elif tipo == TipoEvento.FIM_MISSAO:
+            atual["venceu"] = bool(ev.valor)
+    return missoes
@@ -1,8 +1,27 @@
 from __future__ import annotations
-import datetime
+import atexit
+import queue
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Iterator, List, Optional, TextIO
+
+# Saída desligada no contexto atual (modo headless); vale por thread/tarefa
+_mudo: ContextVar[bool] = ContextVar("logger_mudo", default=False)
 
 
 class Logger:
+    """
+    Logger simples do jogo.
+    - Formatação preguiçosa: logger.info("dano %s em %s", dano, alvo) só monta a
+      string se o nível estiver ativo (f-strings continuam funcionando).
+    - Timestamp "%H:%M:%S" calculado no máximo uma vez por segundo.
+    - configurar(assincrono=True) entrega as linhas a uma thread que grava em lote
+      no stdout ou num arquivo (modo padrão: síncrono, via print).
+    - silenciar(): bloco sem saída nenhuma só no contexto atual (motor headless).
+    """
 
     def __init__(self):
         self.niveis = {
@@ -12,35 +31,161 @@ class Logger:
             "ERROR": 3
         }
         self.nivel_atual = "INFO"
-    
+        self._minimo = self.niveis[self.nivel_atual]
+
+        # cache do timestamp (segundo -> texto)
+        self._ts_segundo = -1
+        self._ts_texto = ""
+
+        # saída assíncrona (opcional)
+        self._arquivo: Optional[TextIO] = None
+        self._fila: Optional[queue.Queue] = None
+        self._thread: Optional[threading.Thread] = None
+        self._tamanho_lote = 256
+        # troca de saída (configurar/fechar) x gravação (_emitir) de outras threads
+        self._trava = threading.Lock()
+
+    def _timestamp(self) -> str:
+        agora = int(time.time())
+        if agora != self._ts_segundo:
+            self._ts_segundo = agora
+            self._ts_texto = time.strftime("%H:%M:%S", time.localtime(agora))
+        return self._ts_texto
+
     def _formatar_log(self, nivel: str, msg: str) -> str:
         """Formata a mensagem de log de forma consistente."""
-        timestamp = datetime.datetime.now().strftime("%H:%M:%S")
-        return f"[{timestamp}] {nivel}: {msg}"
-    
+        return f"[{self._timestamp()}] {nivel}: {msg}"
+
     def _deve_logar(self, nivel: str) -> bool:
         """Verifica se o nível deve ser logado baseado na configuração atual."""
-        return self.niveis[nivel] >= self.niveis[self.nivel_atual]
-    
-    def debug(self, msg: str) -> None:
-        if self._deve_logar("DEBUG"):
-            print(self._formatar_log("DEBUG", msg))
-    
-    def info(self, msg: str) -> None:
-        if self._deve_logar("INFO"):
-            print(self._formatar_log("INFO", msg))
-    
-    def warning(self, msg: str) -> None:
-        if self._deve_logar("WARNING"):
-            print(self._formatar_log("WARNING", msg))
-    
-    def error(self, msg: str) -> None:
-        if self._deve_logar("ERROR"):
-            print(self._formatar_log("ERROR", msg))
-    
+        return self.niveis[nivel] >= self._minimo
+
+    def ativo(self, nivel: str) -> bool:
+        """Para quem precisa montar algo caro só quando o nível está ligado."""
+        return self.niveis.get(nivel, 0) >= self._minimo
+
+    def _emitir(self, nivel: str, msg: str, args: tuple) -> None:
+        if _mudo.get():
+            return
+        if args:
+            msg = msg % args
+        linha = self._formatar_log(nivel, msg)
+        with self._trava:
+            if self._fila is not None:
+                self._fila.put(linha)
+                return
+            if self._arquivo is not None:
+                self._arquivo.write(linha + "\n")
+                return
+        print(linha)
+
+    def debug(self, msg: str, *args: Any) -> None:
+        if self._minimo <= 0:
+            self._emitir("DEBUG", msg, args)
+
+    def info(self, msg: str, *args: Any) -> None:
+        if self._minimo <= 1:
+            self._emitir("INFO", msg, args)
+
+    def warning(self, msg: str, *args: Any) -> None:
+        if self._minimo <= 2:
+            self._emitir("WARNING", msg, args)
+
+    def error(self, msg: str, *args: Any) -> None:
+        if self._minimo <= 3:
+            self._emitir("ERROR", msg, args)
+
     def set_level(self, nivel: str) -> None:
         """Define o nível mínimo de logging."""
         if nivel in self.niveis:
             self.nivel_atual = nivel
+            self._minimo = self.niveis[nivel]
+
+    @contextmanager
+    def silenciar(self) -> Iterator[None]:
+        """Nada de log (nem exibir()) dentro do bloco, só nesta thread/tarefa."""
+        token = _mudo.set(True)
+        try:
+            yield
+        finally:
+            _mudo.reset(token)
+
+    # ------------------------- saída em lote -------------------------
+
+    def configurar(self, assincrono: bool = False, arquivo: str | None = None, tamanho_lote: int = 256) -> None:
+        """
+        Define para onde vão os logs.
+        - arquivo=None => stdout; senão, anexa no arquivo informado
+        - assincrono=True => uma thread de fundo grava em lotes de até 'tamanho_lote' linhas
+        """
+        self.fechar()
+        with self._trava:
+            self._tamanho_lote = max(1, int(tamanho_lote))
+            if arquivo:
+                self._arquivo = open(arquivo, "a", encoding="utf-8")
+            if assincrono:
+                self._fila = queue.Queue()
+                self._thread = threading.Thread(target=self._gravar_em_lote, args=(self._fila,),
+                                                name="logger", daemon=True)
+                self._thread.start()
+
+    def _saida(self) -> TextIO:
+        return self._arquivo if self._arquivo is not None else sys.stdout
+
+    def _gravar_em_lote(self, fila: queue.Queue) -> None:
+        while True:
+            linhas: List[str] = [fila.get()]
+            while len(linhas) < self._tamanho_lote:
+                try:
+                    linhas.append(fila.get_nowait())
+                except queue.Empty:
+                    break
+            parar = None in linhas
+            texto = [l for l in linhas if l is not None]
+            try:
+                if texto:
+                    saida = self._saida()
+                    saida.write("\n".join(texto) + "\n")
+                    saida.flush()
+            finally:
+                for _ in linhas:
+                    fila.task_done()
+            if parar:
+                return
+
+    def flush(self) -> None:
+        """Espera a thread de fundo gravar tudo que já foi logado."""
+        fila, arquivo = self._fila, self._arquivo
+        if fila is not None:
+            fila.join()
+        elif arquivo is not None:
+            with self._trava:
+                if not arquivo.closed:
+                    arquivo.flush()
+
+    def fechar(self) -> None:
+        """
+        Drena a fila, encerra a thread e fecha o arquivo (volta ao modo síncrono).
+        Tudo sob a trava: um log de outra thread (ex.: autosave no atexit) espera
+        e sai pelo print, em vez de cair numa fila sem leitor ou num arquivo fechado.
+        """
+        with self._trava:
+            if self._fila is not None:
+                self._fila.put(None)
+                self._fila.join()
+                if self._thread is not None:
+                    self._thread.join(timeout=5)
+            self._fila = None
+            self._thread = None
+            if self._arquivo is not None:
+                self._arquivo.close()
+                self._arquivo = None
+
+def exibir(*args: Any, **kwargs: Any) -> None:
+    """print() para mensagens ao jogador que respeita logger.silenciar()."""
+    if not _mudo.get():
+        print(*args, **kwargs)
+
 
-logger = Logger()
\ No newline at end of file
+logger = Logger()
+atexit.register(logger.fechar)
\ No newline at end of file
@@ -0,0 +1,125 @@
+from __future__ import annotations
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from utils import codec_save
+
+"""
+Índice dos saves (saves/manifest.json)
+- Atualizado a cada save: arquivo, herói, classe, nível, data e tamanho
+- "Último save" e listagem saem do índice, sem varrer/abrir os arquivos
+- Se o índice sumir ou ficar inconsistente, é reconstruído a partir da pasta
+"""
+
+NOME_MANIFESTO = "manifest.json"
+VERSAO = 1
+EXTENSOES = (".sav", ".json")
+
+
+def _resumo(dados: Dict[str, Any], tamanho: int, timestamp: float) -> Dict[str, Any]:
+    pers = dados.get("personagem") or {}
+    stats = dados.get("heroi_stats") or {}
+    return {
+        "heroi": pers.get("nome"),
+        "classe": pers.get("arquetipo"),
+        "nivel": stats.get("nivel", 1),
+        "timestamp": timestamp,
+        "tamanho": tamanho,
+    }
+
+
+class Manifesto:
+    """Índice de saves de uma pasta. Seguro entre threads (autosave + menu)."""
+
+    def __init__(self, pasta: str):
+        self.pasta = pasta
+        self.caminho = os.path.join(pasta, NOME_MANIFESTO)
+        self._lock = threading.RLock()
+        self._saves: Optional[Dict[str, Dict[str, Any]]] = None   # arquivo -> resumo
+        self._ultimo: Optional[str] = None
+
+    # ---------------- persistência ----------------
+    def _carregar(self) -> Dict[str, Dict[str, Any]]:
+        if self._saves is None:
+            try:
+                with open(self.caminho, "r", encoding="utf-8") as f:
+                    dados = json.load(f)
+                if dados.get("versao") != VERSAO:
+                    raise ValueError("versão do manifesto")
+                self._saves = dados["saves"]
+                self._ultimo = dados.get("ultimo")
+            except (OSError, ValueError, KeyError, TypeError):
+                self.reconstruir()
+        return self._saves  # type: ignore[return-value]
+
+    def _gravar(self) -> None:
+        temp = self.caminho + ".tmp"
+        with open(temp, "w", encoding="utf-8") as f:
+            json.dump({"versao": VERSAO, "ultimo": self._ultimo, "saves": self._saves}, f, ensure_ascii=False)
+        os.replace(temp, self.caminho)
+
+    def reconstruir(self) -> None:
+        """Refaz o índice lendo cada save da pasta (caminho lento, só quando necessário)."""
+        with self._lock:
+            saves: Dict[str, Dict[str, Any]] = {}
+            os.makedirs(self.pasta, exist_ok=True)
+            for arquivo in os.listdir(self.pasta):
+                if not arquivo.endswith(EXTENSOES) or arquivo == NOME_MANIFESTO:
+                    continue
+                caminho = os.path.join(self.pasta, arquivo)
+                try:
+                    st = os.stat(caminho)
+                    if arquivo.endswith(".sav"):
+                        r = codec_save.ler_resumo(caminho)      # só o cabeçalho
+                        saves[arquivo] = {"heroi": r.nome, "classe": r.classe, "nivel": r.nivel,
+                                          "timestamp": st.st_mtime, "tamanho": st.st_size}
+                        continue
+                    with open(caminho, "r", encoding="utf-8") as f:
+                        dados = json.load(f)
+                except (OSError, ValueError, UnicodeDecodeError):
+                    continue    # arquivo corrompido ou que não é save
+                saves[arquivo] = _resumo(dados, st.st_size, st.st_mtime)
+            self._saves = saves
+            self._ultimo = max(saves, key=lambda a: saves[a]["timestamp"]) if saves else None
+            self._gravar()
+
+    # ---------------- atualização ----------------
+    def registrar(self, caminho: str, dados: Dict[str, Any], tamanho: Optional[int] = None) -> None:
+        """Chamado após cada save gravado na pasta do manifesto."""
+        if os.path.dirname(os.path.abspath(caminho)) != os.path.abspath(self.pasta):
+            return
+        arquivo = os.path.basename(caminho)
+        if tamanho is None:
+            tamanho = os.path.getsize(caminho)
+        with self._lock:
+            saves = self._carregar()
+            saves[arquivo] = _resumo(dados, tamanho, time.time())
+            self._ultimo = arquivo
+            self._gravar()
+
+    def remover(self, arquivo: str) -> None:
+        with self._lock:
+            saves = self._carregar()
+            if saves.pop(os.path.basename(arquivo), None) is not None:
+                if self._ultimo == os.path.basename(arquivo):
+                    self._ultimo = max(saves, key=lambda a: saves[a]["timestamp"]) if saves else None
+                self._gravar()
+
+    # ---------------- consulta ----------------
+    def ultimo(self) -> Optional[str]:
+        """Caminho do save mais recente (None se não houver)."""
+        with self._lock:
+            self._carregar()
+            if self._ultimo and not os.path.exists(os.path.join(self.pasta, self._ultimo)):
+                self.reconstruir()      # apagado por fora do jogo
+            return os.path.join(self.pasta, self._ultimo) if self._ultimo else None
+
+    def listar(self) -> List[Dict[str, Any]]:
+        """Saves do mais recente para o mais antigo, cada um com 'arquivo' + resumo."""
+        with self._lock:
+            saves = self._carregar()
+            itens = [dict(resumo, arquivo=arquivo) for arquivo, resumo in saves.items()]
+        return sorted(itens, key=lambda s: s["timestamp"], reverse=True)
@@ -0,0 +1,134 @@
+from __future__ import annotations
+import functools
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple, TypeVar
+
+"""
+Instrumentação opcional da engine (timers por fase + contadores)
+- Desligada por padrão: fase() devolve um contexto vazio e medir() só testa um bool
+- Ligada: acumula tempo por pilha de fases ("executar;acao;tentar_drop")
+- exportar_folded() gera o formato "pilha microssegundos" dos flame graphs
+"""
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+class _FaseNula:
+    __slots__ = ()
+
+    def __enter__(self) -> None:
+        return None
+
+    def __exit__(self, *exc) -> bool:
+        return False
+
+
+_NULA = _FaseNula()
+
+
+class _Fase:
+    __slots__ = ("perfil", "nome", "caminho", "inicio")
+
+    def __init__(self, perfil: Perfilador, nome: str):
+        self.perfil = perfil
+        self.nome = nome
+
+    def __enter__(self) -> None:
+        pilha = self.perfil._pilha
+        self.caminho = f"{pilha[-1]};{self.nome}" if pilha else self.nome
+        pilha.append(self.caminho)
+        self.inicio = time.perf_counter()
+
+    def __exit__(self, *exc) -> bool:
+        dt = time.perf_counter() - self.inicio
+        p = self.perfil
+        p._pilha.pop()
+        p.tempos[self.caminho] = p.tempos.get(self.caminho, 0.0) + dt
+        p.chamadas[self.caminho] = p.chamadas.get(self.caminho, 0) + 1
+        return False
+
+
+class Perfilador:
+    def __init__(self) -> None:
+        self.ativo = False
+        self.tempos: Dict[str, float] = {}      # pilha -> segundos (inclusivo)
+        self.chamadas: Dict[str, int] = {}
+        self.contadores: Dict[str, int] = {}
+        self._pilha: List[str] = []
+
+    def ativar(self) -> None:
+        self.ativo = True
+
+    def desativar(self) -> None:
+        self.ativo = False
+
+    def limpar(self) -> None:
+        self.tempos.clear()
+        self.chamadas.clear()
+        self.contadores.clear()
+        self._pilha.clear()
+
+    # ---------------- coleta ----------------
+    def fase(self, nome: str):
+        """Uso: with perfil.fase("acao"): ..."""
+        if not self.ativo:
+            return _NULA
+        return _Fase(self, nome)
+
+    def medir(self, nome: Optional[str] = None) -> Callable[[F], F]:
+        """Decorador: mede a função como uma fase (nome padrão = nome da função)."""
+        def decorador(func: F) -> F:
+            rotulo = nome or func.__name__
+
+            @functools.wraps(func)
+            def envolvida(*args: Any, **kwargs: Any) -> Any:
+                if not self.ativo:
+                    return func(*args, **kwargs)
+                with _Fase(self, rotulo):
+                    return func(*args, **kwargs)
+            return envolvida  # type: ignore[return-value]
+        return decorador
+
+    def contar(self, nome: str, n: int = 1) -> None:
+        if self.ativo:
+            self.contadores[nome] = self.contadores.get(nome, 0) + n
+
+    # ---------------- relatórios ----------------
+    def _tempo_proprio(self) -> Dict[str, float]:
+        """Tempo de cada pilha descontando as fases filhas (base do flame graph)."""
+        proprio = dict(self.tempos)
+        for caminho, t in self.tempos.items():
+            pai, sep, _ = caminho.rpartition(";")
+            if sep and pai in proprio:
+                proprio[pai] -= t
+        return proprio
+
+    def relatorio(self) -> List[Tuple[str, int, float, float]]:
+        """(pilha, chamadas, total_ms, média_us) ordenado pelo tempo total."""
+        linhas = []
+        for caminho, t in self.tempos.items():
+            n = self.chamadas.get(caminho, 0) or 1
+            linhas.append((caminho, n, t * 1e3, t / n * 1e6))
+        return sorted(linhas, key=lambda l: -l[2])
+
+    def exportar_folded(self, caminho: Optional[str] = None) -> str:
+        """
+        Pilhas no formato "a;b;c <microssegundos>" (flamegraph.pl, speedscope, inferno).
+        Se 'caminho' for informado, também grava o arquivo.
+        """
+        linhas = [f"{pilha} {max(0, int(round(t * 1e6)))}" for pilha, t in sorted(self._tempo_proprio().items())]
+        texto = "\n".join(linhas) + ("\n" if linhas else "")
+        if caminho:
+            with open(caminho, "w", encoding="utf-8") as f:
+                f.write(texto)
+        return texto
+
+    def imprimir(self) -> None:
+        print(f"{'fase':<60} {'chamadas':>9} {'total ms':>10} {'média us':>10}")
+        for caminho, n, total_ms, media_us in self.relatorio():
+            print(f"{caminho:<60} {n:>9} {total_ms:>10.2f} {media_us:>10.1f}")
+        for nome, n in sorted(self.contadores.items()):
+            print(f"# {nome}: {n}")
+
+
+perfil = Perfilador()
@@ -1,16 +1,243 @@
 from __future__ import annotations
-from typing import Any
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+"""
+Persistência em SQLite
+- Modo WAL: leituras não bloqueiam a escrita (autosave, servidor, vários workers)
+- Tabelas indexadas: herois, itens_inventario e resultados_missao
+- Uma conexão por thread, reaproveitada entre chamadas (nada de abrir/fechar a cada save)
+- Gravações em lote: vários perfis numa única transação, com executemany
+O formato de 'dados' é o mesmo dict do save JSON (ver Jogo._montar_dados).
+"""
+
+_ESQUEMA = """
+CREATE TABLE IF NOT EXISTS herois (
+    perfil          TEXT PRIMARY KEY,
+    nome            TEXT,
+    arquetipo       TEXT,
+    nivel           INTEGER,
+    xp              INTEGER,
+    vida            INTEGER,
+    vida_max        INTEGER,
+    mana            INTEGER,
+    ataque          INTEGER,
+    defesa          INTEGER,
+    ataque_magico   INTEGER,
+    missao_config   TEXT,
+    efeitos         TEXT,
+    atualizado_em   REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_herois_atualizado ON herois(atualizado_em);
+CREATE INDEX IF NOT EXISTS idx_herois_classe_nivel ON herois(arquetipo, nivel);
+
+CREATE TABLE IF NOT EXISTS itens_inventario (
+    perfil      TEXT NOT NULL REFERENCES herois(perfil) ON DELETE CASCADE,
+    posicao     INTEGER NOT NULL,
+    nome        TEXT,
+    tipo        TEXT,
+    valor       INTEGER,
+    raridade    TEXT,
+    dano        INTEGER,
+    defesa      INTEGER,
+    cura        INTEGER,
+    PRIMARY KEY (perfil, posicao)
+);
+CREATE INDEX IF NOT EXISTS idx_itens_nome ON itens_inventario(nome);
+
+CREATE TABLE IF NOT EXISTS resultados_missao (
+    id                  INTEGER PRIMARY KEY AUTOINCREMENT,
+    perfil              TEXT NOT NULL,
+    cenario             TEXT,
+    dificuldade         TEXT,
+    venceu              INTEGER NOT NULL,
+    encontros_vencidos  INTEGER NOT NULL,
+    detalhes            TEXT,
+    criado_em           REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_resultados_perfil ON resultados_missao(perfil, criado_em);
+"""
+
+_CAMPOS_ITEM = ("nome", "tipo", "valor", "raridade", "dano", "defesa", "cura")
+
+_UPSERT_HEROI = """
+INSERT INTO herois (perfil, nome, arquetipo, nivel, xp, vida, vida_max, mana, ataque, defesa,
+                    ataque_magico, missao_config, efeitos, atualizado_em)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT(perfil) DO UPDATE SET
+    nome=excluded.nome, arquetipo=excluded.arquetipo, nivel=excluded.nivel, xp=excluded.xp,
+    vida=excluded.vida, vida_max=excluded.vida_max, mana=excluded.mana, ataque=excluded.ataque,
+    defesa=excluded.defesa, ataque_magico=excluded.ataque_magico,
+    missao_config=excluded.missao_config, efeitos=excluded.efeitos, atualizado_em=excluded.atualizado_em
+"""
+
+_INSERIR_ITEM = f"""
+INSERT INTO itens_inventario (perfil, posicao, {", ".join(_CAMPOS_ITEM)})
+VALUES (?, ?, {", ".join("?" * len(_CAMPOS_ITEM))})
+"""
 
 
 class Repositorio:
     """
-    Placeholder de persistência.
-    Nesta base, não grava nem lê de disco — apenas mantém interface.
+    Saves em um banco SQLite (padrão: saves/rpg.db).
+    - salvar(dados, perfil) / carregar(perfil) mantêm a interface do placeholder antigo
+    - salvar_lote([(perfil, dados), ...]) grava tudo numa transação só
+    - registrar_missao(...) acumula o histórico de resultados por perfil
+    Seguro para uso por várias threads: cada uma recebe (e reaproveita) a própria conexão.
     """
 
-    def salvar(self, dados: dict[str, Any]) -> None:
-        print("(simulado) salvar:", dados)
+    def __init__(self, caminho: str = os.path.join("saves", "rpg.db")):
+        self.caminho = caminho
+        pasta = os.path.dirname(caminho)
+        if pasta:
+            os.makedirs(pasta, exist_ok=True)
+        self._local = threading.local()
+        self._conexoes: List[sqlite3.Connection] = []
+        self._lock = threading.Lock()
+        con = self._conexao()
+        con.executescript(_ESQUEMA)
+        # bancos criados antes da coluna 'efeitos' (CREATE TABLE IF NOT EXISTS não a adiciona)
+        colunas = {c["name"] for c in con.execute("PRAGMA table_info(herois)")}
+        if "efeitos" not in colunas:
+            with con:
+                con.execute("ALTER TABLE herois ADD COLUMN efeitos TEXT")
+
+    def __enter__(self) -> Repositorio:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.fechar()
+
+    # ---------------- conexões ----------------
+    def _conexao(self) -> sqlite3.Connection:
+        con = getattr(self._local, "con", None)
+        if con is None:
+            con = sqlite3.connect(self.caminho, timeout=30, check_same_thread=False)
+            con.row_factory = sqlite3.Row
+            con.execute("PRAGMA journal_mode=WAL")
+            con.execute("PRAGMA synchronous=NORMAL")
+            con.execute("PRAGMA foreign_keys=ON")
+            self._local.con = con
+            with self._lock:
+                self._conexoes.append(con)
+        return con
+
+    def fechar(self) -> None:
+        """Fecha as conexões de todas as threads."""
+        with self._lock:
+            for con in self._conexoes:
+                try:
+                    con.close()
+                except sqlite3.Error:
+                    pass
+            self._conexoes.clear()
+        self._local = threading.local()
+
+    # ---------------- escrita ----------------
+    @staticmethod
+    def _linha_heroi(perfil: str, dados: Dict[str, Any], agora: float) -> Tuple[Any, ...]:
+        pers = dados.get("personagem") or {}
+        stats = dados.get("heroi_stats") or {}
+        atrib = stats.get("atributos") or {}
+        return (
+            perfil, pers.get("nome"), pers.get("arquetipo"),
+            stats.get("nivel"), stats.get("xp"),
+            atrib.get("vida"), atrib.get("vida_max"), atrib.get("mana"),
+            atrib.get("ataque"), atrib.get("defesa"), atrib.get("ataque_magico"),
+            json.dumps(dados.get("missao_config") or {}, ensure_ascii=False),
+            json.dumps(stats["efeitos"], ensure_ascii=False) if stats.get("efeitos") else None,
+            agora,
+        )
+
+    @staticmethod
+    def _linhas_itens(perfil: str, dados: Dict[str, Any]) -> Iterable[Tuple[Any, ...]]:
+        for pos, it in enumerate(dados.get("inventario") or []):
+            if not isinstance(it, dict):
+                it = {"nome": str(it)}
+            yield (perfil, pos) + tuple(it.get(c) for c in _CAMPOS_ITEM)
+
+    def salvar_lote(self, saves: Iterable[Tuple[str, Dict[str, Any]]]) -> int:
+        """Grava vários (perfil, dados) numa única transação. Retorna quantos perfis."""
+        saves = list(dict(saves).items())   # perfil repetido no lote: vale o último
+        if not saves:
+            return 0
+        agora = time.time()
+        perfis = [(p,) for p, _ in saves]
+        con = self._conexao()
+        with con:
+            con.executemany(_UPSERT_HEROI, [self._linha_heroi(p, d, agora) for p, d in saves])
+            con.executemany("DELETE FROM itens_inventario WHERE perfil = ?", perfis)
+            con.executemany(_INSERIR_ITEM, [linha for p, d in saves for linha in self._linhas_itens(p, d)])
+        return len(saves)
+
+    def salvar(self, dados: Dict[str, Any], perfil: Optional[str] = None) -> str:
+        """Grava um save; sem 'perfil', usa o nome do personagem. Retorna o perfil usado."""
+        perfil = perfil or (dados.get("personagem") or {}).get("nome") or "padrao"
+        self.salvar_lote([(perfil, dados)])
+        return perfil
+
+    def registrar_missao(self, perfil: str, cenario: str | None, dificuldade: str | None,
+                         venceu: bool, encontros_vencidos: int, detalhes: str = "") -> None:
+        con = self._conexao()
+        with con:
+            con.execute(
+                "INSERT INTO resultados_missao (perfil, cenario, dificuldade, venceu, encontros_vencidos, detalhes, criado_em)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (perfil, cenario, dificuldade, int(bool(venceu)), int(encontros_vencidos), detalhes, time.time()),
+            )
+
+    def remover(self, perfil: str) -> bool:
+        con = self._conexao()
+        with con:
+            cur = con.execute("DELETE FROM herois WHERE perfil = ?", (perfil,))
+        return cur.rowcount > 0
+
+    # ---------------- leitura ----------------
+    def carregar(self, perfil: Optional[str] = None) -> Dict[str, Any]:
+        """Devolve o dict do save (mesmo formato do JSON); sem 'perfil', o mais recente. {} se não houver."""
+        con = self._conexao()
+        if perfil is None:
+            linha = con.execute("SELECT * FROM herois ORDER BY atualizado_em DESC LIMIT 1").fetchone()
+        else:
+            linha = con.execute("SELECT * FROM herois WHERE perfil = ?", (perfil,)).fetchone()
+        if linha is None:
+            return {}
+
+        itens = con.execute(
+            f"SELECT {', '.join(_CAMPOS_ITEM)} FROM itens_inventario WHERE perfil = ? ORDER BY posicao",
+            (linha["perfil"],),
+        ).fetchall()
+        dados: Dict[str, Any] = {
+            "personagem": {"nome": linha["nome"], "arquetipo": linha["arquetipo"]},
+            "missao_config": json.loads(linha["missao_config"] or "{}"),
+            "heroi_stats": None,
+            "inventario": [dict(it) for it in itens],
+        }
+        if linha["nivel"] is not None:
+            dados["heroi_stats"] = {
+                "nivel": linha["nivel"],
+                "xp": linha["xp"],
+                "atributos": {c: linha[c] for c in ("vida", "vida_max", "mana", "ataque", "defesa", "ataque_magico")},
+            }
+            if linha["efeitos"]:
+                dados["heroi_stats"]["efeitos"] = json.loads(linha["efeitos"])
+        return dados
+
+    def listar(self) -> List[Dict[str, Any]]:
+        """Resumo dos perfis salvos, do mais recente para o mais antigo (sem ler inventários)."""
+        linhas = self._conexao().execute(
+            "SELECT perfil, nome, arquetipo, nivel, xp, atualizado_em FROM herois ORDER BY atualizado_em DESC"
+        ).fetchall()
+        return [dict(l) for l in linhas]
 
-    def carregar(self) -> dict[str, Any]:
-        print("(simulado) carregar: sem dados reais nesta base.")
-        return {}
+    def historico(self, perfil: str, limite: int = 20) -> List[Dict[str, Any]]:
+        linhas = self._conexao().execute(
+            "SELECT cenario, dificuldade, venceu, encontros_vencidos, detalhes, criado_em"
+            " FROM resultados_missao WHERE perfil = ? ORDER BY criado_em DESC LIMIT ?",
+            (perfil, int(limite)),
+        ).fetchall()
+        return [dict(l) for l in linhas]